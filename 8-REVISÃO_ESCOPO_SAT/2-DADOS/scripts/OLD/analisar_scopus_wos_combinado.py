@@ -12,6 +12,12 @@ import os
 from typing import List, Set, Dict, Tuple
 from collections import defaultdict
 
+# Parser compartilhado da bibliografia (2-DADOS/scripts/sat_bib.py)
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sat_bib import load_bib
+from sat_prisma import ProvenanceLedger, render_flow_svg, write_prisma_csv
+
 # ============================================================================
 # CONFIGURAÇÃO: CRITÉRIOS DE FILTRAGEM E PONTUAÇÃO
 # ============================================================================
@@ -68,81 +74,56 @@ SCORE_BAIXA = 0        # < 2 pontos (incerto)
 # PARTE 1: PROCESSAMENTO DE ARQUIVOS BIB
 # ============================================================================
 
-def extrair_referencias_bib(arquivo_bib: str, fonte: str) -> Dict[str, Dict]:
+def extrair_referencias_bib(arquivo_bib: str, fonte: str, ledger: ProvenanceLedger = None) -> Dict[str, Dict]:
     """
     Extrai referências de arquivo BibTeX com identificação de fonte
+    (parser compartilhado sat_bib; chave repetida: vale a última, como antes)
     """
     referencias = {}
-    ref_atual = None
-    
+
     print(f"\n📚 Processando {fonte}: {os.path.basename(arquivo_bib)}...")
-    
+
     try:
-        with open(arquivo_bib, 'r', encoding='utf-8', errors='ignore') as arquivo:
-            conteudo_completo = []
-            
-            for linha in arquivo:
-                # Nova entrada começa com @
-                if linha.strip().startswith('@'):
-                    match = re.match(r'@(\w+)\{([^,]+),', linha)
-                    if match:
-                        tipo, chave = match.groups()
-                        chave = chave.strip()
-                        
-                        # Adicionar fonte à chave para evitar duplicatas
-                        chave_unica = f"{chave}_{fonte}"
-                        
-                        referencias[chave_unica] = {
-                            'tipo': tipo,
-                            'chave_original': chave,
-                            'chave_unica': chave_unica,
-                            'fonte': fonte,
-                            'title': '',
-                            'author': '',
-                            'year': '',
-                            'abstract': '',
-                            'keywords': '',
-                            'affiliations': '',
-                            'address': '',
-                            'author_keywords': '',
-                            'journal': '',
-                            'conteudo_completo': ''
-                        }
-                        ref_atual = chave_unica
-                        conteudo_completo = []
-                
-                elif ref_atual:
-                    conteudo_completo.append(linha)
-                
-                # Fim de uma entrada (linha com apenas })
-                if linha.strip() == '}' and ref_atual:
-                    # Juntar todas as linhas da entrada
-                    entry_text = ''.join(conteudo_completo)
-                    referencias[ref_atual]['conteudo_completo'] = entry_text.lower()
-                    
-                    # Extrair campos suportando multilinhas (DOTALL)
-                    # Scopus usa 'affiliations' e 'author_keywords'
-                    # WoS usa 'address' e 'keywords'
-                    campos_extracao = ['title', 'author', 'year', 'abstract', 'keywords', 
-                                     'affiliations', 'address', 'author_keywords', 'journal']
-                    
-                    for campo in campos_extracao:
-                        # Regex procura: campo = { conteudo }
-                        # [^}]+ tenta pegar tudo até o fechamento. 
-                        # Nota: BibTeX aninhado pode falhar com regex simples, mas para export padrão funciona bem
-                        padrao = rf'{campo}\s*=\s*\{{(.+?)\}}\s*(?:,|$)'
-                        match = re.search(padrao, entry_text, re.IGNORECASE | re.DOTALL)
-                        if match:
-                            # Remover quebras de linha e espaços extras do valor extraído
-                            valor = match.group(1).replace('\n', ' ').replace('\r', ' ')
-                            valor = ' '.join(valor.split())
-                            referencias[ref_atual][campo] = valor
-
-                    ref_atual = None
-        
+        indice = load_bib(arquivo_bib)
+        dados = indice.path.read_bytes()
+        # Scopus usa 'affiliations' e 'author_keywords'
+        # WoS usa 'address' e 'keywords'
+        campos_extracao = ['title', 'author', 'year', 'abstract', 'keywords',
+                           'affiliations', 'address', 'author_keywords', 'journal']
+
+        for registro in indice.records:
+            chave = registro.key
+            # Adicionar fonte à chave para evitar duplicatas
+            chave_unica = f"{chave}_{fonte}"
+            # Texto da entrada sem a linha "@tipo{chave," (usado na pontuação)
+            texto = dados[registro.start:registro.end].decode('utf-8', errors='ignore')
+            if ledger is not None:
+                rid = ledger.identify(fonte, chave, detail=registro.doi)
+                anterior = referencias.get(chave_unica)
+                if anterior is not None:
+                    # Chave repetida na exportacao: o registro anterior e
+                    # sobrescrito (nao e duplicata; DOIs/titulos diferem).
+                    ledger.removed(anterior['registro'], 'chave BibTeX repetida na exportacao', detail=rid)
+            referencias[chave_unica] = {
+                'tipo': texto[1:texto.index('{')].strip(),  # grafia original (@ARTICLE)
+                'chave_original': chave,
+                'chave_unica': chave_unica,
+                'fonte': fonte,
+                **{campo: registro.get(campo) for campo in campos_extracao},
+                'conteudo_completo': texto.partition('\n')[2].lower(),
+            }
+            if ledger is not None:
+                referencias[chave_unica]['registro'] = rid
+            # O regex antigo casava o primeiro campo terminado em 'keywords' /
+            # 'address': no Scopus, 'author_keywords' e 'correspondence_address'.
+            # A triagem publicada depende disso, entao fica explicito aqui.
+            ref = referencias[chave_unica]
+            ref['keywords'] = registro.get('author_keywords') or ref['keywords']
+            ref['address'] = ref['address'] or registro.get('correspondence_address')
+
         print(f"   ✅ {len(referencias)} referências extraídas de {fonte}")
         return referencias
-    
+
     except FileNotFoundError:
         print(f"   ❌ Arquivo não encontrado: {arquivo_bib}")
         return {}
@@ -150,7 +131,7 @@ def extrair_referencias_bib(arquivo_bib: str, fonte: str) -> Dict[str, Dict]:
         print(f"   ❌ Erro ao processar {arquivo_bib}: {e}")
         return {}
 
-def remover_duplicatas(refs_scopus: Dict, refs_wos: Dict) -> Tuple[Dict, Dict]:
+def remover_duplicatas(refs_scopus: Dict, refs_wos: Dict, ledger: ProvenanceLedger = None) -> Tuple[Dict, Dict]:
     """
     Remove duplicatas entre Scopus e WoS baseado em título/ano/autor
     Mantém a referência da fonte considerada mais completa
@@ -175,6 +156,8 @@ def remover_duplicatas(refs_scopus: Dict, refs_wos: Dict) -> Tuple[Dict, Dict]:
         
         if titulo_norm in titulos_scopus:
             duplicatas.append(chave_wos)
+            if ledger is not None:
+                ledger.duplicate(ref_wos['registro'], of=refs_scopus[titulos_scopus[titulo_norm]]['registro'])
             print(f"   🔄 Duplicata encontrada: {ref_wos.get('title', '')[:60]}...")
         else:
             refs_wos_unicas[chave_wos] = ref_wos
@@ -283,7 +266,7 @@ def verificar_exclusao(referencia: Dict) -> Tuple[bool, str]:
 # PARTE 3: FILTRAGEM E CLASSIFICAÇÃO
 # ============================================================================
 
-def filtrar_e_classificar(referencias: Dict) -> Dict:
+def filtrar_e_classificar(referencias: Dict, ledger: ProvenanceLedger = None) -> Dict:
     """
     Filtra e classifica referências por relevância
     """
@@ -304,6 +287,8 @@ def filtrar_e_classificar(referencias: Dict) -> Dict:
         excluir, motivo = verificar_exclusao(ref)
         if excluir:
             resultados['excluidas'].append((chave, ref, 0.0, [], motivo))
+            if ledger is not None:
+                ledger.excluded(ref['registro'], motivo)
             continue
         
         # Calcular score
@@ -311,13 +296,20 @@ def filtrar_e_classificar(referencias: Dict) -> Dict:
         
         # Classificar
         if score >= SCORE_EXCELENCIA:
-            resultados['excelencia'].append((chave, ref, score, termos))
+            categoria = 'excelencia'
         elif score >= SCORE_ALTA:
-            resultados['alta'].append((chave, ref, score, termos))
+            categoria = 'alta'
         elif score >= SCORE_ADEQUADA:
-            resultados['adequada'].append((chave, ref, score, termos))
+            categoria = 'adequada'
         else:
-            resultados['baixa'].append((chave, ref, score, termos))
+            categoria = 'baixa'
+        resultados[categoria].append((chave, ref, score, termos))
+
+        if ledger is not None:
+            if categoria == 'baixa':
+                ledger.excluded(ref['registro'], f"Score < {SCORE_ADEQUADA}", detail=f"{score:.1f}")
+            else:
+                ledger.included(ref['registro'], categoria, score)
     
     # Ordenar por score (decrescente)
     for categoria in ['excelencia', 'alta', 'adequada', 'baixa']:
@@ -536,6 +528,10 @@ def main():
         print(f"   Esperado: {arquivo_scopus} ou {arquivo_wos}")
         return
     
+    # Destino de cada registro (PRISMA), gravado durante as etapas 1-3
+    os.makedirs('../relatorios', exist_ok=True)
+    ledger = ProvenanceLedger('../relatorios/prisma_registros.csv')
+
     # ETAPA 1: Extrair referências
     print("\n" + "="*80)
     print("ETAPA 1: EXTRAÇÃO DE REFERÊNCIAS")
@@ -545,12 +541,12 @@ def main():
     refs_wos = {}
     
     if scopus_exists:
-        refs_scopus = extrair_referencias_bib(arquivo_scopus, 'Scopus')
+        refs_scopus = extrair_referencias_bib(arquivo_scopus, 'Scopus', ledger)
     else:
         print(f"\n⚠️  Arquivo Scopus não encontrado: {arquivo_scopus}")
     
     if wos_exists:
-        refs_wos = extrair_referencias_bib(arquivo_wos, 'WoS')
+        refs_wos = extrair_referencias_bib(arquivo_wos, 'WoS', ledger)
     else:
         print(f"\n⚠️  Arquivo WoS não encontrado: {arquivo_wos}")
     
@@ -564,7 +560,7 @@ def main():
     print("="*80)
     
     if refs_scopus and refs_wos:
-        refs_scopus, refs_wos_unicas = remover_duplicatas(refs_scopus, refs_wos)
+        refs_scopus, refs_wos_unicas = remover_duplicatas(refs_scopus, refs_wos, ledger)
         referencias = combinar_referencias(refs_scopus, refs_wos_unicas)
     elif refs_scopus:
         referencias = refs_scopus
@@ -578,16 +574,13 @@ def main():
     print("ETAPA 3: FILTRAGEM E CLASSIFICAÇÃO")
     print("="*80)
     
-    resultados = filtrar_e_classificar(referencias)
+    resultados = filtrar_e_classificar(referencias, ledger)
     
     # ETAPA 4: Gerar relatórios
     print("\n" + "="*80)
     print("ETAPA 4: GERAÇÃO DE RELATÓRIOS")
     print("="*80)
     
-    # Criar diretório se não existir
-    os.makedirs('../relatorios', exist_ok=True)
-    
     gerar_relatorio_completo(
         resultados,
         '../relatorios/relatorio_analise_scopus_wos.txt'
@@ -598,6 +591,15 @@ def main():
         '../referencias_filtradas/referencias_scopus_wos_filtradas.bib'
     )
     
+    # PRISMA: contagens do próprio ledger (sem releitura das exportações)
+    ledger.close()
+    contagens = ledger.counts()
+    write_prisma_csv(contagens, 'PRISMA.csv')
+    render_flow_svg(contagens, 'PRISMA.svg', template='PRISMA.csv')
+    print("\n📋 PRISMA")
+    for linha in ledger.summary():
+        print(f"   {linha}")
+
     exibir_resumo_terminal(resultados)
     
     print("\n" + "="*80)
@@ -606,6 +608,8 @@ def main():
     print("\n📁 Arquivos gerados:")
     print("   • ../relatorios/relatorio_analise_scopus_wos.txt")
     print("   • ../referencias_filtradas/referencias_scopus_wos_filtradas.bib")
+    print("   • ../relatorios/prisma_registros.csv")
+    print("   • PRISMA.csv, PRISMA.svg")
     print("\n")
 
 if __name__ == '__main__':
@@ -2,6 +2,10 @@ import re
 import os
 from collections import Counter
 import pandas as pd
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sat_bib import read_records
 
 # Caminhos
 INPUT_BIB = '../referencias_filtradas/referencias_scopus_wos_filtradas.bib'
@@ -12,28 +16,11 @@ OUTPUT_TOP7 = '../relatorios/3-analise_top7_excelencia.md'
 print(f"Lendo {INPUT_BIB}...")
 
 def parse_bib_file(filepath):
+    # Parser compartilhado (sat_bib): valores com chaves aninhadas e em varias linhas
     entries = []
-    current_entry = {}
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by @article, @inproceedings, etc
-    raw_entries = re.split(r'@\w+{', content)
-    
-    for raw in raw_entries[1:]: # Skip first empty split
-        entry = {}
-        
-        # Extract fields
-        for field in ['title', 'author', 'year', 'journal', 'abstract', 'keywords', 'author_keywords', 'affiliations', 'address', 'note']:
-            # Search for field = {value} or field = "value" or field = value
-            # Simplified regex for brace-enclosed values which is what our script produces
-            match = re.search(rf'\s+{field}\s*=\s*{{(.*?)}}(?:,|\s*\n)', raw, re.DOTALL | re.IGNORECASE)
-            if match:
-                entry[field] = match.group(1).replace('\n', ' ').strip()
-            else:
-                entry[field] = ""
-        
+    for record in read_records(filepath):
+        entry = {field: record.get(field) for field in ['title', 'author', 'year', 'journal', 'abstract', 'keywords', 'author_keywords', 'affiliations', 'address', 'note']}
+
         # Extract Score from Note
         if entry['note']:
             score_match = re.search(r'Score:\s*([\d\.]+)', entry['note'])
@@ -30,6 +30,9 @@ from typing import Iterable, List, Optional
 import numpy as np
 import pandas as pd
 
+from sat_bib import read_records
+from sat_enrich import load_enrichment
+
 
 SAT_TERMS = [
     "traditional agricultural system",
@@ -98,59 +101,23 @@ class BibEntry:
         ).lower()
 
 
-def _extract_field(raw: str, field: str) -> str:
-    m = re.search(
-        rf"\n\s*{re.escape(field)}\s*=\s*\{{(.+?)\}}\s*(?:,|\n)",
-        raw,
-        re.IGNORECASE | re.DOTALL,
-    )
-    if not m:
-        return ""
-    val = m.group(1).replace("\n", " ").replace("\r", " ")
-    return " ".join(val.split()).strip()
-
-
 def parse_bib(filepath: str) -> List[BibEntry]:
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        content = f.read()
-
-    # Keep the citekey by splitting in a way that preserves it.
-    parts = re.split(r"@(\w+)\s*\{", content)
-    # parts = [before_first, type1, rest1, type2, rest2, ...]
-    entries: List[BibEntry] = []
-    for i in range(1, len(parts), 2):
-        raw = parts[i + 1]
-        key_match = re.match(r"\s*([^,]+)", raw)
-        key = key_match.group(1).strip() if key_match else ""
-
-        title = _extract_field(raw, "title")
-        year_str = _extract_field(raw, "year")
-        abstract = _extract_field(raw, "abstract")
-        keywords = _extract_field(raw, "keywords")
-        author_keywords = _extract_field(raw, "author_keywords")
-        affiliations = _extract_field(raw, "affiliations")
-        address = _extract_field(raw, "address")
-
-        year: Optional[int] = None
-        if year_str:
-            ym = re.search(r"(19\d{2}|20\d{2})", year_str)
-            if ym:
-                year = int(ym.group(1))
-
-        entries.append(
-            BibEntry(
-                key=key,
-                title=title,
-                year=year,
-                abstract=abstract,
-                keywords=keywords,
-                author_keywords=author_keywords,
-                affiliations=affiliations,
-                address=address,
-            )
+    # Shared tokenizer/cache (sat_bib): brace-aware values, every record in file order.
+    # Empty abstract/keywords are filled from the snapshot enrichment table (sat_enrich), if any.
+    extra = load_enrichment()
+    return [
+        BibEntry(
+            key=e.key,
+            title=e.get("title"),
+            year=e.year,
+            abstract=e.get("abstract") or extra.get(e.key, {}).get("abstract", ""),
+            keywords=e.get("keywords") or extra.get(e.key, {}).get("keywords", ""),
+            author_keywords=e.get("author_keywords"),
+            affiliations=e.get("affiliations"),
+            address=e.get("address"),
         )
-
-    return entries
+        for e in read_records(filepath)
+    ]
 
 
 def _has_any(text: str, terms: Iterable[str]) -> bool:
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Build the SAT temporal tables and trend statistics.
+
+This replaces the retired R stage (`OLD/05_temporal_analysis.R`, IG corpus):
+the year x category count tensor is kept as persisted state
+(``_cache/temporal_state.json``) and updated from only the rows appended to
+the SAT categorical table since the last run; the trend statistics for
+every category of every family are then computed in one vectorized batch
+(see ``sat_temporal.py``).
+
+Inputs
+- mca_dados_categorizados_sat.csv (written by build_sat_mca_dataset.py)
+
+Outputs (written next to this script)
+- temporal_tendencias.csv   one row per category: Spearman rho/p, Mann-Kendall
+                            tau/p, Sen's slope, Poisson/NB annual growth rate
+- temporal_publicacoes.csv  studies per year
+- temporal_algoritmos.csv, temporal_evidencias.csv, temporal_contextos.csv,
+  temporal_aplicacoes.csv, temporal_regioes.csv   year x category counts
+- temporal_janelas.csv      rolling 3/5-year counts, growth and shares
+- temporal_relatorio.txt
+
+Run:
+  python build_sat_temporal_dataset.py [--inicio 2010] [--fim 2025]
+  python build_sat_temporal_dataset.py --reconstruir   # ignore the saved state
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from sat_temporal import ALPHA, FAMILIES, STATE_PATH, TemporalAggregator, rolling_metrics, trend_table
+
+HERE = Path(__file__).resolve().parent
+
+FAMILY_TABLES = {
+    "Algoritmo": "temporal_algoritmos.csv",
+    "Evidencia": "temporal_evidencias.csv",
+    "Contexto": "temporal_contextos.csv",
+    "Aplicacao": "temporal_aplicacoes.csv",
+    "Regiao": "temporal_regioes.csv",
+}
+
+
+def write_report(path: Path, trends: pd.DataFrame, pubs: pd.DataFrame, n_studies: int, span: tuple[int, int]) -> None:
+    sep = "=" * 80
+    sub = "-" * 80
+    lines = [
+        sep,
+        "RELATÓRIO DE ANÁLISE TEMPORAL - SISTEMAS AGRÍCOLAS TRADICIONAIS (SAT)",
+        sep,
+        "",
+        f"Período analisado: {span[0]}-{span[1]}",
+        f"Total de estudos: {n_studies}",
+        "",
+        sub,
+        "PUBLICAÇÕES POR ANO",
+        sub,
+        pubs.to_string(index=False),
+        "",
+        sub,
+        f"TENDÊNCIAS SIGNIFICATIVAS (Spearman p < {ALPHA})",
+        sub,
+    ]
+    cols = ["Tipo", "Feature", "Total", "Correlacao", "PValue", "QValue", "MK_Tau", "SenSlope", "Modelo", "TaxaCrescimento"]
+    sig = trends[trends["Significativo"]]
+    lines.append(sig[cols].to_string(index=False, float_format=lambda v: f"{v:.4g}") if len(sig) else "(nenhuma)")
+    lines += [
+        "",
+        sub,
+        "TAXA ANUAL DE CRESCIMENTO (Poisson / binomial negativa, IC 95%)",
+        sub,
+    ]
+    fitted = trends[trends["Modelo"] != ""].sort_values(["Tipo", "TaxaCrescimento"], ascending=[True, False])
+    for r in fitted.itertuples():
+        lines.append(
+            f"{r.Tipo:<12} {r.Feature:<18} {r.Modelo:<8} {100 * r.TaxaCrescimento:+7.1f}% "
+            f"[{100 * r.TaxaIC_Inf:+.1f}%, {100 * r.TaxaIC_Sup:+.1f}%]"
+        )
+    lines += ["", sep]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Tabelas temporais e tendências do corpus SAT.")
+    ap.add_argument("--csv", type=Path, default=HERE / "mca_dados_categorizados_sat.csv")
+    ap.add_argument("--inicio", type=int, default=2010)
+    ap.add_argument("--fim", type=int, default=2025)
+    ap.add_argument("--out", type=Path, default=HERE, help="pasta de saída (padrão: a deste script)")
+    ap.add_argument("--estado", type=Path, default=STATE_PATH, help="arquivo de estado incremental")
+    ap.add_argument("--reconstruir", action="store_true", help="descarta o estado e reagrega a tabela inteira")
+    args = ap.parse_args()
+
+    if not args.csv.exists():
+        raise FileNotFoundError(f"Tabela categórica não encontrada: {args.csv} (rode build_sat_mca_dataset.py)")
+
+    agg = TemporalAggregator(FAMILIES) if args.reconstruir else TemporalAggregator.load(args.estado, FAMILIES)
+    n_new, rebuilt = agg.update(args.csv)
+    agg.save(args.estado)
+    tensor = agg.tensor(args.inicio, args.fim)
+    trends = trend_table(tensor)
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    pubs = pd.DataFrame({"Ano": tensor.years, "Total": tensor.totals})
+    pubs.to_csv(args.out / "temporal_publicacoes.csv", index=False)
+    for fam, name in FAMILY_TABLES.items():
+        tensor.family(fam).to_csv(args.out / name)
+    trends.to_csv(args.out / "temporal_tendencias.csv", index=False)
+    rolling_metrics(tensor).to_csv(args.out / "temporal_janelas.csv", index=False)
+    n_studies = int(tensor.totals.sum())
+    write_report(args.out / "temporal_relatorio.txt", trends, pubs, n_studies, (args.inicio, args.fim))
+
+    print(f"✓ Tendências temporais SAT: {args.out / 'temporal_tendencias.csv'}")
+    print(f"  - Registros agregados: {agg.n_records} ({'reagregados' if rebuilt else 'novos'}: {n_new})")
+    print(f"  - Estudos {args.inicio}-{args.fim}: {n_studies}")
+    print(f"  - Categorias analisadas: {tensor.counts.shape[1]} em {len(FAMILIES)} famílias")
+    print(f"  - Tendências significativas (p < {ALPHA}): {int(trends['Significativo'].sum())}")
+
+
+if __name__ == "__main__":
+    main()
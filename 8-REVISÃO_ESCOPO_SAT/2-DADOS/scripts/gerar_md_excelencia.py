@@ -1,6 +1,8 @@
 import re
 import os
 
+from sat_bib import read_records
+
 # Caminhos
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # O arquivo bib está em ../referencias_filtradas/relative to scripts
@@ -11,70 +13,33 @@ OUTPUT_MD = os.path.join(BASE_DIR, '..', '..', 'latex', '3-analise_excelencia.md
 SCORE_THRESHOLD = 12.0
 
 def parse_bib_line_by_line(file_path):
-    entries = []
-    current_entry = None
-    
+    # Nome mantido por compatibilidade: a leitura agora usa o parser
+    # compartilhado (sat_bib), que aceita valores em varias linhas.
     print(f"Lendo: {file_path}")
-    
+
     if not os.path.exists(file_path):
         print(f"Erro: Arquivo não encontrado: {file_path}")
         return []
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        
-    for line in lines:
-        line = line.strip()
-        if line.startswith('@'):
-            # Se já tinha um registro aberto, fecha
-            if current_entry:
-                entries.append(current_entry)
-            
-            # Começar novo
-            parts = line.split('{', 1)
-            if len(parts) > 1:
-                key_part = parts[1].rstrip(',')
-                current_entry = {'id': key_part}
-            else:
-                current_entry = {} 
-                
-        elif current_entry is not None:
-            if line == '}':
-                # Fim do registro
-                entries.append(current_entry)
-                current_entry = None
-            else:
-                # Parser simples linha a linha: campo = {valor},
-                # Identifica campo={valor}
-                match = re.match(r'([a-zA-Z0-9_]+)\s*=\s*{(.*)}', line)
-                if match:
-                    field = match.group(1).lower()
-                    value = match.group(2)
-                    
-                    # Limpeza final (se tiver vírgula no final da chave, etc)
-                    if value.endswith(','):
-                        value = value[:-1]
-                    
-                    # Parse especial do note para score
-                    if field == 'note':
-                        # note = {Fonte: Scopus, Score: 15.0}
-                        score_match = re.search(r'Score:\s*([\d\.]+)', value)
-                        if score_match:
-                            try:
-                                current_entry['score'] = float(score_match.group(1))
-                            except:
-                                current_entry['score'] = 0.0
-                        
-                        fonte_match = re.search(r'Fonte:\s*([^,]+)', value)
-                        if fonte_match:
-                            current_entry['fonte'] = fonte_match.group(1).strip()
-                    else:
-                        current_entry[field] = value
-    
-    # Adicionar o último
-    if current_entry:
-        entries.append(current_entry)
-        
+    entries = []
+    for record in read_records(file_path):
+        entry = {'id': record.key}
+        for field, value in record.fields.items():
+            if field != 'note':
+                entry[field] = value
+        # Parse especial do note para score: note = {Fonte: Scopus, Score: 15.0}
+        note = record.get('note')
+        score_match = re.search(r'Score:\s*([\d\.]+)', note)
+        if score_match:
+            try:
+                entry['score'] = float(score_match.group(1))
+            except ValueError:
+                entry['score'] = 0.0
+        fonte_match = re.search(r'Fonte:\s*([^,]+)', note)
+        if fonte_match:
+            entry['fonte'] = fonte_match.group(1).strip()
+        entries.append(entry)
+
     return entries
 
 def generate_report(entries):
@@ -1,6 +1,34 @@
+"""Converte citacoes autor-ano do manuscrito Markdown em chaves pandoc (@key).
+
+O .bib e indexado uma vez por (sobrenome normalizado, ano) com os
+sobrenomes dos coautores; o Markdown e percorrido em uma unica passada por
+uma expressao que reconhece os tres formatos:
+
+  (Silva, 2018)  (Silva et al., 2018a; Souza and Lima, 2020)  Silva (2018)
+
+Prefixos como "see"/"e.g." viram prefixo pandoc ([see @a; @b]).
+Cada mencao e resolvida contra o indice: sobrenomes com ou sem acento
+(Araújo/Araujo, {\\'e}), sufixos 2018a/2018b e o segundo autor em citacoes
+"A and B" desempatam entradas com mesmo primeiro autor e ano. Mencoes sem
+entrada ou ambiguas ficam como estao e vao para o relatorio (linha, texto,
+motivo), em vez de a primeira chave vista vencer em silencio.
+
+Uso:
+  python map_citations.py [--md revisao_escopo_en.md] [--bib referencias.bib] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
 import re
+import unicodedata
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from sat_bib import load_bib
+
 # Paths
 root = Path(__file__).resolve().parents[3]
 manus_dir = root / "1-MANUSCRITO"
@@ -8,124 +36,208 @@ bib_path = manus_dir / "referencias.bib"
 input_md = manus_dir / "revisao_escopo_en.md"
 output_md = manus_dir / "revisao_escopo_en.md"
 
-if not bib_path.exists() or not input_md.exists():
-    raise FileNotFoundError(
-        "Arquivos esperados não encontrados. Ajuste os caminhos conforme o layout do projeto. "
-        f"bib_path={bib_path} (exists={bib_path.exists()}); "
-        f"input_md={input_md} (exists={input_md.exists()})"
-    )
-
-# Build mapping: (first_author_lower, year) -> citekey
-entry_re = re.compile(r"@\w+\{([^,\s]+)")
-author_re = re.compile(r"author\s*=\s*\{([^}]+)\}", re.IGNORECASE)
-year_re = re.compile(r"year\s*=\s*\{([^}]+)\}", re.IGNORECASE)
-
-mapping = {}
-reverse_mapping = {}  # citekey -> (surname, year) for debugging
-with bib_path.open(encoding="utf-8") as f:
-    content = f.read()
-
-# Split bib entries by @ symbol at start of line
-entries = re.split(r'\n(?=@)', content)
-for e in entries:
-    if not e.strip():
-        continue
-    mkey = entry_re.search(e)
-    if not mkey:
-        continue
-    key = mkey.group(1).strip()
-    mauth = author_re.search(e)
-    myear = year_re.search(e)
-    if not mauth or not myear:
-        continue
-    year = myear.group(1).strip()
-    # First author surname (last word of first author segment)
-    first_author_segment = mauth.group(1).split(" and ")[0]
-    # Remove braces and trim
-    first_author_segment = re.sub(r"[{}]", "", first_author_segment).strip()
-    # Try formats "Surname, Name" or "Name Surname"
-    if "," in first_author_segment:
-        surname = first_author_segment.split(",")[0].strip()
-    else:
-        parts = first_author_segment.split()
-        surname = parts[-1].strip() if parts else first_author_segment.strip()
-    
-    # Clean surname (remove dots, etc)
-    surname = re.sub(r'\s+', '', surname).lower()
-    year_clean = year.strip()
-    
-    key_tuple = (surname, year_clean)
-    # Store all variations
-    if key_tuple not in mapping:
-        mapping[key_tuple] = key
-        reverse_mapping[key] = (surname, year_clean)
-
-# Regex patterns for author-year citations like (Surname, 2018) or (Surname et al., 2018)
-# Patterns for parenthetical citations, including multiple separated by ';' or ','
-multi_parenthetical_re = re.compile(
-    r"\((?P<cites>(?:[A-Z][A-Za-z'\-]+(?:\s+et\s+al\.)?|[A-Z][A-Za-z'\-]+)\s*,\s*\d{4}(?:\s*[;,]\s*(?:[A-Z][A-Za-z'\-]+(?:\s+et\s+al\.)?|[A-Z][A-Za-z'\-]+)\s*,\s*\d{4})*)\)"
-)
+_LATEX_ACCENT_RE = re.compile(r"\\[`'^\"~=.uvHckbdr]\s*|\\(?=[a-zA-Z])")
 
-# Pattern for single parenthetical citation
-single_parenthetical_re = re.compile(
-    r"\((?P<surname>[A-Z][A-Za-z'\-]+)(?:\s+et\s+al\.)?,\s*(?P<year>\d{4})\)"
-)
+# Surname as written in the text: optional lowercase particles + capitalized word(s).
+_NAME = r"(?:(?:van|von|de|da|do|dos|das|del|della|der|den|di|du|le|la|ter)\s+)*[^\W\d_a-z][\w'\-]*(?:-[^\W\d_][\w'\-]*)?"
+_AUTHORS = rf"(?P<first>{_NAME})(?:\s+(?:and|&)\s+(?P<second>{_NAME})|\s+et\s+al\.?)?"
+_YEAR = r"\d{4}[a-z]?"
+_ITEM = rf"{_NAME}(?:\s+(?:and|&)\s+{_NAME}|\s+et\s+al\.?)?\s*,\s*{_YEAR}(?:\s*,\s*{_YEAR})*"
 
-# Pattern for narrative citation like Surname (2010)
-narrative_re = re.compile(
-    r"(?P<surname>[A-Z][A-Za-z'\-]+)(?:\s+et\s+al\.)?\s*\((?P<year>\d{4})\)"
-)
+_PREFIX = r"(?:see also|see|e\.g\.|cf\.|i\.e\.)\s*,?\s*"
 
-text = input_md.read_text(encoding="utf-8")
-
-print(f"Loaded {len(mapping)} unique author-year mappings from referencias.bib")
-
-def replace_multi_parenthetical(m):
-    segment = m.group("cites")
-    parts = re.split(r"\s*[;,]\s*", segment)
-    keys = []
-    for part in parts:
-        sm = re.match(r"(?P<surname>[A-Z][A-Za-z'\-]+)(?:\s+et\s+al\.)?\s*,\s*(?P<year>\d{4})", part)
-        if not sm:
-            continue
-        surname = re.sub(r'\s+', '', sm.group("surname")).lower()
-        year = sm.group("year")
-        ck = mapping.get((surname, year))
-        if ck:
-            keys.append(f"@{ck}")
-    if keys:
-        return "[" + "; ".join(keys) + "]"
-    return m.group(0)
-
-def replace_single_parenthetical(m):
-    surname = re.sub(r'\s+', '', m.group("surname")).lower()
-    year = m.group("year")
-    ck = mapping.get((surname, year))
-    if ck:
-        return f"[@{ck}]"
-    return m.group(0)
-
-def replace_narrative(m):
-    surname = re.sub(r'\s+', '', m.group("surname")).lower()
-    year = m.group("year")
-    ck = mapping.get((surname, year))
-    if ck:
+CITATION_RE = re.compile(
+    rf"\((?P<prefix>{_PREFIX})?(?P<cites>{_ITEM}(?:\s*[;,]\s*{_ITEM})*)\)"
+    rf"|(?P<narrative>{_AUTHORS})\s*\((?P<nyears>{_YEAR}(?:\s*[;,]\s*{_YEAR})*)\)"
+)
+ITEM_RE = re.compile(rf"{_AUTHORS}\s*,\s*(?P<years>{_YEAR}(?:\s*,\s*{_YEAR})*)")
+AUTHORS_RE = re.compile(_AUTHORS)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase surname without accents, LaTeX accent commands, braces or spaces."""
+    name = _LATEX_ACCENT_RE.sub("", name).replace("{", "").replace("}", "")
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r"[\s.]+", "", name).lower()
+
+
+def surname_of(author: str) -> str:
+    """Surname from "Surname, Name" or "Name Surname" (braced groups kept whole)."""
+    author = author.strip()
+    if "," in author:
+        return author.split(",")[0].strip()
+    parts = re.findall(r"\{[^{}]*\}|\S+", author)
+    return parts[-1].strip() if parts else author
+
+
+@dataclass
+class BibRef:
+    key: str
+    year: str  # four digits
+    suffix: str  # "a", "b", ... when the .bib or key states it
+    surnames: list[str]  # normalized, in author order
+    title: str = ""
+    letter: str = ""  # suffix the text uses: stated, or assigned in title order
+
+
+@dataclass
+class Unresolved:
+    line: int
+    text: str
+    reason: str
+
+
+@dataclass
+class Resolution:
+    text: str
+    resolved: int = 0
+    unresolved: list[Unresolved] = field(default_factory=list)
+    keys: set[str] = field(default_factory=set)
+
+
+class CitationIndex:
+    def __init__(self, refs: list[BibRef]) -> None:
+        self.by_first: dict[tuple[str, str], list[BibRef]] = defaultdict(list)
+        for ref in refs:
+            if ref.surnames:
+                self.by_first[ref.surnames[0], ref.year].append(ref)
+        for group in self.by_first.values():
+            # Author-year styles letter same-author/same-year works in title
+            # order; letters stated in the .bib/key are kept and skipped.
+            group.sort(key=lambda r: (r.suffix or "~", normalize_name(r.title), r.key))
+            free = (c for c in "abcdefghijklmnopqrstuvwxyz" if c not in {r.suffix for r in group})
+            for r in group:
+                r.letter = r.suffix or (next(free) if len(group) > 1 else "")
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self.by_first.values())
+
+    @classmethod
+    def from_bib(cls, path: Path) -> "CitationIndex":
+        refs = []
+        # Shared parser (sat_bib): a repeated key keeps its first entry, as in BibTeX.
+        for e in load_bib(path).entries.values():
+            ym = re.search(r"(\d{4})([a-z]?)", e.get("year"))
+            if not (e.get("author") and ym):
+                continue
+            year, suffix = ym.groups()
+            if not suffix:
+                km = re.search(rf"{year}([a-z])$", e.key)
+                suffix = km.group(1) if km else ""
+            surnames = [normalize_name(surname_of(a)) for a in e.authors]
+            refs.append(BibRef(e.key, year, suffix, [s for s in surnames if s], e.get("title")))
+        return cls(refs)
+
+    def resolve(self, first: str, year: str, second: str | None = None, et_al: bool = False) -> tuple[str | None, str]:
+        """(key, "") or (None, reason)."""
+        y, suffix = year[:4], year[4:]
+        cands = self.by_first.get((normalize_name(first), y), [])
+        if not cands:
+            return None, "sem entrada no .bib"
+        if second:
+            s2 = normalize_name(second)
+            narrowed = [r for r in cands if len(r.surnames) == 2 and r.surnames[1] == s2]
+            cands = narrowed or [r for r in cands if len(r.surnames) > 1 and r.surnames[1] == s2] or cands
+        elif et_al:
+            cands = [r for r in cands if len(r.surnames) > 2] or cands
+        elif len(cands) > 1:
+            cands = [r for r in cands if len(r.surnames) == 1] or cands
+        if suffix and len(self.by_first[normalize_name(first), y]) > 1:
+            # The letter identifies the work among all same-author/year entries.
+            lettered = [r for r in self.by_first[normalize_name(first), y] if r.letter == suffix]
+            if not lettered:
+                return None, f"sufixo {suffix} sem entrada correspondente"
+            cands = lettered
+        if len(cands) > 1:
+            return None, "ambigua: " + ", ".join(r.key for r in cands)
+        return cands[0].key, ""
+
+
+def resolve_text(text: str, index: CitationIndex) -> Resolution:
+    """Rewrite every author-year mention in one pass; unresolved ones are left as is."""
+    line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    res = Resolution(text)
+
+    def lookup(m: re.Match, years: str) -> list[tuple[str | None, str]]:
+        return [
+            index.resolve(m.group("first"), y, m.group("second"), "et al" in m.group(0))
+            for y in re.split(r"\s*[;,]\s*", years)
+        ]
+
+    def fail(m: re.Match, reasons: list[str]) -> str:
+        line = bisect_right(line_starts, m.start())
+        res.unresolved.append(Unresolved(line, " ".join(m.group(0).split()), "; ".join(reasons)))
+        return m.group(0)
+
+    def repl(m: re.Match) -> str:
+        if m.group("cites"):
+            results = []
+            for item in ITEM_RE.finditer(m.group("cites")):
+                results += lookup(item, item.group("years"))
+            reasons = [r for k, r in results if k is None]
+            if reasons:
+                return fail(m, reasons)
+            keys = [k for k, _ in results]
+            res.resolved += len(keys)
+            res.keys.update(keys)
+            prefix = (m.group("prefix") or "").strip().rstrip(",")
+            return "[" + (prefix + " " if prefix else "") + "; ".join(f"@{k}" for k in keys) + "]"
+        authors = AUTHORS_RE.fullmatch(m.group("narrative"))
+        results = lookup(authors, m.group("nyears"))
+        reasons = [r for k, r in results if k is None]
+        if reasons:
+            return fail(m, reasons)
+        keys = [k for k, _ in results]
+        res.resolved += len(keys)
+        res.keys.update(keys)
         # Narrative citation without brackets
-        return f"@{ck}"
-    return m.group(0)
+        return " ".join(f"@{k}" for k in keys)
+
+    res.text = CITATION_RE.sub(repl, text)
+    return res
+
+
+def print_report(res: Resolution) -> None:
+    print(f"{res.resolved} citacoes resolvidas ({len(res.keys)} chaves distintas); {len(res.unresolved)} nao resolvidas")
+    for u in res.unresolved:
+        print(f"  L{u.line}: {u.text}  -> {u.reason}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Converte citacoes autor-ano em chaves pandoc.")
+    ap.add_argument("--md", type=Path, default=input_md)
+    ap.add_argument("--bib", type=Path, default=bib_path)
+    ap.add_argument("--out", type=Path, help="padrao: sobrescreve --md")
+    ap.add_argument("--dry-run", action="store_true", help="so o relatorio, nao grava")
+    args = ap.parse_args()
+
+    if not args.bib.exists() or not args.md.exists():
+        raise FileNotFoundError(
+            "Arquivos esperados não encontrados. Ajuste os caminhos conforme o layout do projeto. "
+            f"bib_path={args.bib} (exists={args.bib.exists()}); "
+            f"input_md={args.md} (exists={args.md.exists()})"
+        )
+
+    index = CitationIndex.from_bib(args.bib)
+    print(f"Loaded {len(index)} author-year entries from {args.bib.name}")
+    res = resolve_text(args.md.read_text(encoding="utf-8"), index)
+    print_report(res)
+    if args.dry_run:
+        return
+
+    text = res.text
+    # Ensure YAML lang is en-US
+    text = re.sub(r"(^lang:\s*)(.*)$", r"\1en-US", text, flags=re.MULTILINE)
 
-# Apply replacements: multi first, then single, then narrative
-text = multi_parenthetical_re.sub(replace_multi_parenthetical, text)
-text = single_parenthetical_re.sub(replace_single_parenthetical, text)
-text = narrative_re.sub(replace_narrative, text)
+    # Ensure refs div at end
+    if "::: {#refs}" not in text:
+        text = text.rstrip() + "\n\n::: {#refs}\n:::\n"
 
-# Ensure YAML lang is en-US
-text = re.sub(r"(^lang:\s*)(.*)$", r"\1en-US", text, flags=re.MULTILINE)
+    out = args.out or (output_md if args.md == input_md else args.md)
+    out.write_text(text, encoding="utf-8")
+    print("Citations mapped. Output:", out)
 
-# Ensure refs div at end
-if "::: {#refs}" not in text:
-    text = text.rstrip() + "\n\n::: {#refs}\n:::\n"
 
-# Write synced copy and also update the original adjusted file
-output_md.write_text(text, encoding="utf-8")
-print("Citations mapped. Output:", output_md)
+if __name__ == "__main__":
+    main()
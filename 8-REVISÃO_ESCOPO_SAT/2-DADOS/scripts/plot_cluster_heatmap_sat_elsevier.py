@@ -3,6 +3,10 @@
 Inputs:
 - mca_dados_categorizados_sat.csv
 
+K is chosen by sat_clustering.select_k (parallel candidates, cached per input).
+Engine: SAT_CLUSTER_ENGINE=kmeans (default, sparse one-hot) or kmodes
+(integer-coded table; SAT_CLUSTER_BATCH=<n> enables mini-batch updates).
+
 Output (overwrite, to keep LaTeX stable):
 - ../../2-FIGURAS/2-EN/cluster_heatmap_profiles_edit.png
 
@@ -12,6 +16,7 @@ Run:
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -19,9 +24,17 @@ import numpy as np
 import pandas as pd
 from matplotlib.colors import LinearSegmentedColormap
 from scipy.cluster.hierarchy import dendrogram, linkage
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 
+from sat_clustering import (
+    cluster_profiles,
+    encode_categories,
+    select_k,
+    sparse_one_hot,
+)
+
+
+CLUSTER_ENGINE = os.environ.get("SAT_CLUSTER_ENGINE", "kmeans")
+CLUSTER_BATCH = int(os.environ["SAT_CLUSTER_BATCH"]) if os.environ.get("SAT_CLUSTER_BATCH") else None
 
 PASTEL = {
     "blue": "#8CB7D9",
@@ -47,17 +60,6 @@ def _style() -> None:
     )
 
 
-def one_hot_from_categories(df: pd.DataFrame, dims: list[str]) -> tuple[pd.DataFrame, list[str]]:
-    frames: list[pd.DataFrame] = []
-    for d in dims:
-        s = df[d].fillna("NA").astype(str).str.strip()
-        # Keep a stable prefix for interpretability
-        dummies = pd.get_dummies(s, prefix=d, prefix_sep="_")
-        frames.append(dummies)
-    X = pd.concat(frames, axis=1)
-    return X, list(X.columns)
-
-
 # PT→EN dimension label mapping
 DIM_EN = {
     "Algoritmo": "Algorithm",
@@ -133,22 +135,6 @@ def _branch_label(leaf_labels: list[str], leaf_ids: list[int], heat0: pd.DataFra
     return f"C{best} {dims_txt}".strip()
 
 
-def choose_k(X: np.ndarray, k_min: int = 2, k_max: int = 6, seed: int = 7) -> tuple[int, float]:
-    best_k = k_min
-    best_s = -1.0
-    for k in range(k_min, k_max + 1):
-        km = KMeans(n_clusters=k, random_state=seed, n_init=20)
-        labels = km.fit_predict(X)
-        # silhouette requires at least 2 clusters and no single cluster
-        if len(set(labels)) < 2:
-            continue
-        s = float(silhouette_score(X, labels, metric="euclidean"))
-        if s > best_s:
-            best_s = s
-            best_k = k
-    return best_k, best_s
-
-
 def main() -> None:
     _style()
 
@@ -160,13 +146,15 @@ def main() -> None:
     df = df[(df["Ano"] >= 2010) & (df["Ano"] <= 2025)].copy()
 
     dims = ["Algoritmo", "Evidencia", "Contexto", "Aplicacao", "Regiao"]
-    X_df, feature_names = one_hot_from_categories(df, dims)
+    codes, levels = encode_categories(df, dims)
 
-    X = X_df.to_numpy(dtype=float)
-
-    k, sil = choose_k(X, k_min=2, k_max=5, seed=7)
-    km = KMeans(n_clusters=k, random_state=7, n_init=30)
-    labels = km.fit_predict(X)
+    # The winning fit is reused directly (no refit for the chosen k).
+    if CLUSTER_ENGINE == "kmodes":
+        sel = select_k(codes, k_min=2, k_max=5, seed=7, n_init=10, engine="kmodes", batch_size=CLUSTER_BATCH)
+    else:
+        X = sparse_one_hot(codes, levels)
+        sel = select_k(X, k_min=2, k_max=5, seed=7, n_init=30)
+    k, sil, labels = sel.k, sel.score, sel.labels
 
     df_out = df[["ID", "Ano"]].copy() if "ID" in df.columns else df[["Ano"]].copy()
     df_out["cluster"] = labels + 1
@@ -175,13 +163,7 @@ def main() -> None:
     sizes = df_out["cluster"].value_counts().sort_index()
 
     # Cluster profiles: mean presence for each feature
-    prof = (
-        pd.DataFrame(X, columns=feature_names)
-        .assign(cluster=labels + 1)
-        .groupby("cluster")
-        .mean(numeric_only=True)
-        .reindex(index=sorted(sizes.index))
-    )
+    prof = cluster_profiles(codes, levels, labels, dims).reindex(index=sorted(sizes.index))
 
     # Select top features by overall mean, keep heatmap readable
     overall = prof.mean(axis=0).sort_values(ascending=False)
@@ -332,7 +314,7 @@ def main() -> None:
     fig.savefig(out_path, facecolor="white", bbox_inches="tight")
     plt.close(fig)
 
-    print(f"CLUSTER (SAT-only): k={k} silhouette={sil:.3f} sizes={dict(sizes)}")
+    print(f"CLUSTER (SAT-only, {CLUSTER_ENGINE}): k={k} silhouette={sil:.3f} sizes={dict(sizes)}")
     print(f"OK: saved {out_path}")
 
 
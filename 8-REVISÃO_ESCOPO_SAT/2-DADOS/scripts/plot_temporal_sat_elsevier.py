@@ -1,7 +1,8 @@
 """Temporal figures (SAT-only) in Elsevier-like style.
 
-Style: Points + connecting line (blue) with LOESS trend zone (orange ribbon)
-for (a), and multi-line plot per algorithm family for (b).
+Style: Points + connecting line (blue) with LOESS trend and its 90 %
+residual-bootstrap band (orange ribbon) for (a), and multi-line plot per
+algorithm family for (b).
 Matches the original R ggplot2 figures (05a/05b).
 
 Inputs:
@@ -17,6 +18,7 @@ Run:
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -25,6 +27,11 @@ import pandas as pd
 from scipy.interpolate import make_interp_spline
 from scipy.stats import norm
 
+from sat_temporal import N_BOOT, lowess_band
+
+# Bootstrap replicates for the LOWESS ribbon (SAT_LOWESS_BOOT=<n> to override).
+LOWESS_BOOT = int(os.environ.get("SAT_LOWESS_BOOT") or N_BOOT)
+
 # ── Colours ──────────────────────────────────────────────────────────────────
 COLOR_LINE = "#2E86AB"       # Blue line + points (publications)
 COLOR_TREND = "#FC4E07"      # Orange LOESS trend + ribbon
@@ -57,43 +64,36 @@ def _style() -> None:
 
 
 def _loess_like(x: np.ndarray, y: np.ndarray, frac: float = 0.75,
-                n_out: int = 200) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Compute LOWESS smoothing with standard-error ribbon.
+                n_out: int = 200) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Compute LOWESS smoothing with a bootstrap confidence ribbon.
 
-    Uses statsmodels lowess for the trend and a simple local residual
-    estimate for the SE band (90 % CI), mimicking R's loess(span=0.75).
+    Uses statsmodels lowess for the trend (mimicking R's loess(span=0.75))
+    and a 90 % residual-bootstrap band (``sat_temporal.lowess_band``, cached
+    per input), both interpolated to a fine grid.
     """
     try:
-        from statsmodels.nonparametric.smoothers_lowess import lowess as sm_lowess
+        import statsmodels  # noqa: F401
     except ImportError:
         # Fallback: numpy polyfit
         coeffs = np.polyfit(x, y, 3)
         x_smooth = np.linspace(x.min(), x.max(), n_out)
         y_smooth = np.polyval(coeffs, x_smooth)
         residual_se = np.std(y - np.polyval(coeffs, x))
-        z90 = norm.ppf(0.95)
-        return x_smooth, y_smooth, np.full_like(y_smooth, residual_se * z90)
+        half_width = residual_se * norm.ppf(0.95)
+        return x_smooth, y_smooth, y_smooth - half_width, y_smooth + half_width
 
-    raw = sm_lowess(y, x, frac=frac, return_sorted=True)
-    x_lo, y_lo = raw[:, 0], raw[:, 1]
+    band = lowess_band(x, y, frac=frac, n_boot=LOWESS_BOOT, level=0.90)
 
     # Interpolate to a fine grid for smooth ribbon
     x_smooth = np.linspace(x.min(), x.max(), n_out)
-    if len(x_lo) >= 4:
-        spl = make_interp_spline(x_lo, y_lo, k=3)
-        y_smooth = spl(x_smooth)
-    else:
-        y_smooth = np.interp(x_smooth, x_lo, y_lo)
-
-    # Approximate local SE: residual std within sliding window
-    fitted_at_data = np.interp(x, x_lo, y_lo)
-    residuals = y - fitted_at_data
-    global_se = np.std(residuals)
-
-    z90 = norm.ppf(0.95)  # 90 % bilateral
-    half_width = z90 * global_se
-
-    return x_smooth, y_smooth, np.full_like(y_smooth, half_width)
+    curves = []
+    for values in (band.fit, band.lower, band.upper):
+        if len(band.x) >= 4:
+            curves.append(make_interp_spline(band.x, values, k=3)(x_smooth))
+        else:
+            curves.append(np.interp(x_smooth, band.x, values))
+    y_smooth, lower, upper = curves
+    return x_smooth, y_smooth, lower, upper
 
 
 def main() -> None:
@@ -118,13 +118,12 @@ def main() -> None:
     x_data = years.astype(float)
     y_data = counts.values.astype(float)
 
-    x_sm, y_sm, hw = _loess_like(x_data, y_data)
+    x_sm, y_sm, lwr, upr = _loess_like(x_data, y_data)
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Orange LOESS ribbon (90 % CI)
-    lwr = np.maximum(0, y_sm - hw)
-    upr = y_sm + hw
+    lwr = np.maximum(0, lwr)
     ax.fill_between(x_sm, lwr, upr, color=COLOR_TREND, alpha=0.18, zorder=1)
     ax.plot(x_sm, upr, color=COLOR_TREND, linewidth=0.6, alpha=0.9, zorder=2)
     ax.plot(x_sm, lwr, color=COLOR_TREND, linewidth=0.6, alpha=0.9, zorder=2)
@@ -0,0 +1,224 @@
+"""Render every SAT figure (plot_*_elsevier.py) in one go.
+
+Each figure script is imported as a module and its ``main()`` is run in a
+process pool with the Agg backend, so the matplotlib/pandas import cost is
+paid once per worker and independent figures render concurrently. Per-figure
+timings (and captured stdout) are printed at the end; the wall time is roughly
+that of the slowest figure.
+
+Each figure declares its input files and parameters; figures whose script,
+inputs, parameters and outputs are unchanged since the last render (see
+sat_figcache.py) are skipped without touching the PNGs.
+
+Outputs: the PNGs each script already writes to ../../2-FIGURAS/2-EN
+
+Run:
+  python render_all.py                 # all figures, one worker per CPU
+  python render_all.py --jobs 1        # serial, same process
+  python render_all.py --only plot_temporal_sat_elsevier plot_network_sat_elsevier
+  python render_all.py --force         # ignore the cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from sat_figcache import FigureCache
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+FIG_DIR = (SCRIPT_DIR / "../../2-FIGURAS/2-EN").resolve()
+
+MCA_CSV = "mca_dados_categorizados_sat.csv"
+META_DIR = "../1-ESTATISTICA/1-RSTUDIO/9-META_ANALISE"
+
+
+@dataclass(frozen=True)
+class FigureJob:
+    module: str
+    outputs: tuple[str, ...]
+    # Paths relative to this folder (data files and helper modules the script imports).
+    inputs: tuple[str, ...] = ()
+    # Environment variables that change what the script draws.
+    env: tuple[str, ...] = ()
+
+
+# Listed slowest first so the long 600-dpi renders start immediately.
+FIGURES: tuple[FigureJob, ...] = (
+    FigureJob(
+        "plot_network_sat_elsevier",
+        (
+            "network_completa.png",
+            "network_communities.png",
+            "network_algoritmo_produto.png",
+            "network_centrality_metrics.png",
+        ),
+        inputs=(MCA_CSV,),
+    ),
+    FigureJob("plot_modules_detailed_sat_elsevier", ("louvain_modules_detailed.png",), inputs=(MCA_CSV,)),
+    FigureJob("plot_mca_biplot_elsevier", ("mca_biplot_temporal_completo.png",), inputs=(MCA_CSV,)),
+    FigureJob(
+        "plot_cluster_heatmap_sat_elsevier",
+        ("cluster_heatmap_profiles_edit.png",),
+        inputs=(MCA_CSV, "sat_clustering.py"),
+        env=("SAT_CLUSTER_ENGINE", "SAT_CLUSTER_BATCH"),
+    ),
+    FigureJob(
+        "plot_temporal_sat_elsevier",
+        ("temporal_publicacoes.png", "temporal_algoritmos.png"),
+        inputs=(MCA_CSV, "sat_temporal.py"),
+        env=("SAT_LOWESS_BOOT",),
+    ),
+    FigureJob(
+        "plot_fair_combined_elsevier",
+        ("fair_radar_2.png", "fair_radar_only.png"),
+        inputs=("scores_por_dimensao_sat.csv", "indicadores_fair_detalhados_sat.csv"),
+    ),
+    FigureJob(
+        "plot_fair_indicadores_elsevier",
+        ("fair_indicadores.png",),
+        inputs=("indicadores_fair_detalhados_sat.csv",),
+    ),
+    FigureJob(
+        "plot_forest_algoritmos_elsevier",
+        ("meta_analise_algoritmos.png",),
+        inputs=(f"{META_DIR}/meta_analise_por_algoritmo_sat.csv",),
+    ),
+    FigureJob(
+        "plot_meta_regressao_elsevier",
+        ("meta_regressao_ano.png",),
+        inputs=(f"{META_DIR}/dados_meta_analise_sat.csv",),
+    ),
+)
+
+
+@dataclass
+class RenderResult:
+    module: str
+    ok: bool
+    seconds: float
+    stdout: str
+    error: str = ""
+    cached: bool = False
+
+
+def _init_worker() -> None:
+    os.environ["MPLBACKEND"] = "Agg"
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    # Warm the heavy imports once per worker (no-op when inherited via fork).
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+
+def render_one(module: str) -> RenderResult:
+    """Import ``module`` and run its main() with isolated rcParams and captured stdout."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    buf = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        # Some scripts set rcParams at import time or in main(); keep them from
+        # leaking into the next figure rendered by the same worker.
+        with plt.rc_context(), contextlib.redirect_stdout(buf):
+            matplotlib.rcdefaults()
+            mod = importlib.import_module(module)
+            mod.main()
+            plt.close("all")
+    except Exception:
+        return RenderResult(module, False, time.perf_counter() - t0, buf.getvalue(), traceback.format_exc())
+    return RenderResult(module, True, time.perf_counter() - t0, buf.getvalue())
+
+
+def render_all(
+    only: list[str] | None = None,
+    jobs: int | None = None,
+    verbose: bool = False,
+    force: bool = False,
+) -> list[RenderResult]:
+    selected = [f for f in FIGURES if not only or f.module in only]
+    unknown = sorted(set(only or []) - {f.module for f in FIGURES})
+    if unknown:
+        raise ValueError(f"Figuras desconhecidas: {', '.join(unknown)}")
+
+    t0 = time.perf_counter()
+    cache = FigureCache(FIG_DIR, SCRIPT_DIR)
+    keys = {f.module: cache.key(f.module, f.inputs, f.env) for f in selected}
+
+    results: list[RenderResult] = []
+    todo: list[FigureJob] = []
+    for f in selected:
+        if not force and cache.is_fresh(f.module, keys[f.module], f.outputs):
+            results.append(RenderResult(f.module, True, 0.0, "", cached=True))
+        else:
+            todo.append(f)
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(todo) or 1))
+    if todo and jobs == 1:
+        _init_worker()
+        for f in todo:
+            results.append(render_one(f.module))
+    elif todo:
+        _init_worker()  # pre-import in the parent so forked workers inherit it
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            futures = {pool.submit(render_one, f.module): f for f in todo}
+            for fut in as_completed(futures):
+                results.append(fut.result())
+
+    by_module = {f.module: f for f in selected}
+    rendered = [r for r in results if r.ok and not r.cached]
+    for r in rendered:
+        cache.record(r.module, keys[r.module], by_module[r.module].outputs)
+    if rendered:
+        cache.save()
+    wall = time.perf_counter() - t0
+
+    order = {f.module: i for i, f in enumerate(selected)}
+    results.sort(key=lambda r: order[r.module])
+
+    for r in results:
+        if verbose and r.stdout.strip():
+            print(f"--- {r.module}")
+            print(r.stdout.rstrip())
+        if not r.ok:
+            print(f"--- {r.module} FALHOU")
+            print(r.error.rstrip())
+
+    print("\nRENDER TIMINGS")
+    for r in results:
+        status = "cached" if r.cached else ("ok" if r.ok else "FAIL")
+        print(f"  {r.module:<38} {r.seconds:7.2f}s  {status}")
+    total_cpu = sum(r.seconds for r in results)
+    print(f"  {'wall':<38} {wall:7.2f}s  (sum of figures {total_cpu:.2f}s, jobs={jobs})")
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Render all SAT figures concurrently.")
+    ap.add_argument("--only", nargs="+", metavar="MODULE", help="subset of figure modules to render")
+    ap.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--verbose", "-v", action="store_true", help="print each script's stdout")
+    ap.add_argument("--force", action="store_true", help="render even when the figure cache is fresh")
+    args = ap.parse_args()
+
+    results = render_all(only=args.only, jobs=args.jobs, verbose=args.verbose, force=args.force)
+    if not all(r.ok for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,12 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from sat_bib import read_records
+
 
 def count_bib_entries(bib_path: Path) -> int:
-    text = bib_path.read_text(encoding="utf-8", errors="ignore")
-    # naive but stable: count occurrences of "@" at line starts
-    return sum(1 for line in text.splitlines() if line.lstrip().startswith("@"))
+    # Records as the shared parser sees them (@comment/@string excluded).
+    return len(read_records(bib_path))
 
 
 def main() -> None:
@@ -0,0 +1,78 @@
+"""Shared bibliography loader for the SAT scripts.
+
+Every script that reads a .bib (the filtered corpus, the raw Scopus/WoS
+exports or the manuscript's referencias.bib) goes through the same
+tokenizer and entry model, ``tools/bib_index.py``: one brace-aware pass per
+file, records in file order (repeated keys kept, as the exports have them),
+and a persisted index in ``tools/_cache/bib/`` reused while the file's
+SHA-256 is unchanged. Within one process each file is parsed once.
+
+``BibEntry.get(name)`` is the raw field value (whitespace collapsed, nested
+braces kept); ``BibEntry.text(name)`` strips braces and LaTeX accents.
+
+Used by:
+- build_sat_mca_dataset.py
+- build_sat_fair_dataset.py
+- build_sat_meta_analysis_dataset.py
+- sat_enrich.py
+- gerar_md_excelencia.py
+- map_citations.py
+- report_sat_summary.py
+- OLD/analisar_scopus_wos_combinado.py
+- OLD/gerar_relatorios_finais.py
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Mapping
+
+HERE = Path(__file__).resolve().parent
+# The release (zenodo_release/MANIFEST.csv) ships bib_index.py next to this
+# file; in the repository it lives in <repo>/tools.
+if not (HERE / "bib_index.py").exists():
+    TOOLS_DIR = HERE.parents[2] / "tools"
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+
+from bib_index import BibEntry, BibIndex, load_bib  # noqa: E402
+
+__all__ = ["BibEntry", "BibIndex", "export_dois", "load_bib", "read_records", "title_key"]
+
+_TITLE_NOISE_RE = re.compile(r"\\[A-Za-z]+|[\W_]+")
+
+
+def read_records(path: str | Path) -> list[BibEntry]:
+    """All entries of ``path`` in file order (duplicated keys included)."""
+    return load_bib(path).records
+
+
+def title_key(title: str) -> str:
+    """Title reduced to lowercase letters and digits (LaTeX commands, braces, punctuation dropped)."""
+    return _TITLE_NOISE_RE.sub("", title.casefold())
+
+
+def export_dois(paths: Iterable[str | Path], titles: Mapping[str, str] | None = None) -> dict[str, str]:
+    """BibTeX key -> DOI from the raw Scopus/WoS exports.
+
+    The filtered corpus has no doi field; its keys are those of the exports.
+    A key repeated in an export (different papers) keeps its last definition,
+    as the screening script (OLD/analisar_scopus_wos_combinado.py) does. With
+    ``titles`` (key -> title of the corpus entry), keys whose export title
+    differs are dropped rather than joined to another paper's DOI.
+    """
+    last: dict[str, BibEntry] = {}
+    for path in paths:
+        if Path(path).exists():
+            for e in load_bib(path).records:
+                last[e.key] = e
+    dois = {}
+    for key, e in last.items():
+        if not e.doi:
+            continue
+        if titles is not None and (key not in titles or title_key(e.get("title")) != title_key(titles[key])):
+            continue
+        dois[key] = e.doi
+    return dois
@@ -0,0 +1,371 @@
+"""Clustering engines for the SAT categorical table.
+
+Two engines share the same k selection and output contract:
+
+- ``kmeans``: Euclidean KMeans on the sparse one-hot matrix (CSR, never dense).
+- ``kmodes``: k-modes (matching dissimilarity) on the integer-coded table,
+  with optional mini-batch updates for large corpora.
+
+Candidate k values are fitted in parallel (process pool), each scored with
+silhouette (sampled for large n) or Calinski-Harabasz, and the winning fit is
+returned as-is so callers do not refit it. The chosen model is cached under
+``_cache/`` keyed by a hash of the input matrix and the search settings.
+
+``cluster_profiles`` turns labels into the cluster x feature mean-presence
+table (``Dim_Value`` columns) consumed by the heatmap, without building dummies.
+
+Used by:
+- plot_cluster_heatmap_sat_elsevier.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from sklearn.cluster import KMeans
+from sklearn.metrics import calinski_harabasz_score, silhouette_score
+
+
+CACHE_DIR = Path(__file__).resolve().parent / "_cache"
+
+# Above this many rows the O(n^2) silhouette is estimated on a random sample.
+SILHOUETTE_SAMPLE = 2000
+
+METRICS = ("silhouette", "calinski_harabasz")
+ENGINES = ("kmeans", "kmodes")
+
+
+@dataclass
+class KSelection:
+    k: int
+    score: float
+    metric: str
+    labels: np.ndarray
+    model: "KMeans | KModes"
+    scores: dict[int, float] = field(default_factory=dict)
+
+
+def input_hash(X: np.ndarray, **params: object) -> str:
+    h = hashlib.sha256()
+    if sparse.issparse(X):
+        X = X.tocsr()
+        arrays = [X.data, X.indices, X.indptr]
+    else:
+        arrays = [np.asarray(X)]
+    h.update(str(X.shape).encode())
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.dtype).encode())
+        h.update(arr.tobytes())
+    h.update(sklearn.__version__.encode())
+    for k in sorted(params):
+        h.update(f"{k}={params[k]!r};".encode())
+    return h.hexdigest()
+
+
+def encode_categories(df: pd.DataFrame, dims: list[str]) -> tuple[np.ndarray, list[list[str]]]:
+    """Integer-code each dimension (levels sorted, as pd.get_dummies orders them)."""
+    codes = np.empty((len(df), len(dims)), dtype=np.int32)
+    levels: list[list[str]] = []
+    for j, d in enumerate(dims):
+        s = df[d].fillna("NA").astype(str).str.strip().to_numpy()
+        uniq, inv = np.unique(s, return_inverse=True)
+        codes[:, j] = inv
+        levels.append([str(u) for u in uniq])
+    return codes, levels
+
+
+def feature_names(dims: list[str], levels: list[list[str]]) -> list[str]:
+    return [f"{d}_{v}" for d, lv in zip(dims, levels) for v in lv]
+
+
+def sparse_one_hot(codes: np.ndarray, levels: list[list[str]]) -> sparse.csr_matrix:
+    """One-hot CSR matrix (n x sum(levels)) built straight from the codes."""
+    n, d = codes.shape
+    offsets = np.cumsum([0] + [len(lv) for lv in levels[:-1]])
+    cols = (codes + offsets[None, :]).ravel()
+    rows = np.repeat(np.arange(n), d)
+    data = np.ones(n * d, dtype=float)
+    width = int(sum(len(lv) for lv in levels))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n, width))
+
+
+def cluster_profiles(codes: np.ndarray, levels: list[list[str]], labels: np.ndarray, dims: list[str]) -> pd.DataFrame:
+    """Mean presence of every ``Dim_Value`` feature per cluster (1-based index)."""
+    clusters = np.unique(labels)
+    pos = np.searchsorted(clusters, labels)
+    sizes = np.bincount(pos, minlength=len(clusters)).astype(float)
+    blocks = []
+    for j, lv in enumerate(levels):
+        counts = np.zeros((len(clusters), len(lv)), dtype=float)
+        np.add.at(counts, (pos, codes[:, j]), 1.0)
+        blocks.append(counts / sizes[:, None])
+    prof = pd.DataFrame(
+        np.hstack(blocks),
+        index=pd.Index(clusters + 1, name="cluster"),
+        columns=feature_names(dims, levels),
+    )
+    return prof
+
+
+class KModes:
+    """k-modes with matching dissimilarity on an integer-coded table.
+
+    ``batch_size=None`` runs classic full-batch iterations; otherwise each epoch
+    streams shuffled mini-batches, accumulating per-cluster level counts and
+    refreshing the modes after every batch, so memory stays O(batch x k).
+    """
+
+    def __init__(
+        self,
+        n_clusters: int,
+        n_init: int = 10,
+        max_iter: int = 100,
+        batch_size: int | None = None,
+        random_state: int | None = None,
+    ) -> None:
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.max_iter = max_iter
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+    @staticmethod
+    def _dissim(codes: np.ndarray, modes: np.ndarray) -> np.ndarray:
+        dist = np.zeros((codes.shape[0], modes.shape[0]), dtype=np.int32)
+        for j in range(codes.shape[1]):
+            dist += codes[:, j][:, None] != modes[:, j][None, :]
+        return dist
+
+    def _assign(self, codes: np.ndarray, modes: np.ndarray) -> tuple[np.ndarray, float]:
+        labels = np.empty(codes.shape[0], dtype=np.int32)
+        cost = 0.0
+        step = self.batch_size or codes.shape[0]
+        for start in range(0, codes.shape[0], step):
+            dist = self._dissim(codes[start:start + step], modes)
+            labels[start:start + step] = dist.argmin(axis=1)
+            cost += float(dist.min(axis=1).sum())
+        return labels, cost
+
+    def _modes_from_counts(self, counts: list[np.ndarray], modes: np.ndarray) -> np.ndarray:
+        new = modes.copy()
+        for j, c in enumerate(counts):
+            filled = c.sum(axis=1) > 0
+            # Empty clusters keep their previous mode.
+            new[filled, j] = c[filled].argmax(axis=1)
+        return new
+
+    def _single_run(self, codes: np.ndarray, n_levels: list[int], rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, float]:
+        n = codes.shape[0]
+        modes = codes[rng.choice(n, size=self.n_clusters, replace=False)].copy()
+        labels = np.full(n, -1, dtype=np.int32)
+        for _ in range(self.max_iter):
+            counts = [np.zeros((self.n_clusters, L), dtype=np.int64) for L in n_levels]
+            if self.batch_size is None:
+                new_labels, _ = self._assign(codes, modes)
+                for j in range(codes.shape[1]):
+                    np.add.at(counts[j], (new_labels, codes[:, j]), 1)
+                modes = self._modes_from_counts(counts, modes)
+            else:
+                order = rng.permutation(n)
+                new_labels = np.empty(n, dtype=np.int32)
+                for start in range(0, n, self.batch_size):
+                    idx = order[start:start + self.batch_size]
+                    batch = codes[idx]
+                    lab = self._dissim(batch, modes).argmin(axis=1).astype(np.int32)
+                    new_labels[idx] = lab
+                    for j in range(codes.shape[1]):
+                        np.add.at(counts[j], (lab, batch[:, j]), 1)
+                    modes = self._modes_from_counts(counts, modes)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+        labels, cost = self._assign(codes, modes)
+        return modes, labels, cost
+
+    def fit(self, codes: np.ndarray) -> "KModes":
+        codes = np.asarray(codes, dtype=np.int32)
+        n_levels = [int(codes[:, j].max()) + 1 for j in range(codes.shape[1])]
+        rng = np.random.default_rng(self.random_state)
+        best: tuple[np.ndarray, np.ndarray, float] | None = None
+        for _ in range(self.n_init):
+            run = self._single_run(codes, n_levels, rng)
+            if best is None or run[2] < best[2]:
+                best = run
+        assert best is not None
+        self.cluster_modes_, self.labels_, self.cost_ = best
+        return self
+
+    def fit_predict(self, codes: np.ndarray) -> np.ndarray:
+        return self.fit(codes).labels_
+
+    def predict(self, codes: np.ndarray) -> np.ndarray:
+        return self._assign(np.asarray(codes, dtype=np.int32), self.cluster_modes_)[0]
+
+
+def calinski_harabasz(X, labels: np.ndarray) -> float:
+    """Calinski-Harabasz index; sparse input stays sparse (per-cluster sums).
+
+    sklearn's ``calinski_harabasz_score`` rejects CSR input.
+    """
+    if not sparse.issparse(X):
+        return float(calinski_harabasz_score(X, labels))
+    X = X.tocsr().astype(np.float64)
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    n, k = X.shape[0], len(sizes)
+    member = sparse.csr_matrix((np.ones(n), (inverse, np.arange(n))), shape=(k, n))
+    sums = np.asarray((member @ X).todense())
+    centers = sums / sizes[:, None]
+    mean = np.asarray(X.mean(axis=0)).ravel()
+    between = float(np.sum(sizes * np.sum((centers - mean) ** 2, axis=1)))
+    # Within-cluster dispersion: sum ||x||^2 - sum_j n_j ||c_j||^2.
+    within = float(X.multiply(X).sum() - np.sum(sizes * np.sum(centers**2, axis=1)))
+    if within <= 0:
+        return 1.0
+    return between * (n - k) / (within * (k - 1))
+
+
+def _score(X, labels: np.ndarray, metric: str, sample_size: int | None, seed: int, engine: str) -> float:
+    if metric == "calinski_harabasz":
+        if engine == "kmodes":
+            raise ValueError("calinski_harabasz nao se aplica ao k-modes (use silhouette)")
+        return calinski_harabasz(X, labels)
+    # Matching dissimilarity on codes is the Hamming distance (scaled by 1/d).
+    dist = "hamming" if engine == "kmodes" else "euclidean"
+    if sample_size is not None and sample_size < X.shape[0]:
+        return float(silhouette_score(X, labels, metric=dist, sample_size=sample_size, random_state=seed))
+    return float(silhouette_score(X, labels, metric=dist))
+
+
+def _fit_candidate(args: tuple):
+    X, k, seed, n_init, metric, sample_size, engine, batch_size = args
+    if engine == "kmodes":
+        model = KModes(n_clusters=k, n_init=n_init, batch_size=batch_size, random_state=seed)
+    else:
+        model = KMeans(n_clusters=k, random_state=seed, n_init=n_init)
+    labels = model.fit_predict(X)
+    # silhouette requires at least 2 clusters and no single cluster
+    if len(set(labels)) < 2:
+        return k, None, model
+    return k, _score(X, labels, metric, sample_size, seed, engine), model
+
+
+def _stalled(scores: dict[int, float], patience: int) -> bool:
+    # True when the last `patience` evaluated k values did not beat the best before them.
+    ks = sorted(scores)
+    if len(ks) <= patience:
+        return False
+    head, tail = ks[:-patience], ks[-patience:]
+    best_before = max(scores[k] for k in head)
+    return all(scores[k] <= best_before for k in tail)
+
+
+def select_k(
+    X,
+    k_min: int = 2,
+    k_max: int = 6,
+    seed: int = 7,
+    n_init: int = 30,
+    metric: str = "silhouette",
+    sample_size: int | None = None,
+    patience: int | None = None,
+    n_jobs: int | None = None,
+    use_cache: bool = True,
+    engine: str = "kmeans",
+    batch_size: int | None = None,
+) -> KSelection:
+    """Pick k in [k_min, k_max] by the best internal validity score.
+
+    ``X`` is the (dense or sparse) one-hot matrix for ``engine="kmeans"`` and
+    the integer-coded table from ``encode_categories`` for ``engine="kmodes"``.
+    Candidates are evaluated in waves of ``n_jobs`` processes; with ``patience``
+    set, the search stops once that many consecutive k values fail to improve
+    on the best score. ``sample_size`` defaults to SILHOUETTE_SAMPLE when n is
+    larger than that. ``batch_size`` turns on mini-batch k-modes updates.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric deve ser um de {METRICS}, recebido: {metric!r}")
+    if engine not in ENGINES:
+        raise ValueError(f"engine deve ser um de {ENGINES}, recebido: {engine!r}")
+    if engine == "kmodes":
+        X = np.asarray(X, dtype=np.int32)
+    elif sparse.issparse(X):
+        X = sparse.csr_matrix(X, dtype=float)
+    else:
+        X = np.asarray(X, dtype=float)
+    n = X.shape[0]
+    k_max = min(k_max, n - 1)
+    if k_max < k_min:
+        raise ValueError(f"Poucas linhas ({n}) para testar k em [{k_min}, {k_max}]")
+    if sample_size is None and metric == "silhouette" and n > SILHOUETTE_SAMPLE:
+        sample_size = SILHOUETTE_SAMPLE
+
+    key = input_hash(
+        X, k_min=k_min, k_max=k_max, seed=seed, n_init=n_init, metric=metric,
+        sample_size=sample_size, patience=patience, engine=engine, batch_size=batch_size,
+    )
+    cache_path = CACHE_DIR / f"kselect_{key[:24]}.pkl"
+    if use_cache and cache_path.exists():
+        with cache_path.open("rb") as f:
+            return pickle.load(f)
+
+    ks = list(range(k_min, k_max + 1))
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(ks)))
+
+    scores: dict[int, float] = {}
+    models: dict[int, KMeans | KModes] = {}
+
+    def _args(k: int) -> tuple:
+        return (X, k, seed, n_init, metric, sample_size, engine, batch_size)
+
+    def _collect(results) -> None:
+        for k, s, model in results:
+            if s is None:
+                continue
+            scores[k] = s
+            models[k] = model
+
+    if n_jobs == 1:
+        for k in ks:
+            _collect([_fit_candidate(_args(k))])
+            if patience and _stalled(scores, patience):
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            for start in range(0, len(ks), n_jobs):
+                wave = ks[start:start + n_jobs]
+                _collect(pool.map(_fit_candidate, [_args(k) for k in wave]))
+                if patience and _stalled(scores, patience):
+                    break
+
+    if not scores:
+        raise RuntimeError(f"Nenhum k em [{k_min}, {k_max}] produziu mais de um cluster")
+
+    # Ties go to the smaller k, as in the original sequential loop.
+    best_k = max(sorted(scores), key=lambda k: scores[k])
+    best = models[best_k]
+    sel = KSelection(
+        k=best_k,
+        score=scores[best_k],
+        metric=metric,
+        labels=np.asarray(best.labels_),
+        model=best,
+        scores=dict(sorted(scores.items())),
+    )
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(sel, f)
+        tmp.replace(cache_path)
+    return sel
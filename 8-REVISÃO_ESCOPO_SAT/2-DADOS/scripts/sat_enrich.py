@@ -0,0 +1,359 @@
+"""Metadata enrichment from a local Crossref / OpenAlex snapshot.
+
+Entries of the filtered corpus that lack an abstract or keywords are filled
+by DOI from a bulk metadata dump instead of per-record API calls:
+
+- The snapshot (Crossref or OpenAlex works, JSONL, optionally ``.gz``; or
+  Parquet when ``pyarrow`` is installed) is streamed once and every work is
+  normalized to (doi, title, abstract, keywords) in an SQLite index keyed by DOI
+  (``_cache/enriquecimento.sqlite``). The index remembers each snapshot's
+  size and mtime and is rebuilt only when the dump changes.
+- Enrichment is then one keyed lookup per DOI (batched ``IN`` queries), a
+  join of the corpus against the index. The DOI of a key comes from its last
+  definition in the raw exports (as in the screening), and a snapshot work
+  is used only when its title matches the .bib title, so a key that points
+  at another paper is never filled with that paper's metadata.
+- The filled values go to a sidecar table
+  (``referencias_filtradas/enriquecimento_metadados.csv``); the builders
+  read it through ``load_enrichment`` and use a value only where the .bib
+  field is empty, so the .bib itself is never rewritten.
+
+Crossref abstracts are JATS XML (tags stripped); Crossref has no keywords,
+so its ``subject`` list is used. OpenAlex abstracts are rebuilt from
+``abstract_inverted_index``; keywords come from ``keywords`` (or the top
+``concepts``). DOIs are compared lowercased, without the doi.org prefix.
+
+Usage:
+  python sat_enrich.py --snapshot openalex_works.jsonl.gz [--snapshot crossref.jsonl]
+  python sat_enrich.py --snapshot dump.jsonl --dry-run
+
+Used by:
+- build_sat_mca_dataset.py
+- build_sat_fair_dataset.py
+- build_sat_meta_analysis_dataset.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import html
+import json
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sat_bib import export_dois, read_records, title_key
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DATA_DIR = SCRIPT_DIR.parent
+DEFAULT_INDEX = SCRIPT_DIR / "_cache" / "enriquecimento.sqlite"
+DEFAULT_SIDECAR = DATA_DIR / "referencias_filtradas" / "enriquecimento_metadados.csv"
+DEFAULT_BIB = DATA_DIR / "referencias_filtradas" / "referencias_scopus_wos_filtradas.bib"
+# The filtered .bib has no doi field; the raw exports (same keys) do.
+EXPORT_BIBS = (SCRIPT_DIR / "scopus_export.bib", SCRIPT_DIR / "wos_export.bib")
+
+FIELDS = ("abstract", "keywords")
+SIDECAR_COLUMNS = ["chave", "doi", "abstract", "keywords", "fonte"]
+BATCH = 500
+# OpenAlex concepts used as keywords when the work has none.
+MIN_CONCEPT_SCORE = 0.4
+
+# Bumped when the tables change; an index with another version is rebuilt.
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    works    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS works (
+    doi      TEXT NOT NULL,
+    snapshot TEXT NOT NULL,
+    title    TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    PRIMARY KEY (doi, snapshot)
+) WITHOUT ROWID;
+"""
+
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def normalize_doi(doi: str) -> str:
+    return _DOI_PREFIX_RE.sub("", (doi or "").strip()).lower()
+
+
+@dataclass
+class Work:
+    doi: str
+    title: str = ""
+    abstract: str = ""
+    keywords: str = ""
+
+
+def _clean(text: str) -> str:
+    return " ".join(html.unescape(_TAG_RE.sub(" ", text)).split())
+
+
+def _inverted_abstract(index: dict[str, list[int]] | None) -> str:
+    if not index:
+        return ""
+    slots: dict[int, str] = {}
+    for word, positions in index.items():
+        for p in positions:
+            slots[p] = word
+    return " ".join(slots[p] for p in sorted(slots))
+
+
+def _names(items: Iterable) -> list[str]:
+    out = []
+    for item in items or ():
+        name = (item.get("display_name") or item.get("keyword")) if isinstance(item, dict) else item
+        if name:
+            out.append(str(name).strip())
+    return out
+
+
+def parse_work(record: dict) -> Work | None:
+    """Crossref or OpenAlex work -> ``Work`` (None without a DOI)."""
+    if "abstract_inverted_index" in record or "concepts" in record or str(record.get("id", "")).startswith("https://openalex.org/"):
+        doi = normalize_doi(record.get("doi") or "")
+        title = _clean(record.get("title") or record.get("display_name") or "")
+        abstract = _inverted_abstract(record.get("abstract_inverted_index"))
+        keywords = _names(record.get("keywords"))
+        if not keywords:
+            keywords = [
+                c["display_name"]
+                for c in record.get("concepts") or ()
+                if c.get("score", 0) >= MIN_CONCEPT_SCORE and c.get("display_name")
+            ]
+    else:
+        doi = normalize_doi(record.get("DOI") or record.get("doi") or "")
+        # Crossref titles are lists (the first is the main title).
+        titles = record.get("title") or []
+        if isinstance(titles, str):
+            titles = [titles]
+        title = _clean(titles[0] if titles else "")
+        abstract = _clean(record.get("abstract") or "")
+        keywords = _names(record.get("subject"))
+    if not doi:
+        return None
+    return Work(doi, title, abstract, "; ".join(dict.fromkeys(keywords)))
+
+
+def iter_snapshot(path: Path) -> Iterator[dict]:
+    """Works of a JSONL(.gz) or Parquet dump, streamed."""
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError(f"Snapshot Parquet requer pyarrow: {path}") from exc
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+        return
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            # Crossref API pages ({"message": {"items": [...]}}) are accepted too.
+            items = record.get("message", {}).get("items") if isinstance(record.get("message"), dict) else None
+            if items is not None:
+                yield from items
+            else:
+                yield record
+
+
+class SnapshotIndex:
+    """DOI -> normalized metadata, persisted in SQLite per snapshot file."""
+
+    def __init__(self, path: Path = DEFAULT_INDEX) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS works; DROP TABLE IF EXISTS snapshots;")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "SnapshotIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add_snapshot(self, snapshot: Path, force: bool = False) -> tuple[int, bool]:
+        """Index ``snapshot`` unless already indexed unchanged; (works, rebuilt)."""
+        snapshot = Path(snapshot).resolve()
+        st = snapshot.stat()
+        row = self.db.execute("SELECT size, mtime_ns, works FROM snapshots WHERE path = ?", (str(snapshot),)).fetchone()
+        if row and not force and (row[0], row[1]) == (st.st_size, st.st_mtime_ns):
+            return row[2], False
+        with self.db:
+            self.db.execute("DELETE FROM works WHERE snapshot = ?", (str(snapshot),))
+            n = 0
+            batch = []
+            for record in iter_snapshot(snapshot):
+                work = parse_work(record)
+                if work is None or not (work.abstract or work.keywords):
+                    continue
+                batch.append((work.doi, str(snapshot), work.title, work.abstract, work.keywords))
+                if len(batch) >= 10_000:
+                    n += self._insert(batch)
+                    batch = []
+            n += self._insert(batch)
+            # Repeated DOIs in the dump collapse to one row.
+            n = self.db.execute("SELECT COUNT(*) FROM works WHERE snapshot = ?", (str(snapshot),)).fetchone()[0]
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots (path, size, mtime_ns, works) VALUES (?, ?, ?, ?)",
+                (str(snapshot), st.st_size, st.st_mtime_ns, n),
+            )
+        return n, True
+
+    def _insert(self, rows: list[tuple[str, str, str, str, str]]) -> int:
+        self.db.executemany(
+            "INSERT OR REPLACE INTO works (doi, snapshot, title, abstract, keywords) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        return len(rows)
+
+    def lookup(self, dois: Iterable[str], snapshots: list[Path]) -> dict[str, list[tuple[Work, str]]]:
+        """DOI -> (work, snapshot name) indexed for it, in the priority order of ``snapshots``."""
+        dois = list(dict.fromkeys(normalize_doi(d) for d in dois if d))
+        rank = {str(Path(s).resolve()): i for i, s in enumerate(snapshots)}
+        found: dict[str, list[tuple[int, Work, str]]] = {}
+        for start in range(0, len(dois), BATCH):
+            chunk = dois[start:start + BATCH]
+            rows = self.db.execute(
+                f"SELECT doi, snapshot, title, abstract, keywords FROM works WHERE doi IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for doi, snap, title, abstract, keywords in rows:
+                if snap in rank:
+                    found.setdefault(doi, []).append((rank[snap], Work(doi, title, abstract, keywords), Path(snap).name))
+        return {doi: [(w, src) for _, w, src in sorted(hits, key=lambda h: h[0])] for doi, hits in found.items()}
+
+
+def enrich(bib: Path, index: SnapshotIndex, snapshots: list[Path]) -> tuple[list[dict[str, str]], list[str]]:
+    """Sidecar rows for the entries of ``bib`` whose empty fields the snapshot fills.
+
+    Also returns the keys skipped because no snapshot work with their DOI has
+    the entry's title.
+    """
+    entries = {e.key: e for e in read_records(bib)}
+    raw_dois = export_dois(EXPORT_BIBS, titles={k: e.get("title") for k, e in entries.items()})
+    wanted = {}
+    for key, e in entries.items():
+        missing = [f for f in FIELDS if not _field(e, f)]
+        doi = e.doi or raw_dois.get(key, "")
+        if missing and doi:
+            wanted[key] = (normalize_doi(doi), missing)
+    found = index.lookup((doi for doi, _ in wanted.values()), snapshots)
+
+    rows, mismatched = [], []
+    for key, (doi, missing) in wanted.items():
+        if doi not in found:
+            continue
+        own = title_key(entries[key].get("title"))
+        works = [(w, src) for w, src in found[doi] if title_key(w.title) == own]
+        if not works:
+            mismatched.append(key)
+            continue
+        filled = {}
+        for field in missing:
+            for w, src in works:
+                if getattr(w, field):
+                    filled[field] = (getattr(w, field), src)
+                    break
+        if not filled:
+            continue
+        rows.append(
+            {
+                "chave": key,
+                "doi": doi,
+                "abstract": filled.get("abstract", ("", ""))[0],
+                "keywords": filled.get("keywords", ("", ""))[0],
+                "fonte": "; ".join(dict.fromkeys(src for _, src in filled.values())),
+            }
+        )
+    return rows, mismatched
+
+
+def _field(entry, field: str) -> str:
+    if field == "keywords":
+        return (entry.get("keywords") or entry.get("author_keywords")).strip()
+    return entry.get(field).strip()
+
+
+def write_sidecar(rows: list[dict[str, str]], path: Path = DEFAULT_SIDECAR) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, SIDECAR_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+_SIDECAR_MEMO: dict[str, tuple[tuple[int, int], dict[str, dict[str, str]]]] = {}
+
+
+def load_enrichment(path: str | Path = DEFAULT_SIDECAR) -> dict[str, dict[str, str]]:
+    """BibTeX key -> {"abstract": ..., "keywords": ...} from the sidecar ({} when absent).
+
+    Builders use a value only where the .bib field is empty.
+    """
+    path = Path(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    sig = (st.st_mtime_ns, st.st_size)
+    memo = _SIDECAR_MEMO.get(str(path))
+    if memo and memo[0] == sig:
+        return memo[1]
+    with path.open(encoding="utf-8", newline="") as f:
+        out = {r["chave"]: {k: r[k] for k in FIELDS if r.get(k)} for r in csv.DictReader(f)}
+    _SIDECAR_MEMO[str(path)] = (sig, out)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Preenche abstract/keywords ausentes a partir de um snapshot Crossref/OpenAlex local.")
+    ap.add_argument("--snapshot", type=Path, action="append", required=True, help="dump JSONL(.gz)/Parquet; repetir para mais de um (o primeiro tem prioridade)")
+    ap.add_argument("--bib", type=Path, default=DEFAULT_BIB)
+    ap.add_argument("--indice", type=Path, default=DEFAULT_INDEX)
+    ap.add_argument("--out", type=Path, default=DEFAULT_SIDECAR)
+    ap.add_argument("--reindexar", action="store_true", help="reindexa os snapshots mesmo sem mudança")
+    ap.add_argument("--dry-run", action="store_true", help="só o relatório, não grava a tabela")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    with SnapshotIndex(args.indice) as index:
+        for snap in args.snapshot:
+            n, rebuilt = index.add_snapshot(snap, force=args.reindexar)
+            print(f"{snap.name}: {n} obras com metadados ({'indexado' if rebuilt else 'índice reaproveitado'})")
+        rows, mismatched = enrich(args.bib, index, args.snapshot)
+
+    n_abs = sum(bool(r["abstract"]) for r in rows)
+    n_kw = sum(bool(r["keywords"]) for r in rows)
+    print(f"{len(rows)} entradas enriquecidas (abstract: {n_abs}, keywords: {n_kw}) em {time.perf_counter() - t0:.2f}s")
+    if mismatched:
+        print(f"{len(mismatched)} entradas ignoradas (título do snapshot difere do .bib): {', '.join(mismatched)}")
+    if not args.dry_run:
+        write_sidecar(rows, args.out)
+        print(f"Tabela: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Vectorized FAIR scoring for the SAT corpus.
+
+The corpus is held column-wise (one row per study: key, year, the BibTeX
+fields and their lowercased concatenation ``blob``). Every indicator is
+one compiled pattern applied to the whole blob column with
+``Series.str.contains``; graded indicators (rich metadata, code, method
+documentation) become mutually exclusive boolean columns per level.
+
+The resulting (studies x indicators) boolean matrix times the rubric's
+points vector gives every dimension score in one product; the per-study
+table keeps the labels ("Sim"/"Parcial"/"Não") the FAIR plots read.
+
+The rubric (points per indicator level, exclusive level groups, compliance
+threshold and sweep ranges) is data: ``fair_rubrica.json``. ``sweep``
+samples thousands of weight/threshold configurations around it and scores
+all of them at once as (studies x indicators) @ (indicators x configs),
+giving the distribution of the compliance rate and dimension percentages.
+
+``accessibility_signals`` optionally checks the text flags on the web (DOI
+resolves, repository URL answers) through a ``sat_resolver.Resolver``.
+
+Used by:
+- build_sat_fair_dataset.py
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+_REPOSITORY_RE = re.compile(r"\b(?:zenodo|figshare|osf\.io|open science framework|dataverse|dryad|mendeley data|kaggle|pangaea)\b")
+_CODE_HOST_RE = re.compile(r"\b(?:github\.com|gitlab\.com|bitbucket\.org)\b")
+_CODE_TEXT_RE = re.compile(r"\b(?:source code|code available|code is available|open-source|open source)\b")
+_LICENSE_RE = re.compile(r"\b(?:cc-by|creative commons|license|licence|mit license|apache)\b")
+_FORMAT_RE = re.compile(r"\b(?:csv|geotiff|tiff|netcdf|hdf5|shapefile|geojson|json|xml)\b")
+_VOCAB_RE = re.compile(r"\b(?:agrovoc|ontology|controlled vocabulary|thesaurus)\b")
+_SUPPLEMENTARY_RE = re.compile(r"\b(?:supplementary|supporting information|appendix)\b")
+_API_RE = re.compile(r"\b(?:api|rest api|endpoint)\b")
+_DOI_RE = re.compile(r"\b10\.\d{4,9}/\S+\b")
+_REPOSITORY_URL_RE = re.compile(
+    r"https?://(?:[\w-]+\.)*(?:zenodo\.org|figshare\.com|osf\.io|dataverse\.[\w.]+|datadryad\.org|"
+    r"data\.mendeley\.com|kaggle\.com|pangaea\.de|github\.com|gitlab\.com|bitbucket\.org)[^\s,;{}<>\"')\]]*",
+    re.I,
+)
+
+DIMENSIONS = ("Findable", "Accessible", "Interoperable", "Reusable")
+RUBRIC_PATH = Path(__file__).resolve().parent / "fair_rubrica.json"
+
+# Configurations scored per matrix product in ``sweep`` (bounds memory).
+SWEEP_BLOCK = 2000
+
+
+@dataclass(frozen=True)
+class Criterion:
+    column: str  # boolean column of the indicator matrix
+    dimension: str
+    group: str  # levels of one indicator (e.g. code Sim/Parcial) are exclusive
+    points: float
+
+
+@dataclass
+class Rubric:
+    criteria: tuple[Criterion, ...]
+    threshold: float
+    sweep: dict = field(default_factory=dict)
+
+    @property
+    def columns(self) -> list[str]:
+        return [c.column for c in self.criteria]
+
+    def points_matrix(self, points: np.ndarray | None = None) -> np.ndarray:
+        """(indicators x dimensions) points; ``points`` overrides the rubric's."""
+        p = np.array([c.points for c in self.criteria], dtype=float) if points is None else points
+        onehot = np.array([[c.dimension == d for d in DIMENSIONS] for c in self.criteria], dtype=float)
+        return p[:, None] * onehot if p.ndim == 1 else p[:, None, :] * onehot[:, :, None]
+
+    def dimension_max(self, points: np.ndarray | None = None) -> np.ndarray:
+        """Highest reachable score per dimension (best level of every group).
+
+        ``points`` may be (indicators,) or (indicators x configs); the result
+        is (dimensions,) or (dimensions x configs).
+        """
+        p = np.array([c.points for c in self.criteria], dtype=float) if points is None else points
+        groups = list(dict.fromkeys((c.dimension, c.group) for c in self.criteria))
+        out = np.zeros((len(DIMENSIONS),) + p.shape[1:])
+        for dim, group in groups:
+            rows = [i for i, c in enumerate(self.criteria) if (c.dimension, c.group) == (dim, group)]
+            out[DIMENSIONS.index(dim)] += p[rows].max(axis=0)
+        return out
+
+
+def load_rubric(path: str | Path = RUBRIC_PATH) -> Rubric:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    criteria = tuple(
+        Criterion(c["indicador"], c["dimensao"], c.get("grupo", c["indicador"]), float(c["pontos"]))
+        for c in data["criterios"]
+    )
+    unknown = {c.dimension for c in criteria} - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Dimensão desconhecida na rubrica {path}: {', '.join(sorted(unknown))}")
+    return Rubric(criteria, float(data["limiar_conformidade"]), data.get("varredura", {}))
+
+
+# Columns of the per-study table and the indicator summary that feeds the plots.
+INDICATORS = (
+    # (label pt, label en, study column, value that counts)
+    ("DOI disponível", "DOI available", "doi_disponivel", "Sim"),
+    ("Metadados ricos", "Rich metadata", "metadados_ricos", "Sim"),
+    ("Dados em repositório", "Data in repository", "dados_repositorio", "Sim"),
+    ("Dados suplementares", "Supplementary data", "dados_suplementares", "Sim"),
+    ("Formato padrão", "Standard format", "formato_padrao", "Sim"),
+    ("Vocabulário controlado", "Controlled vocabulary", "vocabulario_controlado", "Sim"),
+    ("Licença clara", "Clear license", "licenca_clara", "Sim"),
+    ("Código disponível", "Code available", "codigo_disponivel", "Sim"),
+    ("Documentação completa", "Complete documentation", "documentacao_metodo", "Completa"),
+    ("Blockchain", "Blockchain", "blockchain", "Sim"),
+    ("API disponível", "API available", "api_disponivel", "Sim"),
+)
+
+
+def terms_pattern(terms: Iterable[str]) -> re.Pattern:
+    """Plain-substring alternation (same matches as ``any(t in text ...)``)."""
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
+def indicator_matrix(corpus: pd.DataFrame) -> pd.DataFrame:
+    """Boolean (studies x indicator levels) matrix, one vectorized pass per pattern.
+
+    ``corpus`` needs ``blob`` (lowercased text), ``abstract``, ``keywords``,
+    ``author_keywords``, ``doi`` and ``url`` columns.
+    """
+    blob = corpus["blob"]
+    abs_len = corpus["abstract"].str.strip().str.len()
+    has_kw = (corpus["keywords"].str.strip() != "") | (corpus["author_keywords"].str.strip() != "")
+    rich_abs = abs_len >= 80
+
+    code_host = blob.str.contains(_CODE_HOST_RE)
+    code_sim = code_host
+    code_parcial = ~code_host & blob.str.contains(_CODE_TEXT_RE)
+    doc_completa = code_sim & (abs_len >= 200)
+
+    return pd.DataFrame(
+        {
+            "doi": (corpus["doi"].str.strip() != "")
+            | corpus["url"].str.lower().str.contains("doi.org/", regex=False)
+            | blob.str.contains(_DOI_RE),
+            "meta_sim": rich_abs & has_kw,
+            "meta_parcial": rich_abs ^ has_kw,
+            "repositorio": blob.str.contains(_REPOSITORY_RE) | code_host,
+            "suplementar": blob.str.contains(_SUPPLEMENTARY_RE),
+            "formato": blob.str.contains(_FORMAT_RE),
+            "vocabulario": blob.str.contains(_VOCAB_RE),
+            "licenca": blob.str.contains(_LICENSE_RE),
+            "codigo_sim": code_sim,
+            "codigo_parcial": code_parcial,
+            "doc_completa": doc_completa,
+            "doc_parcial": ~doc_completa & (abs_len >= 120),
+            "blockchain": blob.str.contains("blockchain", regex=False),
+            "api": blob.str.contains(_API_RE),
+        },
+        index=corpus.index,
+    )
+
+
+def _levels(sim: pd.Series, parcial: pd.Series | None = None, yes: str = "Sim", partial: str = "Parcial", no: str = "Não") -> np.ndarray:
+    out = np.where(sim, yes, no).astype(object)
+    if parcial is not None:
+        out[parcial.to_numpy() & ~sim.to_numpy()] = partial
+    return out
+
+
+def score_studies(corpus: pd.DataFrame, rubric: Rubric) -> pd.DataFrame:
+    """Per-study FAIR table: indicator labels, dimension scores and compliance."""
+    B = indicator_matrix(corpus)
+    W = rubric.points_matrix()
+    S = B[rubric.columns].to_numpy(dtype=float) @ W
+    total = S.sum(axis=1)
+    scores = {f"score_{d[0].lower()}": S[:, i] for i, d in enumerate(DIMENSIONS)}
+    # Integer rubric -> integer scores, as in the original table.
+    if np.all(np.mod(W, 1) == 0):
+        scores = {k: v.astype(int) for k, v in scores.items()}
+        total = total.astype(int)
+
+    return pd.DataFrame(
+        {
+            "estudo_id": corpus["key"].to_numpy(),
+            "ano": corpus["year"].to_numpy(),
+            "doi_disponivel": _levels(B["doi"]),
+            "metadados_ricos": _levels(B["meta_sim"], B["meta_parcial"]),
+            "dados_repositorio": _levels(B["repositorio"]),
+            "dados_suplementares": _levels(B["suplementar"]),
+            "formato_padrao": _levels(B["formato"]),
+            "vocabulario_controlado": _levels(B["vocabulario"]),
+            "licenca_clara": _levels(B["licenca"]),
+            "codigo_disponivel": _levels(B["codigo_sim"], B["codigo_parcial"]),
+            "documentacao_metodo": _levels(B["doc_completa"], B["doc_parcial"], "Completa", "Parcial", "Insuficiente"),
+            "blockchain": _levels(B["blockchain"]),
+            "api_disponivel": _levels(B["api"]),
+            **scores,
+            "score_fair": total,
+            "compliant": np.where(total >= rubric.threshold, "Sim", "Não"),
+        }
+    )
+
+
+def dimension_summary(studies: pd.DataFrame, rubric: Rubric) -> pd.DataFrame:
+    """Mean score per dimension (``scores_por_dimensao_sat.csv``)."""
+    cols = [f"score_{d[0].lower()}" for d in DIMENSIONS]
+    out = pd.DataFrame({"dimensao": list(DIMENSIONS), "score_medio": studies[cols].mean().to_numpy()})
+    dim_max = rubric.dimension_max()
+    out["score_max_possivel"] = dim_max.astype(int) if np.all(np.mod(dim_max, 1) == 0) else dim_max
+    out["percentual"] = (out["score_medio"] / dim_max) * 100.0
+    return out
+
+
+def indicator_summary(studies: pd.DataFrame) -> pd.DataFrame:
+    """Share of studies meeting each indicator (``indicadores_fair_detalhados_sat.csv``)."""
+    n = len(studies)
+    hits = np.array([(studies[col] == value).sum() for _, _, col, value in INDICATORS])
+    pct = hits / n * 100.0
+    out = pd.DataFrame(
+        {
+            "indicador": [pt for pt, _, _, _ in INDICATORS],
+            "n_sim": hits.astype(int),
+            "percentual": pct,
+            "gap": 100.0 - pct,
+            "indicador_en": [en for _, en, _, _ in INDICATORS],
+        }
+    )
+    return out.sort_values("percentual", ascending=False)
+
+
+def accessibility_signals(corpus: pd.DataFrame, resolver) -> pd.DataFrame:
+    """DOI and repository URL checks for every study, resolved concurrently.
+
+    ``resolver`` is a ``sat_resolver.Resolver`` (anything with ``doi_url``
+    and ``resolve``). Studies without a DOI / repository URL get "".
+    """
+    # BibTeX escapes (\_, \%, \&) would break the URLs.
+    text = (corpus["url"] + " " + corpus["abstract"] + " " + corpus["title"]).str.replace(r"\\(?=[_%&#$])", "", regex=True)
+    doi = corpus["doi"].str.strip()
+    found = text.str.extract(f"({_DOI_RE.pattern})", expand=False).fillna("").str.rstrip(".")
+    doi = doi.where(doi != "", found)
+    doi_urls = doi.map(lambda d: resolver.doi_url(d) if d else "")
+    repo_urls = text.str.extract(f"({_REPOSITORY_URL_RE.pattern})", flags=re.I, expand=False).fillna("").str.rstrip(".")
+
+    results = resolver.resolve([*doi_urls, *repo_urls])
+
+    def label(url: str) -> str:
+        if not url:
+            return ""
+        r = results[url]
+        return "Sim" if r.ok else ("Não" if r.status is not None else "Erro")
+
+    return pd.DataFrame(
+        {
+            "doi_resolvido": doi_urls.map(label).to_numpy(),
+            "repositorio_url": repo_urls.to_numpy(),
+            "repositorio_acessivel": repo_urls.map(label).to_numpy(),
+        }
+    )
+
+
+def sample_configs(rubric: Rubric, n: int, variation: float, threshold: tuple[float, float], seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """(indicators x configs) points and (configs,) thresholds; config 0 is the rubric.
+
+    Each level's points are drawn uniformly within ``±variation`` of the
+    rubric value; within a group a lower level never outscores a higher one.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.array([c.points for c in rubric.criteria], dtype=float)
+    P = base[:, None] * rng.uniform(1 - variation, 1 + variation, size=(len(base), n))
+    T = rng.uniform(threshold[0], threshold[1], size=n)
+    for group in dict.fromkeys((c.dimension, c.group) for c in rubric.criteria):
+        rows = [i for i, c in enumerate(rubric.criteria) if (c.dimension, c.group) == group]
+        rows.sort(key=lambda i: -base[i])
+        for hi, lo in zip(rows, rows[1:]):
+            P[lo] = np.minimum(P[lo], P[hi])
+    P[:, 0], T[0] = base, rubric.threshold
+    return P, T
+
+
+def sweep(
+    corpus: pd.DataFrame,
+    rubric: Rubric,
+    n: int | None = None,
+    variation: float | None = None,
+    threshold: tuple[float, float] | None = None,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """Score the corpus under many rubric configurations at once.
+
+    One row per configuration: its points and threshold, the compliance
+    rate and the mean score of each dimension as a percentage of that
+    configuration's maximum. Defaults come from the rubric's ``varredura``.
+    """
+    spec = rubric.sweep
+    n = n or int(spec.get("configuracoes", 5000))
+    variation = spec.get("variacao_pontos", 0.5) if variation is None else variation
+    threshold = tuple(threshold or spec.get("limiar", (rubric.threshold, rubric.threshold)))
+    seed = int(spec.get("semente", 42) if seed is None else seed)
+
+    P, T = sample_configs(rubric, n, variation, threshold, seed)
+    B = indicator_matrix(corpus)[rubric.columns].to_numpy(dtype=float)
+
+    compliance = np.empty(n)
+    for start in range(0, n, SWEEP_BLOCK):
+        block = slice(start, start + SWEEP_BLOCK)
+        compliance[block] = ((B @ P[:, block]) >= T[block]).mean(axis=0)
+
+    # Mean dimension scores only need the indicator prevalences.
+    prevalence = B.mean(axis=0)
+    dim_mean = np.einsum("i,idc->dc", prevalence, rubric.points_matrix(P))
+    dim_max = rubric.dimension_max(P)
+    total_pct = dim_mean.sum(axis=0) / dim_max.sum(axis=0) * 100.0
+
+    out = pd.DataFrame({"configuracao": np.arange(n), "limiar": T})
+    for i, c in enumerate(rubric.criteria):
+        out[f"pontos_{c.column}"] = P[i]
+    out["taxa_conformidade"] = compliance * 100.0
+    out["score_fair_pct"] = total_pct
+    for d, dim in enumerate(DIMENSIONS):
+        out[f"{dim}_pct"] = dim_mean[d] / dim_max[d] * 100.0
+    return out
+
+
+def sweep_summary(configs: pd.DataFrame) -> pd.DataFrame:
+    """Baseline value and distribution of each sweep metric across configurations."""
+    metrics = ["taxa_conformidade", "score_fair_pct"] + [f"{d}_pct" for d in DIMENSIONS]
+    q = configs[metrics].quantile([0.05, 0.25, 0.5, 0.75, 0.95])
+    return pd.DataFrame(
+        {
+            "metrica": metrics,
+            "rubrica": configs.loc[0, metrics].to_numpy(),
+            "media": configs[metrics].mean().to_numpy(),
+            "min": configs[metrics].min().to_numpy(),
+            "p05": q.loc[0.05].to_numpy(),
+            "p25": q.loc[0.25].to_numpy(),
+            "p50": q.loc[0.5].to_numpy(),
+            "p75": q.loc[0.75].to_numpy(),
+            "p95": q.loc[0.95].to_numpy(),
+            "max": configs[metrics].max().to_numpy(),
+        }
+    )
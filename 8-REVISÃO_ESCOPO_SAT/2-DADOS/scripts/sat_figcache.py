@@ -0,0 +1,94 @@
+"""Content-addressed cache for the rendered SAT figures.
+
+A figure's key is the SHA-256 of its script source, declared input files,
+declared parameters (environment knobs) and the matplotlib version (style
+defaults). Keys and the hashes of the PNGs they produced are kept in a JSON
+manifest next to the figures; when the key and every output still match, the
+figure is skipped and nothing is written.
+
+Used by:
+- render_all.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Iterable
+
+
+MANIFEST_NAME = ".render_manifest.json"
+
+
+def file_sha256(path: Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while True:
+            block = f.read(chunk)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def _mpl_version() -> str:
+    # Read from package metadata so a no-op run never imports matplotlib.
+    try:
+        return version("matplotlib")
+    except PackageNotFoundError:
+        return "NA"
+
+
+class FigureCache:
+    def __init__(self, out_dir: Path, script_dir: Path) -> None:
+        self.out_dir = out_dir
+        self.script_dir = script_dir
+        self.path = out_dir / MANIFEST_NAME
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def key(self, module: str, inputs: Iterable[str], env: Iterable[str] = ()) -> str:
+        h = hashlib.sha256()
+        h.update(f"matplotlib={_mpl_version()};".encode())
+        sources = [f"{module}.py", *inputs]
+        for rel in sources:
+            p = (self.script_dir / rel).resolve()
+            digest = file_sha256(p) if p.exists() else "missing"
+            h.update(f"{rel}={digest};".encode())
+        for name in sorted(env):
+            h.update(f"${name}={os.environ.get(name, '')};".encode())
+        return h.hexdigest()
+
+    def is_fresh(self, module: str, key: str, outputs: Iterable[str]) -> bool:
+        entry = self.entries.get(module)
+        if not entry or entry.get("key") != key:
+            return False
+        stored = entry.get("outputs", {})
+        for name in outputs:
+            p = self.out_dir / name
+            if name not in stored or not p.exists() or file_sha256(p) != stored[name]:
+                return False
+        return True
+
+    def record(self, module: str, key: str, outputs: Iterable[str]) -> None:
+        self.entries[module] = {
+            "key": key,
+            "outputs": {
+                name: file_sha256(self.out_dir / name)
+                for name in outputs
+                if (self.out_dir / name).exists()
+            },
+        }
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
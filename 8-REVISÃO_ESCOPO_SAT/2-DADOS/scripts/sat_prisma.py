@@ -0,0 +1,270 @@
+"""PRISMA 2020 counts derived from the screening pipeline itself.
+
+The screening stage reports each record's fate to a ``ProvenanceLedger``
+while it runs (identified -> duplicate / removed -> excluded with reason /
+included). Every event is appended to a CSV ledger as it happens and
+tallied in memory, so the PRISMA numbers come out of the same pass that
+writes the filtered corpus, with no second read of the exports.
+
+``write_prisma_csv`` fills the ``n`` column of the PRISMA2020 template
+(``PRISMA.csv``, read by the R flow-diagram scripts) and leaves every other
+cell as it was; ``render_flow_svg`` draws the database branch of the flow
+diagram with the template's box texts.
+
+Used by:
+- OLD/analisar_scopus_wos_combinado.py
+"""
+
+from __future__ import annotations
+
+import csv
+import html
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+# Ledger fates; every identified record ends in exactly one of the others.
+IDENTIFIED = "identificado"
+DUPLICATE = "duplicata"
+REMOVED = "removido"
+EXCLUDED = "excluido"
+INCLUDED = "incluido"
+FINAL_FATES = (DUPLICATE, REMOVED, EXCLUDED, INCLUDED)
+
+LEDGER_COLUMNS = ["registro", "fonte", "chave", "destino", "motivo", "detalhe"]
+
+# Source labels as they appear in the PRISMA boxes.
+SOURCE_NAMES = {"WoS": "Web of Science"}
+
+
+@dataclass
+class Event:
+    record: str
+    source: str
+    key: str
+    fate: str
+    reason: str = ""
+    detail: str = ""
+
+
+class ProvenanceLedger:
+    """Per-record fate log; streamed to ``path`` (when given) and tallied."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path else None
+        self._fh: TextIO | None = None
+        self._writer = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._fh, lineterminator="\n")
+            self._writer.writerow(LEDGER_COLUMNS)
+        self.records: dict[str, tuple[str, str]] = {}  # id -> (source, key)
+        self.fate: dict[str, str] = {}
+        self.identified: Counter = Counter()  # source -> records
+        self.fates: Counter = Counter()
+        self.reasons: dict[str, Counter] = {fate: Counter() for fate in FINAL_FATES}
+        self.tiers: Counter = Counter()
+
+    def __enter__(self) -> "ProvenanceLedger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _log(self, event: Event) -> None:
+        if self._writer is not None:
+            self._writer.writerow([event.record, event.source, event.key, event.fate, event.reason, event.detail])
+
+    def identify(self, source: str, key: str, detail: str = "") -> str:
+        """Register one exported record; returns its ledger id (source:ordinal)."""
+        self.identified[source] += 1
+        record = f"{source}:{self.identified[source]}"
+        self.records[record] = (source, key)
+        self._log(Event(record, source, key, IDENTIFIED, detail=detail))
+        return record
+
+    def settle(self, record: str, fate: str, reason: str = "", detail: str = "") -> None:
+        if fate not in FINAL_FATES:
+            raise ValueError(f"destino desconhecido: {fate}")
+        if record in self.fate:
+            raise ValueError(f"registro {record} ja tem destino: {self.fate[record]}")
+        source, key = self.records[record]
+        self.fate[record] = fate
+        self.fates[fate] += 1
+        self.reasons[fate][reason] += 1
+        self._log(Event(record, source, key, fate, reason, detail))
+
+    def duplicate(self, record: str, of: str, reason: str = "titulo identico") -> None:
+        self.settle(record, DUPLICATE, reason, detail=of)
+
+    def removed(self, record: str, reason: str, detail: str = "") -> None:
+        self.settle(record, REMOVED, reason, detail)
+
+    def excluded(self, record: str, reason: str, detail: str = "") -> None:
+        self.settle(record, EXCLUDED, reason, detail)
+
+    def included(self, record: str, tier: str, score: float) -> None:
+        self.tiers[tier] += 1
+        self.settle(record, INCLUDED, tier, detail=f"{score:.1f}")
+
+    def unsettled(self) -> list[str]:
+        return [r for r in self.records if r not in self.fate]
+
+    def counts(self) -> dict[str, int | str]:
+        """PRISMA2020 ``data`` field -> value for the database branch."""
+        identified = sum(self.identified.values())
+        screened = self.fates[EXCLUDED] + self.fates[INCLUDED]
+        included = self.fates[INCLUDED]
+        return {
+            "database_results": identified,
+            "database_specific_results": "; ".join(
+                f"{SOURCE_NAMES.get(s, s)}, {n}" for s, n in self.identified.items()
+            ),
+            "duplicates": self.fates[DUPLICATE],
+            "excluded_other": self.fates[REMOVED],
+            "records_screened": screened,
+            "records_excluded": self.fates[EXCLUDED],
+            "dbr_sought_reports": included,
+            "dbr_notretrieved_reports": 0,
+            "dbr_assessed": included,
+            "new_studies": included,
+            "new_reports": included,
+            "total_studies": included,
+            "total_reports": included,
+        }
+
+    def summary(self) -> list[str]:
+        c = self.counts()
+        lines = [
+            f"Identificados: {c['database_results']} ({c['database_specific_results']})",
+            f"Duplicatas removidas: {c['duplicates']}",
+            f"Removidos por outros motivos: {c['excluded_other']}",
+            f"Triados: {c['records_screened']}",
+            f"Excluidos na triagem: {c['records_excluded']}",
+            f"Incluidos: {c['new_studies']}",
+        ]
+        for fate in (REMOVED, EXCLUDED):
+            for reason, n in self.reasons[fate].most_common():
+                lines.append(f"  {fate}: {reason}: {n}")
+        pending = self.unsettled()
+        if pending:
+            lines.append(f"ATENCAO: {len(pending)} registro(s) sem destino: {', '.join(pending[:5])}")
+        return lines
+
+
+def write_prisma_csv(counts: dict[str, int | str], path: str | Path) -> None:
+    """Update the ``n`` column of the PRISMA2020 template in place."""
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    header = rows[0]
+    data_col, n_col = header.index("data"), header.index("n")
+    for row in rows[1:]:
+        if row[data_col] in counts:
+            row[n_col] = str(counts[row[data_col]])
+    with path.open("w", encoding="utf-8", newline="") as f:
+        # Template has no trailing newline; keep the file byte-stable.
+        f.write("\n".join(_csv_line(row) for row in rows))
+
+
+def _csv_line(row: list[str]) -> str:
+    return ",".join('"' + c.replace('"', '""') + '"' if any(ch in c for ch in ',"\n') else c for c in row)
+
+
+def _box_texts(path: Path) -> dict[str, str]:
+    with path.open(encoding="utf-8", newline="") as f:
+        return {r["data"]: r["boxtext"] for r in csv.DictReader(f)}
+
+
+BOX_W, BOX_H, GAP = 300, 78, 34
+LEFT_X, RIGHT_X, TOP = 130, 480, 20
+
+
+def render_flow_svg(counts: dict[str, int | str], path: str | Path, template: str | Path | None = None) -> None:
+    """Database branch of the PRISMA 2020 flow diagram as a standalone SVG."""
+    labels = _box_texts(Path(template)) if template else {}
+
+    def label(field: str, default: str) -> str:
+        return labels.get(field, default) if labels.get(field, "NA") != "NA" else default
+
+    specific = str(counts["database_specific_results"]).split("; ")
+    rows = [
+        # (left box lines, right box lines, phase)
+        (
+            ["Records identified from:", f"  {label('database_results', 'Databases')} (n = {counts['database_results']})"]
+            + [f"    {s.replace(', ', ' (n = ')})" for s in specific],
+            [
+                "Records removed before screening:",
+                f"  Duplicate records (n = {counts['duplicates']})",
+                f"  Removed for other reasons (n = {counts['excluded_other']})",
+            ],
+            "Identification",
+        ),
+        (
+            [f"{label('records_screened', 'Records screened')}", f"(n = {counts['records_screened']})"],
+            [f"{label('records_excluded', 'Records excluded')}", f"(n = {counts['records_excluded']})"],
+            "Screening",
+        ),
+        (
+            [f"{label('dbr_assessed', 'Reports assessed for eligibility')}", f"(n = {counts['dbr_assessed']})"],
+            [f"Reports excluded (n = {counts['dbr_assessed'] - counts['new_studies']})"],
+            "Screening",
+        ),
+        (
+            [f"{label('new_studies', 'Studies included in review')}", f"(n = {counts['new_studies']})"],
+            None,
+            "Included",
+        ),
+    ]
+    height = TOP + len(rows) * (BOX_H + GAP)
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{RIGHT_X + BOX_W + 20}" height="{height}" '
+        'font-family="Arial, Helvetica, sans-serif" font-size="12">',
+        '<defs><marker id="a" markerWidth="8" markerHeight="8" refX="7" refY="4" orient="auto">'
+        '<path d="M0,0 L8,4 L0,8 z" fill="#333"/></marker></defs>',
+        '<rect width="100%" height="100%" fill="white"/>',
+    ]
+
+    def box(x: int, y: int, lines: list[str], fill: str = "white") -> None:
+        out.append(f'<rect x="{x}" y="{y}" width="{BOX_W}" height="{BOX_H}" fill="{fill}" stroke="#333"/>')
+        first = y + BOX_H / 2 - (len(lines) - 1) * 8 + 4
+        for i, line in enumerate(lines):
+            anchor, tx = ("start", x + 10) if line.startswith("  ") or len(lines) > 2 else ("middle", x + BOX_W / 2)
+            out.append(
+                f'<text x="{tx}" y="{first + i * 16:.0f}" text-anchor="{anchor}" xml:space="preserve">'
+                f"{html.escape(line)}</text>"
+            )
+
+    phases: dict[str, list[int]] = {}
+    for i, (left, right, phase) in enumerate(rows):
+        y = TOP + i * (BOX_H + GAP)
+        phases.setdefault(phase, []).append(y)
+        box(LEFT_X, y, left)
+        if right:
+            box(RIGHT_X, y, right)
+            out.append(
+                f'<line x1="{LEFT_X + BOX_W}" y1="{y + BOX_H / 2}" x2="{RIGHT_X}" y2="{y + BOX_H / 2}" '
+                'stroke="#333" marker-end="url(#a)"/>'
+            )
+        if i + 1 < len(rows):
+            cx = LEFT_X + BOX_W / 2
+            out.append(
+                f'<line x1="{cx}" y1="{y + BOX_H}" x2="{cx}" y2="{y + BOX_H + GAP}" stroke="#333" marker-end="url(#a)"/>'
+            )
+    for phase, ys in phases.items():
+        y0, y1 = ys[0], ys[-1] + BOX_H
+        out.append(f'<rect x="10" y="{y0}" width="40" height="{y1 - y0}" rx="6" fill="#9dc3e6" stroke="#333"/>')
+        cy = (y0 + y1) / 2
+        out.append(
+            f'<text x="30" y="{cy}" text-anchor="middle" font-weight="bold" '
+            f'transform="rotate(-90 30 {cy})" dy="4">{phase}</text>'
+        )
+    out.append("</svg>")
+    Path(path).write_text("\n".join(out) + "\n", encoding="utf-8")
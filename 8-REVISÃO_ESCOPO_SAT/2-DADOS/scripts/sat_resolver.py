@@ -0,0 +1,319 @@
+"""Optional DOI / repository URL resolver for the FAIR accessibility signals.
+
+The FAIR flags in ``sat_fair`` are text heuristics (a DOI string is present,
+a repository name is mentioned). This layer checks them against the web:
+each DOI is resolved through ``https://doi.org/`` and each repository URL
+found in the record is requested, following redirects, and the final status
+is kept.
+
+- The HTTP client is pluggable (``HttpClient``: one async ``head`` method).
+  ``PooledClient`` needs only the standard library: keep-alive connections
+  pooled per host, requests run on a bounded thread pool. ``HttpxClient``
+  is used when ``httpx`` is installed and asked for.
+- ``Resolver.resolve`` fans the URLs out with asyncio under a concurrency
+  limit, so hundreds of checks overlap instead of running one by one.
+- Answers (any HTTP status) are stored in an SQLite cache
+  (``_cache/resolver.sqlite``) and reused for ``ttl_days``; network errors
+  are not cached, so a rerun retries them.
+
+``doi_base`` points the DOI checks at another server (a local mock in tests).
+
+Usage:
+  python sat_resolver.py 10.1016/j.agsy.2020.102877 https://zenodo.org/records/123
+  python sat_resolver.py --doi-base http://127.0.0.1:8000/ 10.1/x
+
+Used by:
+- build_sat_fair_dataset.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Protocol
+from urllib.parse import quote, urljoin, urlsplit
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE = SCRIPT_DIR / "_cache" / "resolver.sqlite"
+
+DOI_BASE = "https://doi.org/"
+USER_AGENT = "sat-fair-resolver/1.0"
+CONCURRENCY = 32
+TIMEOUT = 15.0
+MAX_REDIRECTS = 10
+TTL_DAYS = 30
+
+# Some servers refuse HEAD; these statuses are retried as a one-byte GET.
+HEAD_REFUSED = {403, 405, 501}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url       TEXT PRIMARY KEY,
+    status    INTEGER NOT NULL,
+    final_url TEXT NOT NULL,
+    checked   REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Response:
+    status: int
+    url: str  # after redirects
+
+
+@dataclass
+class Resolution:
+    url: str
+    status: int | None = None
+    final_url: str = ""
+    error: str = ""
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 400
+
+
+class HttpClient(Protocol):
+    async def head(self, url: str) -> Response: ...
+
+    async def aclose(self) -> None: ...
+
+
+class PooledClient:
+    """Standard-library client: per-host keep-alive pools on a bounded thread pool."""
+
+    def __init__(self, max_workers: int = CONCURRENCY, timeout: float = TIMEOUT) -> None:
+        self.timeout = timeout
+        self._pools: dict[tuple[str, str, int | None], queue.SimpleQueue] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resolver")
+
+    def _pool(self, key: tuple[str, str, int | None]) -> queue.SimpleQueue:
+        with self._lock:
+            return self._pools.setdefault(key, queue.SimpleQueue())
+
+    def _request(self, method: str, url: str) -> tuple[int, str | None]:
+        parts = urlsplit(url)
+        pool = self._pool((parts.scheme, parts.hostname or "", parts.port))
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            return self._send(self._connect(parts), pool, method, parts)
+        try:
+            return self._send(conn, pool, method, parts)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server dropped an idle pooled connection; retry on a new one.
+            return self._send(self._connect(parts), pool, method, parts)
+
+    def _connect(self, parts) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        return cls(parts.hostname, parts.port, timeout=self.timeout)
+
+    def _send(self, conn: http.client.HTTPConnection, pool: queue.SimpleQueue, method: str, parts) -> tuple[int, str | None]:
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive"}
+        if method == "GET":
+            headers["Range"] = "bytes=0-0"
+        try:
+            conn.request(method, path, headers=headers)
+            resp = conn.getresponse()
+            # Drain what is small; a large body means the connection is not reused.
+            resp.read(1 << 16)
+            reusable = resp.isclosed() and not resp.will_close
+        except Exception:
+            conn.close()
+            raise
+        if reusable:
+            pool.put(conn)
+        else:
+            conn.close()
+        return resp.status, resp.getheader("Location")
+
+    async def _fetch(self, method: str, url: str) -> tuple[int, str | None]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._request, method, url)
+
+    async def head(self, url: str) -> Response:
+        method = "HEAD"
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = await self._fetch(method, url)
+            if status in HEAD_REFUSED and method == "HEAD":
+                method = "GET"
+                status, location = await self._fetch(method, url)
+            if 300 <= status < 400 and location:
+                url = urljoin(url, location)
+                continue
+            return Response(status, url)
+        raise RuntimeError(f"mais de {MAX_REDIRECTS} redirecionamentos")
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class HttpxClient:
+    """``httpx.AsyncClient`` (optional dependency) with the same interface."""
+
+    def __init__(self, max_workers: int = CONCURRENCY, timeout: float = TIMEOUT) -> None:
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+            limits=httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def head(self, url: str) -> Response:
+        resp = await self._client.head(url)
+        if resp.status_code in HEAD_REFUSED:
+            resp = await self._client.get(url, headers={"Range": "bytes=0-0"})
+        return Response(resp.status_code, str(resp.url))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+CLIENTS = {"stdlib": PooledClient, "httpx": HttpxClient}
+
+
+def make_client(name: str = "stdlib", max_workers: int = CONCURRENCY, timeout: float = TIMEOUT) -> HttpClient:
+    if name not in CLIENTS:
+        raise ValueError(f"Cliente HTTP desconhecido: {name} (opções: {', '.join(CLIENTS)})")
+    try:
+        return CLIENTS[name](max_workers=max_workers, timeout=timeout)
+    except ImportError as exc:
+        raise RuntimeError(f"Cliente '{name}' requer um pacote não instalado: {exc.name}") from exc
+
+
+class ResponseCache:
+    def __init__(self, path: Path = DEFAULT_CACHE) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def get_many(self, urls: Iterable[str], ttl_days: float = TTL_DAYS) -> dict[str, Resolution]:
+        urls = list(urls)
+        oldest = time.time() - ttl_days * 86400
+        out: dict[str, Resolution] = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT url, status, final_url FROM responses WHERE checked >= ? AND url IN ({','.join('?' * len(chunk))})",
+                (oldest, *chunk),
+            )
+            for url, status, final_url in rows:
+                out[url] = Resolution(url, status, final_url, cached=True)
+        return out
+
+    def put_many(self, resolutions: Iterable[Resolution]) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO responses (url, status, final_url, checked) VALUES (?, ?, ?, ?)",
+                [(r.url, r.status, r.final_url, now) for r in resolutions if r.status is not None],
+            )
+
+
+class Resolver:
+    def __init__(
+        self,
+        client: HttpClient | str = "stdlib",
+        cache_path: Path | None = DEFAULT_CACHE,
+        concurrency: int = CONCURRENCY,
+        ttl_days: float = TTL_DAYS,
+        doi_base: str = DOI_BASE,
+    ) -> None:
+        self.client = client
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.concurrency = concurrency
+        self.ttl_days = ttl_days
+        self.doi_base = doi_base
+
+    def doi_url(self, doi: str) -> str:
+        doi = re.sub(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", "", doi.strip(), flags=re.I)
+        return self.doi_base + quote(doi, safe="/:;()._-")
+
+    async def _check(self, client: HttpClient, url: str, sem: asyncio.Semaphore) -> Resolution:
+        async with sem:
+            try:
+                resp = await client.head(url)
+            except Exception as exc:  # network errors are reported, not raised
+                return Resolution(url, error=f"{type(exc).__name__}: {exc}")
+        return Resolution(url, resp.status, resp.url)
+
+    async def resolve_async(self, urls: Iterable[str]) -> dict[str, Resolution]:
+        urls = list(dict.fromkeys(u for u in urls if u))
+        found = self.cache.get_many(urls, self.ttl_days) if self.cache else {}
+        todo = [u for u in urls if u not in found]
+        if todo:
+            # A client given by name is created (and closed) per call; an
+            # instance belongs to the caller.
+            owned = isinstance(self.client, str)
+            client = make_client(self.client, self.concurrency) if owned else self.client
+            sem = asyncio.Semaphore(self.concurrency)
+            try:
+                fresh = await asyncio.gather(*(self._check(client, u, sem) for u in todo))
+            finally:
+                if owned:
+                    await client.aclose()
+            if self.cache:
+                self.cache.put_many(fresh)
+            found.update((r.url, r) for r in fresh)
+        return {u: found[u] for u in urls}
+
+    def resolve(self, urls: Iterable[str]) -> dict[str, Resolution]:
+        return asyncio.run(self.resolve_async(urls))
+
+    def close(self) -> None:
+        if self.cache:
+            self.cache.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Verifica DOIs/URLs (com cache em disco).")
+    ap.add_argument("alvos", nargs="+", help="DOIs (10.x/...) ou URLs")
+    ap.add_argument("--doi-base", default=DOI_BASE)
+    ap.add_argument("--cliente", choices=sorted(CLIENTS), default="stdlib")
+    ap.add_argument("--concorrencia", type=int, default=CONCURRENCY)
+    ap.add_argument("--sem-cache", action="store_true")
+    args = ap.parse_args()
+
+    resolver = Resolver(args.cliente, None if args.sem_cache else DEFAULT_CACHE, args.concorrencia, doi_base=args.doi_base)
+    urls = [a if re.match(r"https?://", a) else resolver.doi_url(a) for a in args.alvos]
+    t0 = time.perf_counter()
+    results = resolver.resolve(urls)
+    resolver.close()
+    for r in results.values():
+        state = r.status if r.status is not None else r.error
+        print(f"{'OK ' if r.ok else 'ERR'} {state}  {r.url} -> {r.final_url}{'  (cache)' if r.cached else ''}")
+    print(f"{len(results)} verificados em {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Single-pass phrase substitution for the translation cleanup scripts.
+
+A list of ``(pattern, replacement)`` rules (the ``re.sub`` pairs the scripts
+used to apply one full-document pass at a time) is compiled once into a
+single alternation, longest phrase first, and the document is rewritten in
+one left-to-right pass. At every position the longest rule that matches
+wins, so a specific sentence still takes precedence over the shorter
+phrases it contains, as the hand-ordered lists intended.
+
+Patterns that are escaped literals (optionally wrapped in ``\\b``) are
+matched as literals; any other regex is kept as-is in the same alternation
+(ranked by the length of its pattern). Replacements keep ``re.sub``
+template semantics (``\\\\`` -> ``\\``).
+
+The result reports how often each rule fired and which never matched, so
+stale rules are visible.
+
+Used by:
+- corrigir_traducao_completa_v2.py
+- corrigir_traducao_parcial.py
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+_META = set(".^$*+?{}[]|()")
+
+
+def as_literal(pattern: str) -> tuple[str, bool, bool] | None:
+    """``(text, leading_b, trailing_b)`` when ``pattern`` is an escaped literal, else None."""
+    lead = pattern.startswith(r"\b")
+    trail = pattern.endswith(r"\b") and not pattern.endswith(r"\\b")
+    body = pattern[2 if lead else 0:len(pattern) - 2 if trail else None]
+    out = []
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c == "\\":
+            if i + 1 >= len(body) or body[i + 1].isalnum():
+                return None  # \d, \s, \1 ... are real regex
+            out.append(body[i + 1])
+            i += 2
+            continue
+        if c in _META:
+            return None
+        out.append(c)
+        i += 1
+    return "".join(out), lead, trail
+
+
+def expand_template(replacement: str) -> str:
+    """The literal text ``re.sub`` would insert for a group-free template."""
+    return re.sub("", replacement, "", count=1)
+
+
+@dataclass
+class Rewrite:
+    text: str
+    fired: Counter = field(default_factory=Counter)  # rule index -> matches
+    rules: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def unmatched(self) -> list[int]:
+        return [i for i in range(len(self.rules)) if not self.fired[i]]
+
+    @property
+    def total(self) -> int:
+        return sum(self.fired.values())
+
+
+def _boundary(first: str, lead: bool) -> str:
+    r"""``\b`` before ``first`` written *after* it, so every alternative of the
+    combined pattern starts with a literal character and the regex engine
+    can skip ahead with its first-character prefilter."""
+    if not lead:
+        return ""
+    return r"(?<!\w(?s:.))" if re.match(r"\w", first) else r"(?<=\w(?s:.))"
+
+
+class PhraseRewriter:
+    def __init__(self, rules: Iterable[tuple[str, str]], flags: int = 0) -> None:
+        self.rules = list(rules)
+        # With re.I a hit may differ in case from its phrase; phrases are keyed folded.
+        self._fold = bool(flags & re.IGNORECASE)
+        alts = []
+        # literal text -> [(rule index, leading \b, trailing \b)] in list order
+        self._by_text: dict[str, list[tuple[int, bool, bool]]] = {}
+        self._fixed: list[str | None] = []
+        self._regex: list[re.Pattern | None] = []
+        for i, (pattern, replacement) in enumerate(self.rules):
+            lit = as_literal(pattern)
+            if lit is None or not lit[0]:
+                # Real regex: own named group, re-matched on a hit so its
+                # groups and anchors expand as in re.sub.
+                alts.append((len(pattern), i, f"(?P<r{i}>{pattern})"))
+                self._fixed.append(None)
+                self._regex.append(re.compile(pattern, flags))
+                continue
+            text, lead, trail = lit
+            self._fixed.append(expand_template(replacement))
+            self._regex.append(None)
+            key = self._key(text)
+            if key not in self._by_text:
+                self._by_text[key] = []
+                alts.append((len(text), i, text))
+            self._by_text[key].append((i, lead, trail))
+        # One branch per phrase; a boundary goes into the branch only when
+        # every rule with that phrase asks for it, otherwise it is checked on
+        # the hit. Longest first; ties keep the list order.
+        alts.sort(key=lambda a: (-a[0], a[1]))
+        branches = []
+        for _, i, text in alts:
+            if self._regex[i] is not None:
+                branches.append(text)
+                continue
+            rules = self._by_text[self._key(text)]
+            lead = all(r[1] for r in rules)
+            trail = all(r[2] for r in rules)
+            branches.append(re.escape(text[0]) + _boundary(text[0], lead) + re.escape(text[1:]) + (r"\b" if trail else ""))
+        self.pattern = re.compile("|".join(branches), flags) if branches else None
+
+    def _key(self, text: str) -> str:
+        return text.lower() if self._fold else text
+
+    def _rule_for(self, m: re.Match) -> int | None:
+        if m.lastgroup:
+            return int(m.lastgroup[1:])
+        s, e = m.span()
+        for i, lead, trail in self._by_text[self._key(m.group())]:
+            if lead and not _at_boundary(m.string, s):
+                continue
+            if trail and not _at_boundary(m.string, e):
+                continue
+            return i
+        return None
+
+    def rewrite(self, text: str) -> Rewrite:
+        result = Rewrite(text, rules=self.rules)
+        if self.pattern is None:
+            return result
+        fired = result.fired
+
+        def repl(m: re.Match) -> str:
+            i = self._rule_for(m)
+            if i is None:
+                return m.group()
+            fired[i] += 1
+            if self._fixed[i] is not None:
+                return self._fixed[i]
+            return self._regex[i].match(m.string, m.start()).expand(self.rules[i][1])
+
+        result.text = self.pattern.sub(repl, text)
+        return result
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and (text[pos - 1].isalnum() or text[pos - 1] == "_")
+    after = pos < len(text) and (text[pos].isalnum() or text[pos] == "_")
+    return before != after
+
+
+def print_report(rw: Rewrite, name: str = "", max_len: int = 70, unmatched: bool = True) -> None:
+    def short(pattern: str) -> str:
+        lit = as_literal(pattern)
+        s = " ".join((lit[0] if lit else pattern).split())
+        return s if len(s) <= max_len else s[:max_len - 3] + "..."
+
+    print(f"{name}: {rw.total} substituicoes, {len(rw.fired)}/{len(rw.rules)} regras aplicadas")
+    for i in rw.unmatched if unmatched else ():
+        print(f"  nunca casou: {short(rw.rules[i][0])}")
+
+
+def rewrite_files(rewriter: PhraseRewriter, paths: Iterable[Path], write: bool = True) -> dict[Path, Rewrite]:
+    out = {}
+    for path in paths:
+        path = Path(path)
+        original = path.read_text(encoding="utf-8")
+        rw = rewriter.rewrite(original)
+        if write and rw.text != original:
+            path.write_text(rw.text, encoding="utf-8")
+        print_report(rw, path.name)
+        out[path] = rw
+    return out
@@ -0,0 +1,506 @@
+"""Temporal trend statistics for the SAT categorical table.
+
+The year x category count tensor comes from ``TemporalAggregator`` (one
+column block per family: Algoritmo, Evidencia, ...) and every trend
+statistic is computed for all categories at once, column-wise on that
+matrix:
+
+- Spearman rho between year and count (average ranks for ties; p-value
+  from the t approximation, as R's ``cor.test(..., exact = FALSE)``);
+- Mann-Kendall S / tau-b with the tie-corrected variance and continuity
+  correction (two-sided normal p-value);
+- Sen's slope (median of all pairwise slopes, studies per year);
+- log-linear growth: Poisson GLM ``log mu = a + b * (year - year0)`` fitted
+  by IRLS for every column simultaneously, refitted as negative binomial
+  (NB2, moment estimate of alpha) where the Pearson dispersion exceeds
+  ``OVERDISPERSION``. The annual growth rate is ``exp(b) - 1``.
+
+Columns with fewer than ``MIN_TOTAL`` studies get no growth model (the MLE
+of a handful of counts at the end of the window diverges).
+
+``lowess_band`` gives the confidence band of a LOWESS trend by residual
+bootstrap: the resampling indices for all replicates are drawn at once,
+replicates are refitted in chunks over a process pool (or, for the linear
+``it=0`` smoother, as one matrix product with its hat matrix), and the
+pointwise percentile band is cached in ``_cache/`` keyed by a hash of the
+series and the settings.
+
+``TemporalAggregator`` keeps the year x category counts as persisted state
+(``_cache/temporal_state.json``) and folds in only the rows appended to the
+categorical CSV since the last run; ``rolling_metrics`` derives rolling
+3/5-year counts, growth rates and shares from any ``CountTensor``.
+
+Used by:
+- build_sat_temporal_dataset.py
+- plot_temporal_sat_elsevier.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+CACHE_DIR = Path(__file__).resolve().parent / "_cache"
+
+FAMILIES = ("Algoritmo", "Evidencia", "Contexto", "Aplicacao", "Regiao")
+
+OVERDISPERSION = 1.5
+MIN_TOTAL = 5
+ALPHA = 0.05
+
+
+@dataclass
+class CountTensor:
+    years: np.ndarray  # (n_years,)
+    columns: pd.MultiIndex  # (family, category)
+    counts: np.ndarray  # (n_years, n_columns) int
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Studies per year (each study has exactly one category per family)."""
+        first = self.columns.get_level_values(0) == self.columns[0][0]
+        return self.counts[:, first].sum(axis=1)
+
+    def family(self, name: str) -> pd.DataFrame:
+        mask = self.columns.get_level_values(0) == name
+        return pd.DataFrame(
+            self.counts[:, mask],
+            index=pd.Index(self.years, name="Ano"),
+            columns=self.columns[mask].get_level_values(1),
+        )
+
+
+def spearman(x: np.ndarray, Y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """rho and two-sided p for ``x`` against every column of ``Y``."""
+    n = len(x)
+    rx = stats.rankdata(x)
+    RY = stats.rankdata(Y, axis=0)
+    rx = rx - rx.mean()
+    RY = RY - RY.mean(axis=0)
+    den = np.sqrt((rx**2).sum() * (RY**2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = (rx @ RY) / den
+        t = rho * np.sqrt((n - 2) / (1 - rho**2))
+    p = 2 * stats.t.sf(np.abs(t), n - 2)
+    return rho, np.where(np.isnan(rho), np.nan, p)
+
+
+def mann_kendall(Y: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """S, tau-b and two-sided p for every column of ``Y`` (rows in time order)."""
+    n = Y.shape[0]
+    i, j = np.triu_indices(n, k=1)
+    S = np.sign(Y[j] - Y[i]).sum(axis=0)
+    # Tie groups: each element of a group of size t contributes (t-1)(2t+5),
+    # so the per-group sum t(t-1)(2t+5) needs no explicit grouping.
+    t = (Y[:, None, :] == Y[None, :, :]).sum(axis=1)
+    ties = ((t - 1) * (2 * t + 5)).sum(axis=0)
+    var = (n * (n - 1) * (2 * n + 5) - ties) / 18.0
+    n0 = n * (n - 1) / 2
+    n1 = ((t - 1)).sum(axis=0) / 2  # sum over groups of t(t-1)/2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(S > 0, S - 1, np.where(S < 0, S + 1, 0)) / np.sqrt(var)
+        tau = S / np.sqrt(n0 * (n0 - n1))
+    p = 2 * stats.norm.sf(np.abs(z))
+    return S, tau, np.where(var > 0, p, np.nan)
+
+
+def sen_slope(x: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    i, j = np.triu_indices(len(x), k=1)
+    return np.median((Y[j] - Y[i]) / (x[j] - x[i])[:, None], axis=0)
+
+
+@dataclass
+class Growth:
+    model: np.ndarray  # "Poisson" / "NegBin" / ""
+    beta: np.ndarray
+    se: np.ndarray
+    dispersion: np.ndarray  # Pearson chi2 / df of the Poisson fit
+    alpha: np.ndarray  # NB2 alpha (0 for Poisson)
+
+    def rate(self, z: float = 0.0) -> np.ndarray:
+        return np.expm1(self.beta + z * self.se)
+
+
+def _irls(X: np.ndarray, Y: np.ndarray, alpha: np.ndarray, iters: int = 50, tol: float = 1e-8):
+    """Log-link GLM fitted column-wise; ``alpha`` = 0 is Poisson, > 0 NB2."""
+    K = Y.shape[1]
+    coef = np.zeros((2, K))
+    coef[0] = np.log(np.maximum(Y.mean(axis=0), 1e-3))
+    converged = np.zeros(K, dtype=bool)
+    for _ in range(iters):
+        eta = X @ coef
+        mu = np.exp(eta)
+        w = mu / (1 + alpha * mu)
+        zr = eta + (Y - mu) / mu
+        # Per-column 2x2 normal equations (X' W X) b = X' W z.
+        XtWX = np.einsum("ni,nk,nj->kij", X, w, X)
+        XtWz = np.einsum("ni,nk->ki", X, w * zr)
+        new = np.linalg.solve(XtWX, XtWz[..., None])[..., 0].T
+        step = np.abs(new - coef).max(axis=0)
+        coef = new
+        converged = step < tol
+        if converged.all():
+            break
+    mu = np.exp(X @ coef)
+    w = mu / (1 + alpha * mu)
+    cov = np.linalg.inv(np.einsum("ni,nk,nj->kij", X, w, X))
+    return coef, np.sqrt(cov[:, 1, 1]), mu, converged
+
+
+def growth_rates(x: np.ndarray, Y: np.ndarray, min_total: int = MIN_TOTAL) -> Growth:
+    """Poisson (or NB2 when overdispersed) log-linear trend for every column."""
+    n, K = Y.shape
+    beta = np.full(K, np.nan)
+    se = np.full(K, np.nan)
+    disp = np.full(K, np.nan)
+    alpha = np.zeros(K)
+    model = np.full(K, "", dtype=object)
+
+    fit = Y.sum(axis=0) >= min_total
+    if not fit.any():
+        return Growth(model, beta, se, disp, alpha)
+    X = np.column_stack([np.ones(n), x - x[0]])
+    Yf = Y[:, fit].astype(float)
+
+    coef, s, mu, ok = _irls(X, Yf, np.zeros(Yf.shape[1]))
+    pearson = (((Yf - mu) ** 2) / mu).sum(axis=0) / (n - 2)
+    a = np.zeros(Yf.shape[1])
+    over = pearson > OVERDISPERSION
+    if over.any():
+        # Cameron-Trivedi moment estimate: E[(y-mu)^2 - y] = alpha mu^2.
+        a[over] = np.maximum(
+            (((Yf - mu) ** 2 - Yf)[:, over]).sum(axis=0) / (mu[:, over] ** 2).sum(axis=0), 0.0
+        )
+        nb = over & (a > 0)
+        if nb.any():
+            c2, s2, _, ok2 = _irls(X, Yf[:, nb], a[nb])
+            coef[:, nb], s[nb], ok[nb] = c2, s2, ok2
+
+    idx = np.flatnonzero(fit)
+    beta[idx] = np.where(ok, coef[1], np.nan)
+    se[idx] = np.where(ok, s, np.nan)
+    disp[idx] = pearson
+    alpha[idx] = a
+    model[idx] = np.where(~ok, "", np.where(a > 0, "NegBin", "Poisson"))
+    return Growth(model, beta, se, disp, alpha)
+
+
+def bh_qvalues(p: np.ndarray) -> np.ndarray:
+    """Benjamini-Hochberg adjusted p-values (NaN kept as NaN)."""
+    q = np.full_like(p, np.nan, dtype=float)
+    ok = ~np.isnan(p)
+    pv = p[ok]
+    order = np.argsort(pv)
+    ranked = pv[order] * len(pv) / np.arange(1, len(pv) + 1)
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty_like(pv)
+    out[order] = np.minimum(ranked, 1.0)
+    q[ok] = out
+    return q
+
+
+def trend_table(tensor: CountTensor, alpha: float = ALPHA) -> pd.DataFrame:
+    """One row per category (plus the yearly total) with every trend statistic."""
+    x = tensor.years.astype(float)
+    Y = np.column_stack([tensor.totals, tensor.counts])
+    tipo = ["Publicacoes"] + list(tensor.columns.get_level_values(0))
+    feature = ["Total"] + list(tensor.columns.get_level_values(1))
+
+    rho, p = spearman(x, Y)
+    S, tau, p_mk = mann_kendall(Y)
+    g = growth_rates(x, Y)
+    z = stats.norm.ppf(1 - alpha / 2)
+
+    out = pd.DataFrame(
+        {
+            "Feature": feature,
+            "Tipo": tipo,
+            "Total": Y.sum(axis=0),
+            "Correlacao": rho,
+            "PValue": p,
+            "Significativo": p < alpha,
+            "Tendencia": np.where(rho > 0, "Increasing", np.where(rho < 0, "Decreasing", "NoTrend")),
+            "MK_S": S.astype(int),
+            "MK_Tau": tau,
+            "MK_PValue": p_mk,
+            "SenSlope": sen_slope(x, Y),
+            "Modelo": g.model,
+            "Dispersao": g.dispersion,
+            "TaxaCrescimento": g.rate(),
+            "TaxaIC_Inf": g.rate(-z),
+            "TaxaIC_Sup": g.rate(z),
+        }
+    )
+    # Category rows share one BH family; the yearly total is tested alone.
+    cat = out["Tipo"] != "Publicacoes"
+    out["QValue"] = out["PValue"]
+    out.loc[cat, "QValue"] = bh_qvalues(out.loc[cat, "PValue"].to_numpy())
+    return out.sort_values(["PValue", "Tipo", "Feature"], na_position="last", kind="stable").reset_index(drop=True)
+
+
+# ── Bootstrap LOWESS band ────────────────────────────────────────────────────
+
+N_BOOT = 2000
+
+
+@dataclass
+class LowessBand:
+    x: np.ndarray  # sorted data x
+    fit: np.ndarray  # LOWESS fit at x
+    lower: np.ndarray
+    upper: np.ndarray
+    n_boot: int
+    level: float
+
+
+def _lowess(y: np.ndarray, x: np.ndarray, frac: float, it: int) -> np.ndarray:
+    from statsmodels.nonparametric.smoothers_lowess import lowess
+
+    return lowess(y, x, frac=frac, it=it, return_sorted=False)
+
+
+def _lowess_chunk(args: tuple) -> np.ndarray:
+    """Refit LOWESS on a block of bootstrap replicates (rows of ``Ystar``)."""
+    x, Ystar, frac, it = args
+    return np.stack([_lowess(y, x, frac, it) for y in Ystar])
+
+
+def _band_key(x: np.ndarray, y: np.ndarray, **params: object) -> str:
+    from importlib.metadata import version
+
+    h = hashlib.sha256()
+    for arr in (x, y):
+        arr = np.ascontiguousarray(arr, dtype=float)
+        h.update(arr.tobytes())
+    h.update(f"statsmodels={version('statsmodels')};".encode())
+    for k in sorted(params):
+        h.update(f"{k}={params[k]!r};".encode())
+    return h.hexdigest()
+
+
+def lowess_band(
+    x: np.ndarray,
+    y: np.ndarray,
+    frac: float = 0.75,
+    it: int = 3,
+    n_boot: int = N_BOOT,
+    level: float = 0.90,
+    seed: int = 42,
+    n_jobs: int | None = None,
+    use_cache: bool = True,
+) -> LowessBand:
+    """LOWESS fit of ``y`` on ``x`` with a residual-bootstrap percentile band.
+
+    Replicates are ``fit + resampled residuals``; the band is the pointwise
+    ``(1 - level) / 2`` and ``(1 + level) / 2`` quantiles of their refits.
+    The draws depend only on ``seed``, so the band does not change with
+    ``n_jobs``.
+    """
+    order = np.argsort(x, kind="stable")
+    x = np.asarray(x, dtype=float)[order]
+    y = np.asarray(y, dtype=float)[order]
+
+    key = _band_key(x, y, frac=frac, it=it, n_boot=n_boot, level=level, seed=seed)
+    cache_path = CACHE_DIR / f"lowess_{key[:24]}.npz"
+    if use_cache and cache_path.exists():
+        with np.load(cache_path) as z:
+            return LowessBand(x, z["fit"], z["lower"], z["upper"], n_boot, level)
+
+    fit = _lowess(y, x, frac, it)
+    resid = y - fit
+    rng = np.random.default_rng(seed)
+    Ystar = fit + resid[rng.integers(0, len(y), size=(n_boot, len(y)))]
+
+    if it == 0:
+        # Without robustness iterations LOWESS is linear in y: fitting the unit
+        # vectors gives its hat matrix, and every replicate is one product.
+        H = _lowess_chunk((x, np.eye(len(y)), frac, 0)).T
+        fits = Ystar @ H.T
+    else:
+        n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, n_boot))
+        chunks = [(x, block, frac, it) for block in np.array_split(Ystar, n_jobs)]
+        if n_jobs == 1:
+            fits = _lowess_chunk(chunks[0])
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                fits = np.concatenate(list(pool.map(_lowess_chunk, chunks)))
+
+    tail = (1 - level) / 2
+    lower, upper = np.quantile(fits, [tail, 1 - tail], axis=0)
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp.npz")
+        np.savez(tmp, fit=fit, lower=lower, upper=upper)
+        tmp.replace(cache_path)
+    return LowessBand(x, fit, lower, upper, n_boot, level)
+
+
+# ── Incremental aggregation ──────────────────────────────────────────────────
+
+STATE_VERSION = 1
+STATE_PATH = CACHE_DIR / "temporal_state.json"
+WINDOWS = (3, 5)
+
+
+class TemporalAggregator:
+    """Year x (family, category) counts persisted between runs.
+
+    The categorical CSV is treated as append-only: the state remembers how
+    many bytes were aggregated and their SHA-256. On ``update`` only the rows
+    after that offset are parsed and added; if the already-counted prefix
+    changed (records edited, removed or reordered) the counts are rebuilt
+    from scratch. Hashing the prefix is the only work over the old rows.
+    """
+
+    def __init__(self, families: tuple[str, ...] = FAMILIES) -> None:
+        self.families = tuple(families)
+        self.reset()
+
+    def reset(self) -> None:
+        # (family, category) -> {year: n}; dict order = first appearance.
+        self.counts: dict[tuple[str, str], dict[int, int]] = {}
+        self.n_records = 0
+        self.offset = 0
+        self.prefix_sha = hashlib.sha256().hexdigest()
+
+    @classmethod
+    def load(cls, path: Path = STATE_PATH, families: tuple[str, ...] = FAMILIES) -> "TemporalAggregator":
+        agg = cls(families)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return agg
+        if data.get("version") != STATE_VERSION or tuple(data.get("families", ())) != agg.families:
+            return agg
+        agg.n_records = data["n_records"]
+        agg.offset = data["offset"]
+        agg.prefix_sha = data["prefix_sha256"]
+        agg.counts = {
+            (fam, cat): {int(y): n for y, n in years.items()}
+            for fam, cats in data["counts"].items()
+            for cat, years in cats.items()
+        }
+        return agg
+
+    def save(self, path: Path = STATE_PATH) -> None:
+        counts: dict[str, dict[str, dict[str, int]]] = {}
+        for (fam, cat), years in self.counts.items():
+            counts.setdefault(fam, {})[cat] = {str(y): n for y, n in sorted(years.items())}
+        data = {
+            "version": STATE_VERSION,
+            "families": list(self.families),
+            "n_records": self.n_records,
+            "offset": self.offset,
+            "prefix_sha256": self.prefix_sha,
+            "counts": counts,
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def add(self, df: pd.DataFrame) -> None:
+        df = df.dropna(subset=["Ano"])
+        years = df["Ano"].astype(int)
+        for fam in self.families:
+            grouped = pd.Series(1, index=df.index).groupby(
+                [df[fam].fillna("Other").astype(str), years], sort=False
+            ).sum()
+            for (cat, year), n in grouped.items():
+                cell = self.counts.setdefault((fam, cat), {})
+                cell[int(year)] = cell.get(int(year), 0) + int(n)
+        self.n_records += len(df)
+
+    def update(self, csv_path: str | Path) -> tuple[int, bool]:
+        """Aggregate the rows appended since the last call; (new rows, rebuilt)."""
+        csv_path = Path(csv_path)
+        h = hashlib.sha256()
+        with csv_path.open("rb") as f:
+            header = f.readline()
+            f.seek(0)
+            prefix = f.read(self.offset) if self.offset else b""
+            h.update(prefix)
+            rebuilt = not (self.offset and len(prefix) == self.offset and h.hexdigest() == self.prefix_sha)
+            if rebuilt:
+                self.reset()
+                f.seek(0)
+                h = hashlib.sha256()
+            tail = f.read()
+        h.update(tail)
+        before = self.n_records
+        body = tail if rebuilt else header + tail
+        if tail.strip() and body.strip() != header.strip():
+            self.add(pd.read_csv(io.BytesIO(body)))
+        self.offset = (0 if rebuilt else len(prefix)) + len(tail)
+        self.prefix_sha = h.hexdigest()
+        return self.n_records - before, rebuilt
+
+    def tensor(self, year_min: int, year_max: int) -> CountTensor:
+        """The aggregated counts as a ``CountTensor`` over ``[year_min, year_max]``."""
+        years = np.arange(year_min, year_max + 1)
+        columns: list[tuple[str, str]] = []
+        blocks = []
+        for fam in self.families:
+            cats = [key for key in self.counts if key[0] == fam]
+            block = np.array(
+                [[self.counts[key].get(int(y), 0) for key in cats] for y in years], dtype=np.int64
+            ).reshape(len(years), len(cats))
+            totals = block.sum(axis=0)
+            # Most frequent first, ties in order of first appearance.
+            order = [i for i in np.argsort(-totals, kind="stable") if totals[i] > 0]
+            columns += [cats[i] for i in order]
+            blocks.append(block[:, order])
+        index = pd.MultiIndex.from_tuples(columns, names=["Tipo", "Feature"])
+        return CountTensor(years, index, np.hstack(blocks))
+
+
+def rolling_metrics(tensor: CountTensor, windows: tuple[int, ...] = WINDOWS) -> pd.DataFrame:
+    """Rolling w-year counts, window-over-window growth and family shares.
+
+    For year t and window w: ``Contagem`` sums years t-w+1..t,
+    ``Crescimento`` compares it with the preceding w years (NaN when that
+    window is incomplete or empty) and ``Participacao`` divides it by the
+    studies published in the same window.
+    """
+    Y = np.column_stack([tensor.totals, tensor.counts]).astype(float)
+    tipo = np.array(["Publicacoes"] + list(tensor.columns.get_level_values(0)), dtype=object)
+    feature = np.array(["Total"] + list(tensor.columns.get_level_values(1)), dtype=object)
+    csum = np.vstack([np.zeros((1, Y.shape[1])), np.cumsum(Y, axis=0)])
+    n_years, K = Y.shape
+
+    frames = []
+    for w in windows:
+        if w > n_years:
+            continue
+        S = csum[w:] - csum[:-w]  # S[i] = window ending at years[i + w - 1]
+        prev = np.full_like(S, np.nan)
+        prev[w:] = S[:-w]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            growth = np.where(prev > 0, S / prev - 1, np.nan)
+            share = S / S[:, :1]
+        end_years = tensor.years[w - 1:]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Ano": np.repeat(end_years, K),
+                    "Janela": w,
+                    "Tipo": np.tile(tipo, len(end_years)),
+                    "Feature": np.tile(feature, len(end_years)),
+                    "Contagem": S.ravel().astype(int),
+                    "Crescimento": growth.ravel(),
+                    "Participacao": share.ravel(),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
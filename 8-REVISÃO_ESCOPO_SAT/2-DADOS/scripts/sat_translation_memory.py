@@ -0,0 +1,337 @@
+"""Translation memory for the mixed PT/EN manuscript.
+
+PT -> EN segment pairs live in a SQLite database instead of Python literals
+in the ``corrigir_traducao_*`` scripts. Each segment is stored with its
+normalized source text (lowercase, no accents, collapsed whitespace) and the
+set of its character trigrams in an inverted index, so:
+
+- exact lookup is one indexed query on the normalized text;
+- fuzzy lookup asks the trigram postings for the segments sharing the most
+  trigrams with the query (Dice coefficient on the counts), and only those
+  few candidates are scored with difflib; no pairwise pass over the memory.
+
+``scan`` finds residual Portuguese sentences in a .md/.tex file with a cheap
+word-level heuristic (Portuguese function words, accented characters and
+-ção/-ões endings) and suggests memory matches for each one. ``apply``
+rewrites files with every exact pair in one pass (sat_rewrite).
+
+Usage:
+  python sat_translation_memory.py import-scripts      # seed from corrigir_traducao_*.py
+  python sat_translation_memory.py add "texto pt" "english text"
+  python sat_translation_memory.py lookup "texto pt" [--min 0.6]
+  python sat_translation_memory.py scan Manuscript.tex [revisao_escopo_en.md ...]
+  python sat_translation_memory.py apply revisao_escopo_en.md [--dry-run]
+  python sat_translation_memory.py check                # regression probes for apply
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import re
+import sqlite3
+import unicodedata
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from sat_rewrite import PhraseRewriter, as_literal, print_report
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# Rebuilt with import-scripts; kept out of the tree like the other SQLite caches.
+DEFAULT_DB = SCRIPT_DIR / "_cache" / "memoria_traducao.sqlite"
+
+NGRAM = 3
+# Best candidates taken from the trigram index before difflib scoring.
+CANDIDATES = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id      INTEGER PRIMARY KEY,
+    pt      TEXT NOT NULL,
+    en      TEXT NOT NULL,
+    norm    TEXT NOT NULL UNIQUE,
+    ngrams  INTEGER NOT NULL,
+    source  TEXT NOT NULL DEFAULT '',
+    -- 1 when the source rule had a leading/trailing word boundary
+    lead    INTEGER NOT NULL DEFAULT 0,
+    trail   INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS grams (
+    gram    TEXT NOT NULL,
+    seg     INTEGER NOT NULL REFERENCES segments(id) ON DELETE CASCADE,
+    PRIMARY KEY (gram, seg)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def trigrams(norm: str) -> set[str]:
+    padded = f" {norm} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+@dataclass
+class Match:
+    pt: str
+    en: str
+    score: float  # 1.0 for exact
+    source: str = ""
+
+
+class TranslationMemory:
+    def __init__(self, path: Path = DEFAULT_DB) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        # Memories built before the boundary flags: add the columns (re-run import-scripts to fill them).
+        cols = {row[1] for row in self.db.execute("PRAGMA table_info(segments)")}
+        for col in ("lead", "trail"):
+            if col not in cols:
+                self.db.execute(f"ALTER TABLE segments ADD COLUMN {col} INTEGER NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "TranslationMemory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.db.commit()
+        self.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def add(self, pt: str, en: str, source: str = "", lead: bool = False, trail: bool = False) -> bool:
+        """Store (or update the translation of) a pair; True when the segment is new.
+
+        ``lead``/``trail`` ask ``apply`` to match the segment only at word
+        boundaries (the ``\\b`` of the script rule it came from).
+        """
+        norm = normalize(pt)
+        grams = trigrams(norm)
+        cur = self.db.execute("SELECT id FROM segments WHERE norm = ?", (norm,))
+        row = cur.fetchone()
+        if row:
+            self.db.execute(
+                "UPDATE segments SET en = ?, pt = ?, source = ?, lead = ?, trail = ? WHERE id = ?",
+                (en, pt, source, lead, trail, row[0]),
+            )
+            return False
+        seg = self.db.execute(
+            "INSERT INTO segments (pt, en, norm, ngrams, source, lead, trail) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (pt, en, norm, len(grams), source, lead, trail),
+        ).lastrowid
+        self.db.executemany("INSERT INTO grams (gram, seg) VALUES (?, ?)", ((g, seg) for g in grams))
+        return True
+
+    def add_many(self, pairs: Iterable[tuple[str, str, bool, bool]], source: str = "") -> int:
+        """Pairs as ``(pt, en, lead, trail)``."""
+        with self.db:
+            return sum(self.add(pt, en, source, lead, trail) for pt, en, lead, trail in pairs)
+
+    def exact(self, pt: str) -> Match | None:
+        row = self.db.execute("SELECT pt, en, source FROM segments WHERE norm = ?", (normalize(pt),)).fetchone()
+        return Match(row[0], row[1], 1.0, row[2]) if row else None
+
+    def fuzzy(self, pt: str, min_score: float = 0.6, limit: int = 3) -> list[Match]:
+        hit = self.exact(pt)
+        if hit:
+            return [hit]
+        norm = normalize(pt)
+        grams = trigrams(norm)
+        if not grams:
+            return []
+        marks = ",".join("?" * len(grams))
+        rows = self.db.execute(
+            f"""SELECT s.id, s.pt, s.en, s.norm, s.source, 2.0 * COUNT(*) / (s.ngrams + ?) AS dice
+                FROM grams g JOIN segments s ON s.id = g.seg
+                WHERE g.gram IN ({marks})
+                GROUP BY g.seg ORDER BY dice DESC LIMIT ?""",
+            (len(grams), *grams, CANDIDATES),
+        ).fetchall()
+        out = []
+        for _, spt, sen, snorm, source, dice in rows:
+            if dice < min_score * 0.8:
+                break  # sorted by dice; the rest share too few trigrams to pass
+            score = difflib.SequenceMatcher(None, norm, snorm, autojunk=False).ratio()
+            if score >= min_score:
+                out.append(Match(spt, sen, round(score, 3), source))
+        return sorted(out, key=lambda m: -m.score)[:limit]
+
+    def pairs(self) -> list[tuple[str, str]]:
+        return self.db.execute("SELECT pt, en FROM segments ORDER BY id").fetchall()
+
+    def rewriter(self) -> PhraseRewriter:
+        rows = self.db.execute("SELECT pt, en, lead, trail FROM segments ORDER BY id")
+        return PhraseRewriter(
+            ((r"\b" if lead else "") + re.escape(pt) + (r"\b" if trail else ""), en.replace("\\", "\\\\"))
+            for pt, en, lead, trail in rows
+        )
+
+
+# ---------------------------------------------------------------------------
+# Residual Portuguese
+# ---------------------------------------------------------------------------
+
+# Function words that are not also common English words.
+PT_WORDS = frozenset("""
+    de da das dos em na nos nas um uma uns umas que não nao para pelo pela
+    pelos pelas com como mais mas ou se ao aos à às é são sao foi foram ser está
+    estão entre sobre também tambem seu sua seus suas este esta estes estas esse
+    essa isso desse dessa deste desta quando onde qual quais cujo cuja muito já
+    ainda até após sem sob nosso nossa eles elas lhe
+""".split())
+_WORD_RE = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+_PT_MARKS_RE = re.compile(r"[ãõçâêôáíóúà]|ção\b|ções\b|ões\b", re.IGNORECASE)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+|$)", re.MULTILINE)
+_LATEX_RE = re.compile(r"%[^\n]*|\\(?:cite\w*|ref|label|eqref|includegraphics|url|href)\s*(?:\[[^\]]*\])?\{[^}]*\}|\\[A-Za-z@]+\*?|[{}$~]")
+
+
+@dataclass
+class Residual:
+    line: int
+    text: str
+    score: float
+
+
+def portuguese_score(words: list[str], sentence: str) -> float:
+    if not words:
+        return 0.0
+    pt = sum(w in PT_WORDS for w in words)
+    marks = len(_PT_MARKS_RE.findall(sentence))
+    return (pt + 0.5 * marks) / len(words)
+
+
+def _plain(text: str, is_tex: bool) -> str:
+    """LaTeX markup blanked out with spaces so offsets (and lines) are kept."""
+    if not is_tex:
+        return text
+    return _LATEX_RE.sub(lambda m: re.sub(r"[^\n]", " ", m.group()), text)
+
+
+def scan(text: str, is_tex: bool = False, threshold: float = 0.25, min_words: int = 4) -> Iterator[Residual]:
+    plain = _plain(text, is_tex)
+    line, last = 1, 0
+    for m in _SENTENCE_RE.finditer(plain):
+        sentence = " ".join(m.group().split())
+        words = _WORD_RE.findall(sentence.lower())
+        if len(words) < min_words:
+            continue
+        score = portuguese_score(words, sentence)
+        if score >= threshold:
+            line += plain.count("\n", last, m.start())
+            last = m.start()
+            yield Residual(line, sentence, round(score, 2))
+
+
+# (text, expected after ``apply``): rules whose script pattern has \b must not
+# fire inside other words ("onde a" -> "where the" in "responde ao").
+PROBES = [
+    ("O sistema responde ao clima e corresponde a uma mudança", "O sistema responde ao clima e corresponde a uma mudança"),
+]
+
+
+def check(tm: TranslationMemory) -> list[tuple[str, str, str]]:
+    """Probes whose rewrite differs from the expected text: (text, expected, got)."""
+    rw = tm.rewriter()
+    out = []
+    for text, expected in PROBES:
+        got = rw.rewrite(text).text
+        if got != expected:
+            out.append((text, expected, got))
+    return out
+
+
+def script_pairs() -> Iterator[tuple[str, str, str, bool, bool]]:
+    """(pt, en, source, lead, trail) from the literal rules of the corrigir_traducao_* scripts."""
+    import corrigir_traducao_completa_v2
+    import corrigir_traducao_parcial
+
+    sources = {
+        "corrigir_traducao_completa_v2.py": corrigir_traducao_completa_v2.SUBS_LONGAS,
+        "corrigir_traducao_parcial.py": list(corrigir_traducao_parcial.SUBSTITUICOES.items()),
+    }
+    for name, rules in sources.items():
+        for pattern, replacement in rules:
+            lit = as_literal(pattern)
+            if lit and lit[0] != replacement:
+                yield lit[0], re.sub("", replacement, "", count=1), name, lit[1], lit[2]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Memoria de traducao PT->EN do manuscrito.")
+    ap.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"base SQLite (padrao: {DEFAULT_DB.name})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("import-scripts", help="importa os pares dos scripts corrigir_traducao_*")
+    p = sub.add_parser("add", help="adiciona/atualiza um par")
+    p.add_argument("pt")
+    p.add_argument("en")
+    p.add_argument("--palavra-inteira", action="store_true", help="so casa em limites de palavra (\\b...\\b)")
+    p = sub.add_parser("lookup", help="busca exata e aproximada")
+    p.add_argument("pt")
+    p.add_argument("--min", type=float, default=0.6)
+    p = sub.add_parser("scan", help="frases residuais em portugues, com sugestoes da memoria")
+    p.add_argument("files", nargs="+", type=Path)
+    p.add_argument("--threshold", type=float, default=0.25)
+    p.add_argument("--min", type=float, default=0.6)
+    p = sub.add_parser("apply", help="aplica todos os pares exatos aos arquivos")
+    p.add_argument("files", nargs="+", type=Path)
+    p.add_argument("--dry-run", action="store_true")
+    sub.add_parser("check", help="confere o apply nas frases de regressao (PROBES)")
+    args = ap.parse_args()
+
+    with TranslationMemory(args.db) as tm:
+        if args.cmd == "import-scripts":
+            by_source: dict[str, list[tuple[str, str, bool, bool]]] = {}
+            for pt, en, source, lead, trail in script_pairs():
+                by_source.setdefault(source, []).append((pt, en, lead, trail))
+            for source, pairs in by_source.items():
+                print(f"{source}: {tm.add_many(pairs, source)} novos de {len(pairs)} pares")
+            print(f"Memoria: {len(tm)} segmentos em {args.db}")
+        elif args.cmd == "add":
+            whole = args.palavra_inteira
+            print("novo" if tm.add(args.pt, args.en, "manual", whole, whole) else "atualizado")
+        elif args.cmd == "lookup":
+            matches = tm.fuzzy(args.pt, args.min)
+            if not matches:
+                print("Sem correspondencia.")
+            for m in matches:
+                print(f"[{m.score:.2f}] {m.pt}\n       -> {m.en}")
+        elif args.cmd == "scan":
+            for path in args.files:
+                text = path.read_text(encoding="utf-8")
+                found = list(scan(text, path.suffix == ".tex", args.threshold))
+                print(f"\n{path.name}: {len(found)} frase(s) em portugues")
+                for r in found:
+                    print(f"  L{r.line} [{r.score:.2f}] {r.text[:120]}")
+                    for m in tm.fuzzy(r.text, args.min, limit=1):
+                        print(f"      TM {m.score:.2f}: {m.en[:120]}")
+        elif args.cmd == "apply":
+            rw = tm.rewriter()
+            for path in args.files:
+                original = path.read_text(encoding="utf-8")
+                result = rw.rewrite(original)
+                if not args.dry_run and result.text != original:
+                    path.write_text(result.text, encoding="utf-8")
+                print_report(result, path.name, unmatched=False)
+        elif args.cmd == "check":
+            failures = check(tm)
+            for text, expected, got in failures:
+                print(f"FALHOU: {text}\n  esperado: {expected}\n  obtido:   {got}")
+            print(f"{len(PROBES) - len(failures)}/{len(PROBES)} frases de regressao ok")
+            if failures:
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
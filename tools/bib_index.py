@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelo unico de bibliografia do projeto: qualquer .bib (referencias.bib do
+manuscrito, corpus filtrado, exportacoes brutas scopus_export.bib /
+wos_export.bib) e lido pelo mesmo tokenizador e vira uma lista de BibEntry.
+
+O arquivo e varrido uma unica vez (profundidade de chaves com regex
+compiladas, sem fatiar o texto por campo); ``records`` guarda todas as
+entradas na ordem do arquivo (inclusive chaves repetidas, comuns nas
+exportacoes) e ``entries`` indexa chave -> primeira definicao, como o BibTeX.
+
+``load_bib(path)`` e o ponto de entrada compartilhado: memoriza o indice no
+processo e persiste em tools/_cache/bib/, reaproveitado enquanto o sha256 do
+.bib nao mudar. Os scripts de 2-DADOS/scripts o usam via sat_bib.py.
+
+Uso:
+  python tools/bib_index.py referencias.bib [--save referencias.index.json] [KEY ...]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+INDEX_VERSION = 2
+CACHE_DIR = Path(__file__).resolve().parent / "_cache" / "bib"
+
+_ENTRY_RE = re.compile(rb"@([A-Za-z]+)\s*([{(])")
+_BRACE_RE = re.compile(rb"[{}]")
+_FIELD_NAME_RE = re.compile(r"\s*,?\s*([A-Za-z][\w\-:.]*)\s*=\s*")
+_NON_ENTRIES = {"comment", "preamble", "string"}
+# Value tokenizer: every pattern is matched at a position, never on a slice.
+_VBRACE_RE = re.compile(r"[{}]")
+_VQUOTE_RE = re.compile(r'[{}"]')
+_VBARE_RE = re.compile(r"[^,#\s}]+")
+_VCONCAT_RE = re.compile(r"\s*#\s*")
+_LATEX_ACCENT_RE = re.compile(r"\\[`'^\"~=.uvHckbdr](?![A-Za-z])\s*|\\[uvHckbdr]\s+")
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+@dataclass
+class BibEntry:
+    key: str
+    entry_type: str
+    start: int  # byte offset of '@'
+    end: int  # byte offset just past the closing brace
+    fields: dict[str, str] = field(default_factory=dict)
+
+    def get(self, name: str, default: str = "") -> str:
+        return self.fields.get(name, default)
+
+    def text(self, name: str) -> str:
+        """Field value as plain text: LaTeX accent commands and braces removed."""
+        value = self.fields.get(name, "")
+        if "{" in value or "\\" in value:
+            value = _LATEX_ACCENT_RE.sub("", value).replace("{", "").replace("}", "")
+            value = " ".join(value.split())
+        return value
+
+    @property
+    def year(self) -> int | None:
+        m = re.search(r"(?:19|20)\d{2}", self.fields.get("year", ""))
+        return int(m.group()) if m else None
+
+    @property
+    def authors(self) -> list[str]:
+        raw = self.fields.get("author", "")
+        return [a.strip() for a in re.split(r"\s+and\s+", raw) if a.strip()] if raw else []
+
+    @property
+    def doi(self) -> str:
+        """DOI without resolver prefix, lowercased ('' when absent)."""
+        return _DOI_PREFIX_RE.sub("", self.fields.get("doi", "").strip()).lower()
+
+
+def _closing(data: bytes, open_pos: int, opener: bytes) -> int:
+    """Offset just past the delimiter that closes the one at ``open_pos``."""
+    if opener == b"(":
+        # Rare @type( ... ) form: values still use braces, so track both.
+        depth = 0
+        for i in range(open_pos, len(data)):
+            c = data[i:i + 1]
+            if c in (b"{", b"("):
+                depth += 1
+            elif c in (b"}", b")"):
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+        return len(data)
+    depth = 0
+    for m in _BRACE_RE.finditer(data, open_pos):
+        depth += 1 if m.group() == b"{" else -1
+        if depth == 0:
+            return m.end()
+    return len(data)
+
+
+def _read_value(body: str, i: int) -> tuple[str, int]:
+    """Parse one field value starting at ``body[i]``; returns (value, next index)."""
+    parts: list[str] = []
+    n = len(body)
+    while i < n:
+        c = body[i]
+        if c == "{":
+            depth, j = 0, n
+            for m in _VBRACE_RE.finditer(body, i):
+                depth += 1 if m.group() == "{" else -1
+                if depth == 0:
+                    j = m.start()
+                    break
+            parts.append(body[i + 1:j])
+            i = j + 1
+        elif c == '"':
+            depth, j = 0, n
+            for m in _VQUOTE_RE.finditer(body, i + 1):
+                t = m.group()
+                if t == '"' and depth == 0:
+                    j = m.start()
+                    break
+                depth += 1 if t == "{" else -1 if t == "}" else 0
+            parts.append(body[i + 1:j])
+            i = j + 1
+        else:
+            m = _VBARE_RE.match(body, i)
+            if not m:
+                break
+            parts.append(m.group())  # number or @string macro name
+            i = m.end()
+        # Concatenation: value # value
+        m = _VCONCAT_RE.match(body, i)
+        if not m:
+            break
+        i = m.end()
+    return " ".join("".join(parts).split()), i
+
+
+def _parse_fields(body: str) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    i = 0
+    while True:
+        m = _FIELD_NAME_RE.match(body, i)
+        if not m:
+            break
+        value, i = _read_value(body, m.end())
+        fields.setdefault(m.group(1).lower(), value)
+    return fields
+
+
+def scan_records(data: bytes) -> list[BibEntry]:
+    """Single pass over the raw bytes: every entry, in file order (repeated keys kept)."""
+    records: list[BibEntry] = []
+    pos = 0
+    while True:
+        m = _ENTRY_RE.search(data, pos)
+        if not m:
+            break
+        etype = m.group(1).decode("ascii").lower()
+        end = _closing(data, m.start(2), m.group(2))
+        pos = end
+        if etype in _NON_ENTRIES:
+            continue
+        body = data[m.end():end - 1].decode("utf-8", errors="ignore")
+        key, _, rest = body.partition(",")
+        key = key.strip()
+        if not key:
+            continue
+        records.append(BibEntry(key=key, entry_type=etype, start=m.start(), end=end, fields=_parse_fields(rest)))
+    return records
+
+
+def _index(records: list[BibEntry]) -> tuple[dict[str, BibEntry], list[str]]:
+    entries: dict[str, BibEntry] = {}
+    duplicates: list[str] = []
+    for e in records:
+        if e.key in entries:
+            # BibTeX keeps the first definition; report the rest.
+            duplicates.append(e.key)
+        else:
+            entries[e.key] = e
+    return entries, duplicates
+
+
+def scan_bibtex(data: bytes) -> tuple[dict[str, BibEntry], list[str]]:
+    """Single pass over the raw bytes. Returns (index, duplicated keys)."""
+    return _index(scan_records(data))
+
+
+class BibIndex:
+    def __init__(self, path: Path, records: list[BibEntry], sha256: str) -> None:
+        self.path = path
+        self.records = records
+        self.entries, self.duplicates = _index(records)
+        self.sha256 = sha256
+
+    @classmethod
+    def load(cls, bib_path: str | Path, index_path: str | Path | None = None) -> "BibIndex":
+        """Parse ``bib_path``; with ``index_path``, reuse/refresh a persisted index."""
+        bib_path = Path(bib_path)
+        data = bib_path.read_bytes()
+        sha = hashlib.sha256(data).hexdigest()
+        if index_path is not None:
+            records = cls._read_index(Path(index_path), sha)
+            if records is not None:
+                return cls(bib_path, records, sha)
+        idx = cls(bib_path, scan_records(data), sha)
+        if index_path is not None:
+            idx.save(index_path)
+        return idx
+
+    @staticmethod
+    def _read_index(index_path: Path, sha: str) -> list[BibEntry] | None:
+        if not index_path.exists():
+            return None
+        try:
+            raw = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if raw.get("version") != INDEX_VERSION or raw.get("sha256") != sha:
+            return None
+        return [BibEntry(**e) for e in raw["records"]]
+
+    def save(self, index_path: str | Path) -> None:
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "source": str(self.path),
+            "sha256": self.sha256,
+            "records": [asdict(e) for e in self.records],
+        }
+        tmp = index_path.with_suffix(index_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(index_path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __getitem__(self, key: str) -> BibEntry:
+        return self.entries[key]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> BibEntry | None:
+        return self.entries.get(key)
+
+    def raw(self, key: str) -> str:
+        """Original text of one entry, read by offset without rescanning."""
+        e = self.entries[key]
+        with self.path.open("rb") as f:
+            f.seek(e.start)
+            return f.read(e.end - e.start).decode("utf-8", errors="ignore")
+
+
+def default_index_path(bib_path: Path) -> Path:
+    """tools/_cache/bib/<stem>-<hash of the absolute path>.json"""
+    tag = hashlib.sha1(str(bib_path.resolve()).encode("utf-8")).hexdigest()[:10]
+    return CACHE_DIR / f"{bib_path.stem}-{tag}.json"
+
+
+_LOADED: dict[Path, tuple[tuple[int, int], BibIndex]] = {}
+
+
+def load_bib(bib_path: str | Path, persist: bool = True) -> BibIndex:
+    """Shared loader: one parse per file per process, persisted index across runs."""
+    bib_path = Path(bib_path).resolve()
+    st = bib_path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _LOADED.get(bib_path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    idx = BibIndex.load(bib_path, default_index_path(bib_path) if persist else None)
+    _LOADED[bib_path] = (stamp, idx)
+    return idx
+
+
+def main() -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Indexa um .bib e consulta chaves.")
+    ap.add_argument("bib")
+    ap.add_argument("keys", nargs="*")
+    ap.add_argument("--save", metavar="INDEX_JSON", help="persiste/reaproveita o indice neste arquivo")
+    args = ap.parse_args()
+
+    idx = BibIndex.load(args.bib, args.save) if args.save else load_bib(args.bib)
+    print(f"{len(idx.records)} registros, {len(idx)} chaves indexadas ({len(idx.duplicates)} chaves duplicadas)")
+    for k in args.keys:
+        e = idx.get(k)
+        if e is None:
+            print(f"{k}: NAO ENCONTRADA")
+        else:
+            print(f"{k}: @{e.entry_type} bytes {e.start}-{e.end} year={e.get('year', 'N/A')} doi={e.get('doi', 'N/A')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,91 +3,78 @@
 """
 Citation Validator - Extracts and validates all citations from LaTeX document
 against bibliography file and generates comprehensive validation report.
+
+Usage:
+  python tools/citation_validator.py [Manuscript.tex] [--bib referencias.bib] [--report REPORT.md]
+
+Without arguments, uses */submission/Manuscript.tex and the referencias.bib
+next to it.
 """
 
+import argparse
 import re
 import os
 from collections import defaultdict
+from pathlib import Path
 
-# Define file paths
-latex_file = r"c:\Users\vidal\OneDrive\Documentos\13 - CLONEGIT\artigo_1_catuxe\8-REVISÃO_ESCOPO_SAT\latex\sn-article.tex"
-bib_file = r"c:\Users\vidal\OneDrive\Documentos\13 - CLONEGIT\artigo_1_catuxe\8-REVISÃO_ESCOPO_SAT\latex\referencias.bib"
+from bib_index import BibIndex, load_bib
+from latex_doc import Manuscript, default_bib, default_manuscript
 
-def extract_citations_from_latex(file_path):
-    """Extract all citation keys from LaTeX document"""
+# \cite, \citep, \citet, \citen
+CITE_COMMANDS = ('\\cite', '\\citep', '\\citet', '\\citen')
+
+
+def extract_citations(doc):
+    """Extract all citation keys from a parsed Manuscript (comments excluded)"""
     citations = defaultdict(set)
     
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"Error reading LaTeX file: {e}")
-        return citations
-    
-    # Find all citation commands
-    # Pattern: \cite{KEY} or \citep{KEY} or \citet{KEY}
-    # Handle multiple citations: \cite{KEY1,KEY2,KEY3}
-    pattern = r'\\cite[ptn]?\{([^}]+)\}'
-    
-    matches = re.finditer(pattern, content)
-    for match in matches:
-        citation_cmd = match.group(0)
+    for i, tok in doc.commands(*CITE_COMMANDS):
         # Extract citation type
-        if '\\citet{' in citation_cmd:
+        if tok.value == '\\citet':
             cit_type = 'citet'
-        elif '\\citep{' in citation_cmd:
+        elif tok.value == '\\citep':
             cit_type = 'citep'
         else:
             cit_type = 'cite'
         
-        # Extract individual citation keys
-        keys_str = match.group(1)
-        keys = [k.strip() for k in keys_str.split(',')]
-        
-        for key in keys:
+        # Handle multiple citations: \cite{KEY1,KEY2,KEY3}
+        keys_str = doc.arg_text(i) or ''
+        for key in (k.strip() for k in keys_str.split(',')):
             if key:
                 citations[key].add(cit_type)
     
     return citations
 
-def parse_bibtex(file_path):
-    """Parse BibTeX file and extract all entries"""
+def extract_citations_from_latex(file_path):
+    """Extract all citation keys from LaTeX document"""
+    try:
+        doc = Manuscript(file_path)
+    except Exception as e:
+        print(f"Error reading LaTeX file: {e}")
+        return defaultdict(set)
+    return extract_citations(doc)
+
+def parse_bibtex(file_path, index_path=None):
+    """Parse BibTeX file once into a key -> entry index (see bib_index.py).
+
+    The index is persisted (``index_path``, or tools/_cache/bib/ by default)
+    and reused while the .bib file is unchanged.
+    """
     entries = {}
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        index = BibIndex.load(file_path, index_path) if index_path else load_bib(file_path)
     except Exception as e:
         print(f"Error reading BibTeX file: {e}")
         return entries
     
-    # Find all bibtex entries
-    # Pattern: @ENTRYTYPE{KEY, ... }
-    pattern = r'@\w+\{([^,\n]+),'
-    
-    matches = re.finditer(pattern, content, re.IGNORECASE)
-    for match in matches:
-        entry_key = match.group(1).strip()
-        entries[entry_key] = True
-    
-    # Extract additional metadata for each entry
-    for key in entries.keys():
-        # Find year
-        year_pattern = key + r'[^@]*year\s*=\s*\{*(\d{4})\}*'
-        year_match = re.search(year_pattern, content, re.IGNORECASE | re.DOTALL)
-        if year_match:
-            entries[key] = {'year': year_match.group(1)}
-        else:
-            entries[key] = {'year': 'N/A'}
-        
-        # Find DOI
-        doi_pattern = key + r'[^@]*doi\s*=\s*\{*([^},\n]+)\}*'
-        doi_match = re.search(doi_pattern, content, re.IGNORECASE | re.DOTALL)
-        if doi_match:
-            doi_value = doi_match.group(1).strip()
-            entries[key]['doi'] = doi_value
-        else:
-            entries[key]['doi'] = 'N/A'
+    for key, entry in index.entries.items():
+        year_match = re.search(r'\d{4}', entry.get('year'))
+        entries[key] = {
+            'year': year_match.group(0) if year_match else 'N/A',
+            'doi': entry.get('doi').strip() or 'N/A',
+            'fields': entry.fields,
+        }
     
     return entries
 
@@ -141,7 +128,7 @@ def validate_citations(citations, bib_entries):
     
     return validation_report
 
-def generate_markdown_report(validation_report, total_citations):
+def generate_markdown_report(validation_report, total_citations, doc_name="Manuscript.tex", bib_name="referencias.bib"):
     """Generate comprehensive markdown validation report"""
     
     # Count statistics
@@ -152,16 +139,16 @@ def generate_markdown_report(validation_report, total_citations):
     # Header
     markdown = f"""# Citation Validation Report
 
-**Document:** sn-article.tex  
-**Bibliography:** referencias.bib  
+**Document:** {doc_name}  
+**Bibliography:** {bib_name}  
 **Generated:** Citation Analysis Report
 
 ## Summary Statistics
 
 - **Total Unique Citations Found:** {len(validation_report)}
 - **Total Citation Instances:** {total_citations}
-- **Citations Found in Bibliography:** {found} ({100*found/len(validation_report):.1f}%)
-- **Citations Missing from Bibliography:** {missing} ({100*missing/len(validation_report):.1f}%)
+- **Citations Found in Bibliography:** {found} ({100*found/max(len(validation_report), 1):.1f}%)
+- **Citations Missing from Bibliography:** {missing} ({100*missing/max(len(validation_report), 1):.1f}%)
 - **Citations with Valid DOI:** {with_doi}
 - **Encoding Issues Detected:** {sum(1 for r in validation_report if 'Encoding' in r['issues'])}
 
@@ -180,7 +167,7 @@ def generate_markdown_report(validation_report, total_citations):
     missing_cits = [r for r in validation_report if r['status'] == '✗ MISSING']
     if missing_cits:
         markdown += f"\n## Missing Citations ({len(missing_cits)})\n\n"
-        markdown += "**These citations are used in the document but not found in referencias.bib:**\n\n"
+        markdown += f"**These citations are used in the document but not found in {bib_name}:**\n\n"
         for cit in missing_cits:
             markdown += f"- `{cit['key']}` (used as: {cit['type']})\n"
     
@@ -220,51 +207,51 @@ def generate_markdown_report(validation_report, total_citations):
     
     return markdown
 
-def main():
-    """Main execution function"""
-    print("=" * 60)
-    print("Citation Validator - LaTeX Document Analysis")
-    print("=" * 60)
-    
-    # Extract citations from LaTeX
-    print("\n1. Extracting citations from LaTeX document...")
-    citations = extract_citations_from_latex(latex_file)
+def validate(doc, bib_entries, report_path=None, bib_name="referencias.bib"):
+    """Validate an already parsed Manuscript; optionally write the markdown report"""
+    citations = extract_citations(doc)
     total_citation_instances = sum(len(v) for v in citations.values())
     print(f"   Found {len(citations)} unique citations ({total_citation_instances} instances)")
     
-    # Parse bibliography
-    print("\n2. Parsing bibliography file...")
-    bib_entries = parse_bibtex(bib_file)
-    print(f"   Found {len(bib_entries)} bibliography entries")
-    
-    # Validate
-    print("\n3. Validating citations...")
     validation_report = validate_citations(citations, bib_entries)
     
-    # Generate report
-    print("\n4. Generating markdown report...")
-    markdown_report = generate_markdown_report(validation_report, total_citation_instances)
-    
-    # Save report
-    report_path = r"c:\Users\vidal\OneDrive\Documentos\13 - CLONEGIT\artigo_1_catuxe\CITATION_VALIDATION_REPORT.md"
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(markdown_report)
-    
-    print(f"\n✓ Report saved to: {report_path}")
+    if report_path:
+        markdown_report = generate_markdown_report(validation_report, total_citation_instances, doc.name, bib_name)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(markdown_report)
+        print(f"   Report saved to: {report_path}")
     
-    # Print summary
     found = sum(1 for r in validation_report if r['status'] == '✓ FOUND')
     missing = sum(1 for r in validation_report if r['status'] == '✗ MISSING')
+    print(f"   Total Citations: {len(validation_report)} | Found: {found} | Missing: {missing}")
+    for r in validation_report:
+        if r['status'] == '✗ MISSING':
+            print(f"     - {r['key']}")
+    
+    return validation_report
+
+def main():
+    """Main execution function"""
+    ap = argparse.ArgumentParser(description="Validate LaTeX citations against a .bib file.")
+    ap.add_argument("tex", nargs="?", help="manuscript (default: */submission/Manuscript.tex)")
+    ap.add_argument("--bib", help="bibliography (default: referencias.bib next to the manuscript)")
+    ap.add_argument("--report", help="markdown report path (default: CITATION_VALIDATION_REPORT.md at the repo root)")
+    args = ap.parse_args()
+    
+    latex_file = Path(args.tex) if args.tex else default_manuscript()
+    bib_file = Path(args.bib) if args.bib else default_bib(latex_file)
+    report_path = args.report or str(Path(__file__).resolve().parents[1] / "CITATION_VALIDATION_REPORT.md")
     
-    print("\n" + "=" * 60)
-    print("VALIDATION SUMMARY")
     print("=" * 60)
-    print(f"Total Citations: {len(validation_report)}")
-    print(f"Found in Bibliography: {found}")
-    print(f"Missing from Bibliography: {missing}")
+    print("Citation Validator - LaTeX Document Analysis")
     print("=" * 60)
     
-    return validation_report
+    print(f"\n1. Parsing bibliography file ({bib_file})...")
+    bib_entries = parse_bibtex(bib_file)
+    print(f"   Found {len(bib_entries)} bibliography entries")
+    
+    print(f"\n2. Validating citations in {latex_file}...")
+    return validate(Manuscript(latex_file), bib_entries, report_path, bib_file.name)
 
 if __name__ == '__main__':
     main()
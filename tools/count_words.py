@@ -1,31 +1,365 @@
+#!/usr/bin/env python3
+"""Conta palavras do manuscrito (entre \\begin{document} e \\end{document}),
+com quebra por secao, abstract, legendas, tabelas e notas de rodape.
+
+O texto e percorrido em uma unica passada pelo fluxo de tokens de
+latex_doc, com uma pilha de grupos/ambientes (profundidade de chaves): cada
+grupo sabe em que "balde" suas palavras caem, argumentos que nao sao prosa
+(\\label, \\ref, \\cite, \\includegraphics, especificacao de colunas, math...)
+sao ignorados mesmo quando tem chaves aninhadas, e palavras partidas por
+comandos (ex.: 94.2\\%) contam uma vez.
+
+O corpo e dividido em blocos em cada \\section; no modo --watch so os blocos
+cujo texto mudou sao recontados.
+
+Uso:
+  python tools/count_words.py [Manuscript.tex ...]
+  python tools/count_words.py --json
+  python tools/count_words.py --watch            # reconta a cada gravacao
+
+Sem argumentos, conta */submission/Manuscript.tex.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
 import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from latex_doc import Manuscript, default_manuscript, tokenize
+
+BUCKETS = ("title", "keywords", "abstract", "text", "headings", "captions", "tables", "footnotes")
+
+SECTION_LEVELS = {"\\section": 1, "\\subsection": 2, "\\subsubsection": 3, "\\paragraph": 4}
+# Commands whose first N {..} arguments are not prose.
+SKIP_ARGS = {
+    "\\label": 1, "\\ref": 1, "\\eqref": 1, "\\autoref": 1, "\\cref": 1, "\\Cref": 1, "\\pageref": 1,
+    "\\cite": 1, "\\citep": 1, "\\citet": 1, "\\citen": 1, "\\citealp": 1, "\\citeauthor": 1, "\\citeyear": 1,
+    "\\url": 1, "\\href": 1, "\\includegraphics": 1, "\\input": 1, "\\include": 1,
+    "\\bibliography": 1, "\\bibliographystyle": 1, "\\usepackage": 1, "\\documentclass": 1,
+    "\\vspace": 1, "\\hspace": 1, "\\setlength": 2, "\\addtolength": 2, "\\newcommand": 2,
+    "\\renewcommand": 2, "\\color": 1, "\\textcolor": 1, "\\rule": 2, "\\resizebox": 2, "\\scalebox": 1,
+    "\\multirow": 2, "\\multicolumn": 2, "\\graphicspath": 1, "\\hypersetup": 1, "\\cmidrule": 1,
+}
+# Commands whose first {..} argument goes to a specific bucket.
+ARG_BUCKET = {"\\caption": "captions", "\\footnote": "footnotes", "\\title": "title", "\\keywords": "keywords", "\\abstract": "abstract"}
+# Control sequences that separate words.
+BREAKS = {"\\\\", "\\ ", "\\newline", "\\par", "\\quad", "\\qquad", "\\linebreak", "\\item"}
+
+SKIP_ENVS = {
+    "equation", "equation*", "align", "align*", "gather", "gather*", "multline", "multline*",
+    "eqnarray", "eqnarray*", "math", "displaymath", "verbatim", "lstlisting", "thebibliography", "figure", "figure*",
+}
+TABLE_ENVS = {"table", "table*", "tabular", "tabular*", "tabularx", "longtable"}
+# Leading {..} arguments of an environment that are not prose (column specs, widths).
+ENV_ARGS = {"tabular": 1, "tabular*": 2, "tabularx": 2, "longtable": 1, "array": 1, "minipage": 1, "multicols": 1}
+
+_SECTION_SPLIT = re.compile(r"(?m)^[ \t]*(?=\\section\*?\s*[\[{])")
+_PIECES = re.compile(r"\s+|\S+")
+
+SKIP = None  # bucket of groups whose words are not counted
+
+
+@dataclass
+class SectionCount:
+    title: str
+    level: int
+    words: int = 0
+
+
+@dataclass
+class Frame:
+    bucket: str | None
+    env: str | None = None  # set for \begin frames
+    dollar: bool = False  # $..$ math
+    collect: list[str] | None = None  # heading / environment name text
+
+
+@dataclass
+class ChunkCount:
+    buckets: Counter = field(default_factory=Counter)
+    sections: list[SectionCount] = field(default_factory=list)
+
+
+class WordCounter:
+    """Brace-depth state machine over latex_doc tokens."""
+
+    def __init__(self) -> None:
+        self.result = ChunkCount()
+        self.stack: list[Frame] = [Frame("text")]
+        self.pending: list[str | None] = []  # buckets for the next {..} arguments
+        self.pending_env: tuple[str, str] | None = None  # ("begin"|"end", name) awaiting its name group
+        self.opt_ok = False  # a [..] right now is an optional argument
+        self.opt_depth = 0
+        self.counted = False  # current word already counted
+        self.section: SectionCount | None = None
+
+    @property
+    def bucket(self) -> str | None:
+        return self.stack[-1].bucket
+
+    def _add(self, bucket: str | None, text: str) -> None:
+        for piece in _PIECES.findall(text.replace("~", " ")):
+            if piece[0].isspace():
+                self.counted = False
+            elif not self.counted and any(c.isalnum() for c in piece):
+                self.counted = True
+                if bucket == "text" and self.section is not None:
+                    self.section.words += 1
+                if bucket is not None:
+                    self.result.buckets[bucket] += 1
+
+    def _push(self, frame: Frame) -> None:
+        if frame.bucket != self.bucket:
+            self.counted = False
+        self.stack.append(frame)
+
+    def _pop(self) -> Frame | None:
+        if len(self.stack) == 1:
+            return None
+        frame = self.stack.pop()
+        if frame.bucket != self.bucket:
+            self.counted = False
+        return frame
+
+    def _open_env(self, name: str) -> None:
+        if name in SKIP_ENVS:
+            bucket = SKIP
+        elif name in TABLE_ENVS:
+            bucket = "tables"
+        elif name == "abstract":
+            bucket = "abstract"
+        else:
+            bucket = self.bucket
+        self._push(Frame(bucket, env=name))
+        self.pending = [SKIP] * ENV_ARGS.get(name, 0)
+        self.opt_ok = True
+
+    def _close_env(self, name: str) -> None:
+        for k in range(len(self.stack) - 1, 0, -1):
+            if self.stack[k].env == name:
+                while len(self.stack) > k:
+                    self._pop()
+                return
+
+    def feed(self, tokens) -> "WordCounter":
+        for tok in tokens:
+            kind, value = tok.kind, tok.value
+            if self.opt_depth:
+                if kind == "lbrack":
+                    self.opt_depth += 1
+                elif kind == "rbrack":
+                    self.opt_depth -= 1
+                continue
+            if kind == "comment":
+                continue
+            if kind == "text":
+                if self.pending and value.strip():
+                    self.pending = []  # argument omitted
+                if value.strip():
+                    self.opt_ok = False
+                frame = self.stack[-1]
+                if frame.collect is not None:
+                    frame.collect.append(value)
+                self._add(self.bucket, value)
+            elif kind == "lbrack":
+                if self.opt_ok:
+                    self.opt_depth = 1
+                else:
+                    self._add(self.bucket, value)
+            elif kind == "rbrack":
+                self._add(self.bucket, value)
+            elif kind == "bgroup":
+                self.opt_ok = False
+                if self.pending_env is not None:
+                    self._push(Frame(SKIP, collect=[]))
+                elif self.pending:
+                    target = self.pending.pop(0)
+                    collect = [] if target == "headings" else None
+                    self._push(Frame(target, collect=collect))
+                else:
+                    self._push(Frame(self.bucket))
+            elif kind == "egroup":
+                frame = self._pop()
+                if frame is None:
+                    continue
+                if self.pending_env is not None and frame.collect is not None and frame.bucket is SKIP:
+                    action, name = self.pending_env[0], "".join(frame.collect).strip()
+                    self.pending_env = None
+                    if action == "begin":
+                        self._open_env(name)
+                    else:
+                        self._close_env(name)
+                elif frame.bucket == "headings" and frame.collect is not None and self.section is not None:
+                    self.section.title = " ".join("".join(frame.collect).split())
+                    self.opt_ok = False
+                else:
+                    self.opt_ok = bool(self.pending)
+            elif kind == "math":
+                if self.stack[-1].dollar:
+                    self._pop()
+                else:
+                    self._push(Frame(SKIP, dollar=True))
+            elif kind == "cmd":
+                base = value.rstrip("*")
+                if value in ("\\(", "\\["):
+                    self._push(Frame(SKIP, env=value))
+                    continue
+                if value in ("\\)", "\\]"):
+                    self._close_env("\\(" if value == "\\)" else "\\[")
+                    continue
+                if value in BREAKS:
+                    self.counted = False
+                if base in ("\\begin", "\\end"):
+                    self.pending_env = (base[1:], "")
+                elif base in SECTION_LEVELS:
+                    self.section = SectionCount("", SECTION_LEVELS[base])
+                    self.result.sections.append(self.section)
+                    self.pending = ["headings"]
+                elif base in ARG_BUCKET:
+                    self.pending = [ARG_BUCKET[base]]
+                elif base in SKIP_ARGS:
+                    self.pending = [SKIP] * SKIP_ARGS[base]
+                else:
+                    self.pending = []
+                self.opt_ok = value[1:2].isalpha() or value == "\\\\"
+        return self
+
+
+def split_chunks(body: str) -> list[str]:
+    """Body split right before each top-level \\section (chunks start at brace depth 0)."""
+    cuts = [0] + [m.start() for m in _SECTION_SPLIT.finditer(body) if m.start() > 0] + [len(body)]
+    return [body[a:b] for a, b in zip(cuts, cuts[1:]) if b > a]
+
+
+def _body(text: str) -> str:
+    start = text.find("\\begin{document}")
+    start = 0 if start < 0 else start + len("\\begin{document}")
+    end = text.find("\\end{document}", start)
+    return text[start:end if end >= 0 else len(text)]
+
+
+def breakdown(text: str, cache: dict[str, ChunkCount] | None = None, stats: dict | None = None) -> dict:
+    """Word counts of a manuscript's body; ``cache`` (sha1 -> ChunkCount) makes reruns incremental."""
+    merged = ChunkCount()
+    recounted = 0
+    seen = set()
+    for chunk in split_chunks(_body(text)):
+        h = hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+        seen.add(h)
+        cc = cache.get(h) if cache is not None else None
+        if cc is None:
+            cc = WordCounter().feed(tokenize(chunk)).result
+            recounted += 1
+            if cache is not None:
+                cache[h] = cc
+        merged.buckets.update(cc.buckets)
+        merged.sections.extend(cc.sections)
+    if cache is not None:
+        for h in set(cache) - seen:
+            del cache[h]
+    if stats is not None:
+        stats["recounted"] = recounted
+        stats["chunks"] = len(seen)
+    return _result(merged)
+
+
+def doc_breakdown(doc: Manuscript) -> dict:
+    """Same as ``breakdown`` over the document's cached tokens and body span (no re-lexing)."""
+    start, end = doc.body_span
+    toks = doc.tokens
+    i = bisect.bisect_left(toks, start, key=lambda t: t.start)
+    j = bisect.bisect_left(toks, end, key=lambda t: t.start)
+    return _result(WordCounter().feed(toks[i:j]).result)
+
+
+def _result(merged: ChunkCount) -> dict:
+    sections = []
+    for n, s in enumerate(merged.sections):
+        total = s.words
+        for nxt in merged.sections[n + 1:]:
+            if nxt.level <= s.level:
+                break
+            total += nxt.words
+        sections.append({"title": s.title, "level": s.level, "words": s.words, "total": total})
+    counts = {b: merged.buckets.get(b, 0) for b in BUCKETS}
+    counts["total"] = sum(counts.values())
+    return {"counts": counts, "sections": sections}
+
+
+def count_words(doc):
+    """Total words counted in the body (text, abstract, headings, captions, tables, footnotes)."""
+    return doc_breakdown(doc)["counts"]["total"]
+
+
+def print_breakdown(path, result):
+    c = result["counts"]
+    print(f"{path.name}: total {c['total']} palavras")
+    print(f"  texto {c['text']} | abstract {c['abstract']} | titulos {c['headings']} | "
+          f"legendas {c['captions']} | tabelas {c['tables']} | notas {c['footnotes']} | "
+          f"titulo {c['title']} | keywords {c['keywords']}")
+    for s in result["sections"]:
+        indent = "  " * s["level"]
+        extra = f" (com subsecoes: {s['total']})" if s["total"] != s["words"] else ""
+        print(f"  {indent}{s['title'][:60]:<{64 - len(indent)}} {s['words']:>6}{extra}")
+
+
+def watch(path, as_json, interval):
+    cache: dict[str, ChunkCount] = {}
+    last = None
+    print(f"Observando {path} (Ctrl+C para sair)")
+    try:
+        while True:
+            try:
+                stamp = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                stamp = None
+            if stamp is not None and stamp != last:
+                last = stamp
+                t0 = time.perf_counter()
+                stats = {}
+                result = breakdown(path.read_text(encoding="utf-8", errors="ignore"), cache, stats)
+                ms = (time.perf_counter() - t0) * 1000
+                if as_json:
+                    print(json.dumps({"file": str(path), "ms": round(ms, 1), **stats, **result}, ensure_ascii=False), flush=True)
+                else:
+                    print(f"\n[{time.strftime('%H:%M:%S')}] {stats['recounted']}/{stats['chunks']} blocos recontados em {ms:.1f} ms")
+                    print_breakdown(path, result)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Contagem de palavras por secao de manuscritos LaTeX.")
+    ap.add_argument("tex", nargs="*", type=Path, help="manuscritos (padrao: */submission/Manuscript.tex)")
+    ap.add_argument("--json", action="store_true", help="saida JSON")
+    ap.add_argument("--watch", action="store_true", help="reconta a cada gravacao do (primeiro) arquivo")
+    ap.add_argument("--interval", type=float, default=0.5, help="intervalo de polling do --watch (s)")
+    args = ap.parse_args()
+
+    paths = args.tex or [default_manuscript()]
+    if args.watch:
+        watch(paths[0], args.json, args.interval)
+        return
+    results = {}
+    for p in paths:
+        doc = Manuscript(p)
+        if '\\begin{document}' not in doc.text:
+            print(f'{p}: arquivo não contém \\begin{{document}} e \\end{{document}}', file=sys.stderr)
+            continue
+        results[str(p)] = doc_breakdown(doc)
+        if not args.json:
+            print_breakdown(p, results[str(p)])
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
 
-with open(r'c:\Users\vidal\OneDrive\Documentos\13 - CLONEGIT\artigo_1_catuxe\8-REVISÃO_ESCOPO_SAT\latex\sn-article.tex', 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# Extract text between \begin{document} and \end{document}
-match = re.search(r'\\begin\{document\}(.*?)\\end\{document\}', content, re.DOTALL)
-if match:
-    text = match.group(1)
-    
-    # Remove comments
-    text = re.sub(r'(?m)^%.*$', '', text)
-    
-    # Remove LaTeX commands with arguments
-    text = re.sub(r'\\[a-zA-Z]+\*?\{[^{}]*\}', '', text)
-    text = re.sub(r'\\[a-zA-Z]+\*?\[[^\]]*\]', '', text)
-    
-    # Remove remaining LaTeX commands
-    text = re.sub(r'\\[a-zA-Z]+\*?', '', text)
-    
-    # Remove special characters and symbols
-    text = re.sub(r'[\{\}\[\]$@&%]', '', text)
-    
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    # Count words
-    words = [w for w in text.split() if w.strip()]
-    print(f'Total de palavras no texto principal: {len(words)}')
-else:
-    print('Arquivo não contém \\begin{document} e \\end{document}')
+if __name__ == '__main__':
+    main()
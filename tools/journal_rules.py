@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pacotes de regras por periodico (rule_packs/*.json) avaliados sobre o indice
+LaTeX compartilhado (latex_index.py).
+
+Cada pacote declara suas regras como dados:
+
+  {"id": "abstract_words", "group": "1. ABSTRACT", "check": "word_limit",
+   "params": {"target": "abstract", "max": 300}, "severity": "erro",
+   "ok": "Abstract: {n} palavras (limite {max})",
+   "fail": "Abstract: {n} palavras EXCEDE limite de {max}"}
+
+- "check" e um dos verificadores registrados em CHECKS (@check);
+- "severity" (erro | aviso | info) e o status quando a regra falha;
+- "ok"/"fail"/"missing" sao formatados com os valores que o verificador
+  devolve mais os proprios "params"; mensagem vazia = nao reportar.
+
+Ao carregar, cada regra e compilada (verificador resolvido, parametros
+normalizados, frases em minusculas) e as consultas ao texto sao memorizadas
+por manuscrito em Facts, entao N pacotes x M versoes custam um tokenizer por
+versao e uma busca por frase distinta. Os resultados ficam em
+_cache/rules/<sha do manuscrito>/<pacote>.json e so sao recalculados quando o
+manuscrito, o pacote ou este motor mudam.
+
+Uso:
+  python tools/journal_rules.py                           # Manuscript.tex x todos os pacotes
+  python tools/journal_rules.py --packs asde catena A.tex B.tex
+  python tools/journal_rules.py --all --no-cache -v
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable
+
+from latex_doc import Manuscript, default_manuscript
+
+TOOLS_DIR = Path(__file__).resolve().parent
+PACK_DIR = TOOLS_DIR / "rule_packs"
+CACHE_DIR = TOOLS_DIR / "_cache" / "rules"
+SEVERITIES = ("erro", "aviso", "info")
+
+
+@dataclass(frozen=True)
+class Outcome:
+    rule: str
+    group: str
+    status: str  # ok | erro | aviso | info
+    message: str
+
+
+# ---------------------------------------------------------------------------
+# Fatos por manuscrito (memorizados e compartilhados entre pacotes)
+# ---------------------------------------------------------------------------
+
+
+def strip_commands(raw: str) -> str:
+    txt = re.sub(r"\\[a-zA-Z]+(\[[^\]]*\])?(\{[^}]*\})?", " ", raw)
+    txt = re.sub(r"[\$\{\}\\\%\~]", " ", txt)
+    return re.sub(r"\s+", " ", txt).strip()
+
+
+class Facts:
+    def __init__(self, doc: Manuscript, word_cache: dict | None = None) -> None:
+        self.doc = doc
+        self.ix = doc.index
+        self.word_cache = word_cache
+        self._scopes: dict[str, str | None] = {}
+        self._hits: dict[tuple[str, str, bool], bool] = {}
+
+    def scope(self, name: str) -> str | None:
+        """Text of a scope: text | body | abstract | title | keywords | section:<prefix>."""
+        if name not in self._scopes:
+            ix = self.ix
+            if name == "text":
+                value = ix.text
+            elif name == "body":
+                value = ix.body
+            elif name == "abstract":
+                value = ix.abstract
+            elif name in ("title", "keywords"):
+                value = ix.first_arg("\\" + name)
+            elif name.startswith("section:"):
+                prefix = name.split(":", 1)[1].lower()
+                sec = next((s for s in ix.sections if s.title.lower().startswith(prefix)), None)
+                value = None if sec is None else ix.text[sec.start:sec.end]
+            else:
+                raise ValueError(f"escopo desconhecido: {name}")
+            self._scopes[name] = value
+        return self._scopes[name]
+
+    def has(self, scope: str, phrase: str, case: bool = False) -> bool:
+        """Memoized substring lookup; phrases must already be lowercased when case=False."""
+        key = (scope, phrase, case)
+        if key not in self._hits:
+            if scope == "text" and not case:
+                hay = self.ix.lower
+            else:
+                hay = self.scope(scope) or ""
+                hay = hay if case else hay.lower()
+            self._hits[key] = phrase in hay
+        return self._hits[key]
+
+    @cached_property
+    def section_titles(self) -> list[str]:
+        return [t.lower() for t in self.ix.section_titles()]
+
+    def has_section(self, prefixes: list[str]) -> bool:
+        return any(t.startswith(p) for t in self.section_titles for p in prefixes)
+
+    @cached_property
+    def body_words(self) -> int:
+        from count_words import breakdown
+
+        return breakdown(self.doc.text, self.word_cache)["counts"]["total"]
+
+    @cached_property
+    def figures(self) -> list[str]:
+        ix = self.ix
+        return sorted((k for k in ix.labels if k.startswith("fig:") and ix.in_body(ix.labels[k])), key=ix.labels.get)
+
+    @cached_property
+    def tables(self) -> list[str]:
+        ix = self.ix
+        return [k for k, off in ix.labels.items() if k.startswith("tab:") and ix.in_body(off)]
+
+
+# ---------------------------------------------------------------------------
+# Verificadores. Cada um recebe (Facts, params) e devolve uma lista de
+# (estado, valores): estado True = ok, False = falha, None = "missing"
+# (alvo nao encontrado). Lista vazia = regra nao se aplica.
+# ---------------------------------------------------------------------------
+
+Result = list[tuple[bool | None, dict[str, Any]]]
+CHECKS: dict[str, Callable[[Facts, dict], Result]] = {}
+# Normalizacao dos parametros feita uma vez, ao compilar o pacote.
+PREPARE: dict[str, Callable[[dict], dict]] = {}
+# Partes do indice (FEATURES) de que cada verificador depende; usado pelo
+# modo watch para reavaliar so as regras afetadas por uma edicao.
+DEPENDS: dict[str, Callable[[dict], set[str]]] = {}
+
+
+def check(name: str, prepare: Callable[[dict], dict] | None = None, deps: Any = ()):
+    def deco(func):
+        CHECKS[name] = func
+        if prepare:
+            PREPARE[name] = prepare
+        DEPENDS[name] = deps if callable(deps) else (lambda p, d=frozenset(deps): set(d))
+        return func
+    return deco
+
+
+def _scope_deps(p: dict) -> set[str]:
+    scope = p.get("scope") or p.get("target", "text")
+    if scope in ("text", "body"):
+        return {"phrases"}  # decided by the edited window, see rule_affected()
+    if scope.startswith("section:"):
+        return {"sections", "edit"}
+    return {scope}
+
+
+def _lower_phrases(p: dict) -> dict:
+    p = dict(p)
+    p.setdefault("scope", "text")
+    p.setdefault("case", False)
+    if not p["case"]:
+        p["any"] = [s.lower() for s in p["any"]]
+    return p
+
+
+def _lower_prefixes(p: dict) -> dict:
+    return {**p, **{k: [s.lower() for s in p[k]] for k in ("prefixes", "a", "b") if k in p}}
+
+
+@check("contains", _lower_phrases, deps=_scope_deps)
+def _contains(f: Facts, p: dict) -> Result:
+    if p["scope"] != "text" and f.scope(p["scope"]) is None:
+        return []
+    return [(any(f.has(p["scope"], s, p["case"]) for s in p["any"]), {})]
+
+
+@check("absent", _lower_phrases, deps=_scope_deps)
+def _absent(f: Facts, p: dict) -> Result:
+    if p["scope"] != "text" and f.scope(p["scope"]) is None:
+        return []
+    found = [s for s in p["any"] if f.has(p["scope"], s, p["case"])]
+    return [(not found, {"found": ", ".join(found)})]
+
+
+@check("word_limit", deps=lambda p: {"words"} if p["target"] == "body" else {p["target"]})
+def _word_limit(f: Facts, p: dict) -> Result:
+    if p["target"] == "body":
+        n = f.body_words
+    else:
+        raw = f.scope(p["target"])
+        if raw is None:
+            return []
+        n = len(strip_commands(raw).split())
+    return [(n <= p["max"], {"n": n})]
+
+
+@check("list_count", deps=_scope_deps)
+def _list_count(f: Facts, p: dict) -> Result:
+    raw = f.scope(p["target"])
+    if raw is None:
+        return []
+    n = len([k for k in raw.split(p.get("sep", ",")) if k.strip()])
+    return [(p.get("min", 0) <= n <= p.get("max", n), {"n": n})]
+
+
+@check("abbreviations", deps=lambda p: {p.get("scope", "abstract")})
+def _abbreviations(f: Facts, p: dict) -> Result:
+    raw = f.scope(p.get("scope", "abstract"))
+    if raw is None:
+        return []
+    found = {a for a in re.findall(r"\b[A-Z]{2,}\b", raw) if a not in set(p.get("allow", []))}
+    return [(not found, {"found": found})]
+
+
+@check("no_citations_in", deps=("abstract", "citations"))
+def _no_citations_in(f: Facts, p: dict) -> Result:
+    span = f.ix.abstract_span if p.get("scope", "abstract") == "abstract" else None
+    if span is None:
+        return []
+    return [(not any(span[0] <= c.start < span[1] for c in f.ix.citations), {})]
+
+
+@check("option_present", deps=("preamble", "commands"))
+def _option_present(f: Facts, p: dict) -> Result:
+    ix = f.ix
+    opts = set(ix.class_options) | set(ix.packages)
+    hit = any(o in opts for o in p.get("any", [])) or any(ix.command_offsets.get(c) for c in p.get("commands", []))
+    return [(hit, {})]
+
+
+@check("option_absent", deps=("preamble",))
+def _option_absent(f: Facts, p: dict) -> Result:
+    ix = f.ix
+    opts = set(ix.class_options)
+    for pkg in p.get("packages", []):
+        opts |= set(ix.packages.get(pkg, []))
+    return [(not any(o in opts for o in p["any"]), {})]
+
+
+@check("section_present", _lower_prefixes, deps=("sections",))
+def _section_present(f: Facts, p: dict) -> Result:
+    return [(f.has_section(p["prefixes"]), {})]
+
+
+@check("sections_combined", _lower_prefixes, deps=("sections",))
+def _sections_combined(f: Facts, p: dict) -> Result:
+    """Fails when sections a and b both exist separately (and no heading combines them)."""
+    combined = any(any(a in t for a in p["a"]) and any(b in t for b in p["b"]) for t in f.section_titles)
+    return [(combined or not (f.has_section(p["a"]) and f.has_section(p["b"])), {})]
+
+
+@check("command_absent", deps=("commands", "sections"))
+def _command_absent(f: Facts, p: dict) -> Result:
+    ix = f.ix
+    hit = any(ix.in_body(off) for c in p["commands"] for off in ix.command_offsets.get(c, []))
+    titles = " ".join(ix.section_titles())
+    hit = hit or any(t in titles for t in p.get("section_titles", []))
+    return [(not hit, {})]
+
+
+@check("env_absent", deps=("envs",))
+def _env_absent(f: Facts, p: dict) -> Result:
+    return [(not f.ix.envs_named(*p["envs"]), {})]
+
+
+@check("graphics_present", deps=("floats",))
+def _graphics_present(f: Facts, p: dict) -> Result:
+    return [(any(any(s in path for s in p["any"]) for path, _ in f.ix.graphics), {})]
+
+
+@check("caption_contains", deps=("floats",))
+def _caption_contains(f: Facts, p: dict) -> Result:
+    """Caption of the float holding one of ``graphics`` (or starting with ``caption_prefix``)."""
+    ix = f.ix
+    offs = [off for path, off in ix.graphics if any(s in path for s in p.get("graphics", []))]
+    cap = None
+    for env in ix.envs_named("figure", "figure*"):
+        if any(env.start <= off < env.end for off in offs):
+            cap = ix.caption_in(env)
+            break
+    if cap is None and p.get("caption_prefix"):
+        cap = next((ix.text[s:e] for s, e in ix.captions if ix.text[s:e].startswith(p["caption_prefix"])), None)
+    if cap is None:
+        return [(None, {})]
+    return [(any(s.lower() in cap.lower() for s in p["any"]), {})]
+
+
+@check("figure_caption_contains", deps=("floats",))
+def _figure_caption_contains(f: Facts, p: dict) -> Result:
+    """Some figure/table caption or label mentions one of the phrases (e.g. a PRISMA diagram)."""
+    ix = f.ix
+    texts = [ix.text[s:e].lower() for s, e in ix.captions] + [k.lower() for k in ix.labels]
+    return [(any(s.lower() in t for t in texts for s in p["any"]), {})]
+
+
+@check("figures_cited_before_float", deps=("refs",))
+def _figures_cited_before_float(f: Facts, p: dict) -> Result:
+    ix = f.ix
+    out: Result = []
+    for k in f.figures:
+        ref, lab = ix.refs.get(k), ix.labels[k]
+        if ref is None or not ix.in_body(ref):
+            out.append((None, {"label": k}))
+        else:
+            vals = {"label": k, "ref": ix.line_of(ref), "lab": ix.line_of(lab)}
+            out.append((vals["ref"] < vals["lab"], vals))
+    return out
+
+
+@check("float_count", deps=("floats",))
+def _float_count(f: Facts, p: dict) -> Result:
+    figs, tabs = len(f.figures), len(f.tables)
+    return [(figs + tabs <= p.get("max", figs + tabs), {"figs": figs, "tabs": tabs, "total": figs + tabs})]
+
+
+@check("min_count", deps=("floats", "citations"))
+def _min_count(f: Facts, p: dict) -> Result:
+    counts = {"figures": len(f.figures), "tables": len(f.tables), "citations": len(f.ix.citations)}
+    n = counts[p["target"]]
+    return [(n >= p["min"], {"n": n})]
+
+
+@check("reminder", deps=())
+def _reminder(f: Facts, p: dict) -> Result:
+    return [(False, {})]
+
+
+# ---------------------------------------------------------------------------
+# Impressoes digitais do indice, para decidir o que uma edicao afetou
+# ---------------------------------------------------------------------------
+
+FEATURES: dict[str, Callable[[Any], Any]] = {
+    "title": lambda ix: ix.first_arg("\\title"),
+    "keywords": lambda ix: ix.first_arg("\\keywords"),
+    "abstract": lambda ix: ix.abstract,
+    "sections": lambda ix: tuple((s.level, s.title) for s in ix.sections),
+    "preamble": lambda ix: (tuple(ix.class_options), tuple(sorted((k, tuple(v)) for k, v in ix.packages.items()))),
+    "commands": lambda ix: tuple(sorted(k for k, offs in ix.command_offsets.items() if any(ix.in_body(o) for o in offs))),
+    "envs": lambda ix: tuple(e.name for e in ix.envs if ix.in_body(e.start)),
+    "floats": lambda ix: (
+        tuple(ix.labels),
+        tuple(ix.text[s:e] for s, e in ix.captions),
+        tuple(p for p, _ in ix.graphics),
+    ),
+    "refs": lambda ix: tuple((k, ix.line_of(o)) for k, o in [*ix.refs.items(), *ix.labels.items()]),
+    "citations": lambda ix: tuple(c.keys for c in ix.citations),
+}
+
+
+def fingerprints(ix) -> dict[str, Any]:
+    return {name: f(ix) for name, f in FEATURES.items()}
+
+
+def changed_features(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    changed = {name for name in FEATURES if old.get(name) != new.get(name)}
+    # Any edit can change the body word count or a section-scoped phrase.
+    return changed | {"words", "edit"}
+
+
+def rule_affected(rule: "Rule", changed: set[str], old_window: str, new_window: str) -> bool:
+    """Whether ``rule`` must be re-evaluated after an edit.
+
+    Phrase rules over the whole text/body only change when one of their
+    phrases could overlap the edited window (old or new text around it).
+    """
+    deps = DEPENDS[rule.check](rule.params)
+    if deps & changed:
+        return True
+    if "phrases" in deps:
+        phrases = rule.params.get("any", [])
+        if rule.params.get("case"):
+            return any(p in old_window or p in new_window for p in phrases)
+        ow, nw = old_window.lower(), new_window.lower()
+        return any(p in ow or p in nw for p in phrases)
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Pacotes
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Rule:
+    id: str
+    group: str
+    check: str
+    params: dict = field(default_factory=dict)
+    severity: str = "erro"
+    ok: str = ""
+    fail: str = ""
+    missing: str = ""
+    missing_severity: str = "aviso"
+
+    def evaluate(self, facts: Facts) -> list[Outcome]:
+        out = []
+        for state, values in CHECKS[self.check](facts, self.params):
+            if state is None:
+                status, template = self.missing_severity, self.missing
+            elif state:
+                status, template = ("info" if self.severity == "info" else "ok"), self.ok
+            else:
+                status, template = self.severity, self.fail
+            if template:
+                out.append(Outcome(self.id, self.group, status, template.format(**self.params, **values)))
+        return out
+
+
+@dataclass
+class RulePack:
+    name: str
+    title: str
+    source: str
+    rules: list[Rule]
+    sha256: str
+
+    def evaluate(self, facts: Facts) -> list[Outcome]:
+        return [o for r in self.rules for o in r.evaluate(facts)]
+
+
+def available_packs() -> list[str]:
+    return sorted(p.stem for p in PACK_DIR.glob("*.json"))
+
+
+def load_pack(name: str | Path) -> RulePack:
+    """Load and compile a pack by name (rule_packs/<name>.json) or path."""
+    path = Path(name) if str(name).endswith(".json") else PACK_DIR / f"{name}.json"
+    raw = path.read_bytes()
+    data = json.loads(raw.decode("utf-8"))
+    rules = []
+    for r in data["rules"]:
+        rule = Rule(**r)
+        if rule.check not in CHECKS:
+            raise ValueError(f"{path.name}: regra {rule.id!r} usa verificador desconhecido {rule.check!r}")
+        if rule.severity not in SEVERITIES or rule.missing_severity not in SEVERITIES:
+            raise ValueError(f"{path.name}: regra {rule.id!r} com severidade invalida")
+        if rule.check in PREPARE:
+            rule.params = PREPARE[rule.check](rule.params)
+        rules.append(rule)
+    return RulePack(path.stem, data.get("title", path.stem), data.get("source", ""), rules, hashlib.sha256(raw).hexdigest())
+
+
+def _engine_hash() -> str:
+    h = hashlib.sha256()
+    for name in ("journal_rules.py", "latex_index.py", "latex_doc.py", "count_words.py"):
+        h.update((TOOLS_DIR / name).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def run_packs(doc: Manuscript, packs: list[RulePack], use_cache: bool = True) -> dict[str, list[Outcome]]:
+    """Evaluate every pack on one manuscript, reusing cached results per (manuscript, pack)."""
+    doc_hash = hashlib.sha256(doc.text.encode("utf-8")).hexdigest()[:24]
+    engine = _engine_hash() if use_cache else ""
+    results: dict[str, list[Outcome]] = {}
+    facts = None
+    for pack in packs:
+        cache_file = CACHE_DIR / doc_hash / f"{pack.name}.json"
+        key = f"{engine}:{pack.sha256}"
+        if use_cache and cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding="utf-8"))
+                if cached.get("key") == key:
+                    results[pack.name] = [Outcome(**o) for o in cached["outcomes"]]
+                    continue
+            except (OSError, ValueError, TypeError):
+                pass
+        facts = facts or Facts(doc)
+        outcomes = pack.evaluate(facts)
+        results[pack.name] = outcomes
+        if use_cache:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"key": key, "outcomes": [asdict(o) for o in outcomes]}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(cache_file)
+    return results
+
+
+def print_outcomes(outcomes: list[Outcome]) -> None:
+    group = None
+    for o in outcomes:
+        if o.group != group:
+            group = o.group
+            print("\n" + "=" * 60)
+            print(group)
+            print("=" * 60)
+        print(f"  [{o.status.upper()}] {o.message}")
+
+
+def summarize(outcomes: list[Outcome]) -> dict[str, int]:
+    counts = {"erro": 0, "aviso": 0, "ok": 0}
+    for o in outcomes:
+        if o.status in counts:
+            counts[o.status] += 1
+    return counts
+
+
+def main() -> None:
+    from latex_tools import discover_all
+
+    ap = argparse.ArgumentParser(description="Avalia pacotes de regras de periodicos sobre manuscritos LaTeX.")
+    ap.add_argument("tex", nargs="*", type=Path, help="manuscritos (padrao: */submission/Manuscript.tex)")
+    ap.add_argument("--packs", nargs="+", default=None, help=f"pacotes (padrao: todos; disponiveis: {', '.join(available_packs())})")
+    ap.add_argument("--all", action="store_true", help="todos os manuscritos em submission/ e submission_old/")
+    ap.add_argument("--no-cache", action="store_true", help="ignora/nao grava o cache de resultados")
+    ap.add_argument("--verbose", "-v", action="store_true", help="lista cada regra")
+    args = ap.parse_args()
+
+    packs = [load_pack(p) for p in (args.packs or available_packs())]
+    paths = list(args.tex) + ([p for p in discover_all() if p not in args.tex] if args.all else [])
+    paths = paths or [default_manuscript()]
+
+    print(f"{'manuscrito':<40}" + "".join(f"{p.name:>24}" for p in packs))
+    falhou = False
+    for path in paths:
+        results = run_packs(Manuscript(path), packs, use_cache=not args.no_cache)
+        cells = []
+        for p in packs:
+            c = summarize(results[p.name])
+            falhou = falhou or c["erro"] > 0
+            cells.append(f"{c['erro']}E/{c['aviso']}A/{c['ok']}OK")
+        print(f"{path.parent.name + '/' + path.name:<40}" + "".join(f"{c:>24}" for c in cells))
+        if args.verbose:
+            for p in packs:
+                print(f"\n### {path.name} x {p.title}")
+                print_outcomes(results[p.name])
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manuscrito LaTeX carregado uma unica vez e compartilhado pelas ferramentas
+(citation_validator, audit_asde, count_words, latex_tools).
+
+O texto e lido do disco uma vez e convertido em um fluxo de tokens
+(comentario, comando, chaves, colchetes, math, texto) com offsets; as
+ferramentas consultam esse fluxo em vez de reler/re-varrer o arquivo.
+
+Tambem localiza os arquivos padrao do projeto: */submission/Manuscript.tex e
+o referencias.bib ao lado dele.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Ordem importa: "\%" vira comando antes de "%" ser lido como comentario.
+_TOKEN_RE = re.compile(
+    r"(?P<comment>%[^\n]*)"
+    r"|(?P<cmd>\\(?:[A-Za-z@]+\*?|.))"
+    r"|(?P<bgroup>\{)"
+    r"|(?P<egroup>\})"
+    r"|(?P<lbrack>\[)"
+    r"|(?P<rbrack>\])"
+    r"|(?P<math>\$\$?)"
+    r"|(?P<text>[^\\{}\[\]$%]+)",
+    re.DOTALL,
+)
+
+
+class Token(NamedTuple):
+    kind: str  # comment | cmd | bgroup | egroup | lbrack | rbrack | math | text
+    value: str
+    start: int
+    end: int
+
+
+def tokenize(text: str, offset: int = 0) -> list[Token]:
+    return [Token(m.lastgroup, m.group(), m.start() + offset, m.end() + offset) for m in _TOKEN_RE.finditer(text)]
+
+
+@dataclass(frozen=True)
+class Edit:
+    """One contiguous change: old[start:old_end] was replaced by new[start:new_end]."""
+
+    start: int
+    old_end: int
+    new_end: int
+
+    @property
+    def delta(self) -> int:
+        return self.new_end - self.old_end
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff_span(old: str, new: str) -> Edit | None:
+    """Smallest single span that differs between ``old`` and ``new`` (None if equal)."""
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    pre = _common_prefix(old, new, limit)
+    # Common suffix, without overlapping the prefix.
+    lo, hi = 0, limit - pre
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return Edit(pre, len(old) - lo, len(new) - lo)
+
+
+def find_sat_root(repo_root: Path = REPO_ROOT) -> Path:
+    hit = next(iter(sorted(repo_root.glob("*/submission/Manuscript.tex"))), None)
+    if hit is None:
+        raise FileNotFoundError(f"Nao encontrei */submission/Manuscript.tex abaixo de: {repo_root}")
+    return hit.parent.parent
+
+
+def default_manuscript() -> Path:
+    return find_sat_root() / "submission" / "Manuscript.tex"
+
+
+def default_bib(tex_path: Path) -> Path:
+    """referencias.bib ao lado do manuscrito (ou o primeiro .bib da pasta)."""
+    folder = Path(tex_path).parent
+    bib = folder / "referencias.bib"
+    if bib.exists():
+        return bib
+    return next(iter(sorted(folder.glob("*.bib"))), bib)
+
+
+class Manuscript:
+    def __init__(self, path: str | Path, text: str | None = None) -> None:
+        self.path = Path(path)
+        self.text = text if text is not None else self.path.read_text(encoding="utf-8", errors="ignore")
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def update(self, new_text: str) -> tuple[Edit | None, int]:
+        """Replace the text, re-lexing only the changed region of the token stream.
+
+        Returns the edit and how many tokens were lexed again. Derived views
+        (lowercase text, body span, line table, index) are rebuilt on demand.
+        """
+        edit = diff_span(self.text, new_text)
+        if edit is None:
+            return None, 0
+        relexed = 0
+        if "tokens" in self.__dict__:
+            old = self.tokens
+            starts = [t.start for t in old]
+            # One token back: an edit at a boundary may merge with the previous token.
+            i = max(bisect.bisect_right(starts, edit.start) - 2, 0)
+            lex_from = old[i].start if old else 0
+            fresh: list[Token] = []
+            tail: list[Token] = []
+            for m in _TOKEN_RE.finditer(new_text, lex_from):
+                pos = m.start()
+                if pos >= edit.new_end:
+                    # Past the edit the remaining text is identical, so once we
+                    # reach an old token boundary the old tokens can be reused.
+                    k = bisect.bisect_left(starts, pos - edit.delta)
+                    if k < len(old) and starts[k] == pos - edit.delta:
+                        d = edit.delta
+                        tail = [Token(t.kind, t.value, t.start + d, t.end + d) for t in old[k:]] if d else old[k:]
+                        break
+                fresh.append(Token(m.lastgroup, m.group(), pos, m.end()))
+            relexed = len(fresh)
+            self.__dict__["tokens"] = old[:i] + fresh + tail
+        self.text = new_text
+        for key in ("lower", "_line_starts", "body_span", "index"):
+            self.__dict__.pop(key, None)
+        return edit, relexed
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> list[Token]:
+        return tokenize(self.text)
+
+    @cached_property
+    def index(self):
+        """Structural index (sections, labels, refs, envs, ...), see latex_index.py."""
+        from latex_index import build_index
+
+        return build_index(self)
+
+    @cached_property
+    def _line_starts(self) -> list[int]:
+        return [0] + [m.end() for m in re.finditer("\n", self.text)]
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect.bisect_right(self._line_starts, offset)
+
+    @cached_property
+    def body_span(self) -> tuple[int, int]:
+        """Offsets of the text between \\begin{document} and \\end{document}."""
+        start, end = 0, len(self.text)
+        for i, tok in enumerate(self.tokens):
+            if tok.kind == "cmd" and tok.value in ("\\begin", "\\end"):
+                arg = self.arg_text(i)
+                if arg == "document":
+                    if tok.value == "\\begin":
+                        start = self.tokens[self.group_end(self.next_group(i))].end
+                    else:
+                        end = tok.start
+        return start, end
+
+    @property
+    def body(self) -> str:
+        s, e = self.body_span
+        return self.text[s:e]
+
+    # ---- navigation over the token stream ----
+
+    def next_group(self, i: int, optional: bool = True) -> int:
+        """Index of the '{' opening the next argument of token ``i`` (or -1).
+
+        Optional [..] arguments and whitespace between them are skipped.
+        """
+        toks = self.tokens
+        j = i + 1
+        while j < len(toks):
+            t = toks[j]
+            if t.kind == "bgroup":
+                return j
+            if t.kind == "text" and not t.value.strip():
+                j += 1
+            elif t.kind == "lbrack" and optional:
+                depth = 0
+                while j < len(toks):
+                    if toks[j].kind == "lbrack":
+                        depth += 1
+                    elif toks[j].kind == "rbrack":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    j += 1
+                j += 1
+            else:
+                return -1
+        return -1
+
+    def group_end(self, i: int) -> int:
+        """Index of the '}' matching the '{' at token ``i``."""
+        toks = self.tokens
+        depth = 0
+        for j in range(i, len(toks)):
+            k = toks[j].kind
+            if k == "bgroup":
+                depth += 1
+            elif k == "egroup":
+                depth -= 1
+                if depth == 0:
+                    return j
+        return len(toks) - 1
+
+    def arg_span(self, i: int) -> tuple[int, int] | None:
+        """Character span (without braces) of the first {..} argument of token ``i``."""
+        g = self.next_group(i)
+        if g < 0:
+            return None
+        return self.tokens[g].end, self.tokens[self.group_end(g)].start
+
+    def arg_text(self, i: int) -> str | None:
+        span = self.arg_span(i)
+        return None if span is None else self.text[span[0]:span[1]]
+
+    def commands(self, *names: str) -> Iterator[tuple[int, Token]]:
+        wanted = set(names)
+        for i, tok in enumerate(self.tokens):
+            if tok.kind == "cmd" and (not wanted or tok.value in wanted):
+                yield i, tok
+
+    def first_arg(self, name: str) -> str | None:
+        """Argument of the first ``name`` command (e.g. '\\abstract')."""
+        for i, _ in self.commands(name):
+            return self.arg_text(i)
+        return None
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indice estrutural de um manuscrito LaTeX, construido em uma unica passada
+sobre o fluxo de tokens de latex_doc.Manuscript.
+
+Registra, com offsets de caractere: secoes, labels, refs, ambientes
+(\\begin/\\end), footnotes, citacoes, legendas, \\includegraphics, opcoes de
+\\documentclass/\\usepackage e o span do abstract. As regras de auditoria
+consultam este indice em vez de varrer o texto de novo.
+
+Uso:
+  idx = Manuscript(path).index
+  idx.sections, idx.labels["fig:prisma"], idx.envs_named("figure"), ...
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from latex_doc import Manuscript
+
+SECTION_LEVELS = {
+    "\\part": 0,
+    "\\chapter": 1,
+    "\\section": 2,
+    "\\subsection": 3,
+    "\\subsubsection": 4,
+    "\\paragraph": 5,
+}
+REF_COMMANDS = {"\\ref", "\\autoref", "\\eqref", "\\cref", "\\Cref", "\\pageref"}
+CITE_COMMANDS = {"\\cite", "\\citep", "\\citet", "\\citen", "\\citealp", "\\citeauthor", "\\citeyear"}
+# Commands whose arguments are read while indexing (others are only located).
+INDEXED_COMMANDS = frozenset(SECTION_LEVELS) | REF_COMMANDS | CITE_COMMANDS | {
+    "\\begin", "\\end", "\\label", "\\caption", "\\includegraphics", "\\footnote",
+    "\\documentclass", "\\usepackage", "\\abstract", "\\keywords", "\\title",
+}
+
+
+@dataclass
+class Section:
+    level: int
+    title: str
+    starred: bool
+    start: int
+    end: int = -1  # start of the next section of same or higher level
+
+
+@dataclass
+class Env:
+    name: str
+    start: int  # offset of \begin
+    end: int = -1  # offset just past \end{name}
+    content_start: int = -1
+
+
+@dataclass
+class Citation:
+    command: str
+    keys: tuple[str, ...]
+    start: int
+
+
+@dataclass
+class LatexIndex:
+    text: str
+    lower: str
+    body_span: tuple[int, int]
+    line_starts: list[int]
+    sections: list[Section] = field(default_factory=list)
+    labels: dict[str, int] = field(default_factory=dict)  # first definition
+    refs: dict[str, int] = field(default_factory=dict)  # first reference
+    envs: list[Env] = field(default_factory=list)
+    footnotes: list[int] = field(default_factory=list)
+    citations: list[Citation] = field(default_factory=list)
+    captions: list[tuple[int, int]] = field(default_factory=list)
+    graphics: list[tuple[str, int]] = field(default_factory=list)
+    class_options: list[str] = field(default_factory=list)
+    packages: dict[str, list[str]] = field(default_factory=dict)
+    abstract_span: tuple[int, int] | None = None
+    # command name -> character spans of its first {..} argument, in order
+    args: dict[str, list[tuple[int, int]]] = field(default_factory=lambda: defaultdict(list))
+    command_offsets: dict[str, list[int]] = field(default_factory=lambda: defaultdict(list))
+
+    @property
+    def body(self) -> str:
+        s, e = self.body_span
+        return self.text[s:e]
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def in_body(self, offset: int) -> bool:
+        return self.body_span[0] <= offset < self.body_span[1]
+
+    def span_text(self, span: tuple[int, int] | None) -> str | None:
+        return None if span is None else self.text[span[0]:span[1]]
+
+    def first_arg(self, command: str) -> str | None:
+        spans = self.args.get(command)
+        return self.text[spans[0][0]:spans[0][1]] if spans else None
+
+    @property
+    def abstract(self) -> str | None:
+        return self.span_text(self.abstract_span)
+
+    def envs_named(self, *names: str, body_only: bool = True) -> list[Env]:
+        return [e for e in self.envs if e.name in names and (not body_only or self.in_body(e.start))]
+
+    def section_titles(self, level: int | None = None) -> list[str]:
+        return [s.title for s in self.sections if level is None or s.level == level]
+
+    def caption_in(self, env: Env) -> str | None:
+        for s, e in self.captions:
+            if env.start <= s < env.end:
+                return self.text[s:e]
+        return None
+
+
+def _split_options(raw: str | None) -> list[str]:
+    return [o.strip() for o in (raw or "").split(",") if o.strip()]
+
+
+def build_index(doc: "Manuscript") -> LatexIndex:
+    toks = doc.tokens
+    text = doc.text
+    idx = LatexIndex(text=text, lower=doc.lower, body_span=doc.body_span, line_starts=doc._line_starts)
+    stack: list[Env] = []
+
+    def opt_arg(i: int) -> str | None:
+        """Text of a [..] right after token i (whitespace allowed)."""
+        j = i + 1
+        while j < len(toks) and toks[j].kind == "text" and not toks[j].value.strip():
+            j += 1
+        if j < len(toks) and toks[j].kind == "lbrack":
+            k = j
+            while k < len(toks) and toks[k].kind != "rbrack":
+                k += 1
+            return text[toks[j].end:toks[min(k, len(toks) - 1)].start]
+        return None
+
+    for i, tok in enumerate(toks):
+        if tok.kind != "cmd":
+            continue
+        name = tok.value
+        base = name.rstrip("*")
+        idx.command_offsets[base].append(tok.start)
+        if base not in INDEXED_COMMANDS:
+            continue
+
+        span = doc.arg_span(i)
+        arg = text[span[0]:span[1]] if span else None
+        if span is not None:
+            idx.args[base].append(span)
+
+        if base in SECTION_LEVELS and arg is not None:
+            idx.sections.append(Section(SECTION_LEVELS[base], " ".join(arg.split()), name.endswith("*"), tok.start))
+        elif base == "\\label" and arg:
+            idx.labels.setdefault(arg.strip(), tok.start)
+        elif base in REF_COMMANDS and arg:
+            for key in arg.split(","):
+                idx.refs.setdefault(key.strip(), tok.start)
+        elif base in CITE_COMMANDS and arg is not None:
+            keys = tuple(k.strip() for k in arg.split(",") if k.strip())
+            idx.citations.append(Citation(base, keys, tok.start))
+        elif base == "\\footnote":
+            idx.footnotes.append(tok.start)
+        elif base == "\\caption" and span:
+            idx.captions.append(span)
+        elif base == "\\includegraphics" and arg:
+            idx.graphics.append((arg.strip(), tok.start))
+        elif base == "\\documentclass":
+            idx.class_options = _split_options(opt_arg(i))
+        elif base == "\\usepackage" and arg:
+            opts = _split_options(opt_arg(i))
+            for pkg in arg.split(","):
+                idx.packages[pkg.strip()] = opts
+        elif base == "\\abstract" and span and idx.abstract_span is None:
+            idx.abstract_span = span
+        elif base == "\\begin" and arg:
+            env = Env(arg.strip(), tok.start, content_start=span[1] + 1)
+            stack.append(env)
+            idx.envs.append(env)
+        elif base == "\\end" and arg:
+            env_name = arg.strip()
+            # Pop up to the matching \begin (tolerates unbalanced input).
+            for k in range(len(stack) - 1, -1, -1):
+                if stack[k].name == env_name:
+                    stack[k].end = span[1] + 1
+                    if env_name == "abstract" and idx.abstract_span is None:
+                        idx.abstract_span = (stack[k].content_start, tok.start)
+                    del stack[k:]
+                    break
+
+    for env in stack:
+        env.end = len(text)
+
+    body_end = idx.body_span[1]
+    for n, sec in enumerate(idx.sections):
+        sec.end = body_end
+        for nxt in idx.sections[n + 1:]:
+            if nxt.level <= sec.level:
+                sec.end = nxt.start
+                break
+    return idx
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""latex-tools: validacao de citacoes, auditoria por periodico e contagem de palavras
+em um unico processo, para um ou varios manuscritos.
+
+Cada .tex e lido e tokenizado uma vez (latex_doc.Manuscript) e o mesmo objeto
+alimenta todas as checagens; cada .bib e indexado uma vez (bib_index) e
+compartilhado entre os manuscritos que o usam.
+
+Uso:
+  python tools/latex_tools.py                       # */submission/Manuscript.tex
+  python tools/latex_tools.py A.tex B.tex --bib referencias.bib
+  python tools/latex_tools.py --all                 # todos os manuscritos (.tex com abstract)
+                                                    # em submission/ e submission_old/
+  python tools/latex_tools.py --checks words audit -v
+  python tools/latex_tools.py --all --packs asde catena prisma_scr sustainability_science
+  python tools/latex_tools.py --report-dir relatorios   # grava o .md de citacoes
+  python tools/latex_tools.py --watch               # reavalia a cada gravacao (latex_watch.py)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from citation_validator import generate_markdown_report, extract_citations, parse_bibtex, validate_citations
+from count_words import count_words
+from journal_rules import available_packs, load_pack, run_packs, summarize
+from latex_doc import Manuscript, default_bib, default_manuscript, find_sat_root
+
+CHECKS = ("validate", "audit", "words")
+ALL_DIRS = ("submission", "submission_old")
+
+
+def discover_all() -> list[Path]:
+    sat = find_sat_root()
+    found = []
+    for d in ALL_DIRS:
+        for p in sorted((sat / d).glob("*.tex")):
+            text = p.read_text(encoding="utf-8", errors="ignore")
+            # Manuscripts only; skips cover letter, highlights, title page...
+            if "\\begin{document}" in text and ("\\abstract{" in text or "\\begin{abstract}" in text):
+                found.append(p)
+    return found
+
+
+def run(
+    paths: list[Path],
+    checks: tuple[str, ...],
+    bib: Path | None,
+    report_dir: Path | None,
+    verbose: bool,
+    pack_names: tuple[str, ...] = ("asde",),
+) -> int:
+    packs = [load_pack(p) for p in pack_names]
+    bib_cache: dict[Path, dict] = {}
+    rows = []
+    failed = False
+    t_all = time.perf_counter()
+    for path in paths:
+        t0 = time.perf_counter()
+        doc = Manuscript(path)
+        row = {"manuscrito": f"{path.parent.name}/{path.name}"}
+        if verbose:
+            print(f"\n### {path}")
+
+        if "validate" in checks:
+            bib_path = (bib or default_bib(path)).resolve()
+            if bib_path not in bib_cache:
+                bib_cache[bib_path] = parse_bibtex(bib_path)
+            citations = extract_citations(doc)
+            report = validate_citations(citations, bib_cache[bib_path])
+            missing = [r["key"] for r in report if r["status"] == "✗ MISSING"]
+            row["citacoes"] = len(report)
+            row["ausentes"] = len(missing)
+            failed = failed or bool(missing)
+            for k in missing:
+                print(f"  [{path.name}] citacao ausente em {bib_path.name}: {k}")
+            if report_dir:
+                report_dir.mkdir(parents=True, exist_ok=True)
+                out = report_dir / f"{path.stem}_CITATION_VALIDATION_REPORT.md"
+                total = sum(len(v) for v in citations.values())
+                out.write_text(generate_markdown_report(report, total, doc.name, bib_path.name), encoding="utf-8")
+
+        if "audit" in checks:
+            for name, outcomes in run_packs(doc, packs).items():
+                c = summarize(outcomes)
+                row[name] = f"{c['erro']}E/{c['aviso']}A"
+                if verbose:
+                    for o in outcomes:
+                        if o.status in ("erro", "aviso"):
+                            print(f"  [{name}] [{o.status.upper()}] {o.message}")
+
+        if "words" in checks:
+            row["palavras"] = count_words(doc)
+
+        row["tempo"] = f"{(time.perf_counter() - t0) * 1000:.0f} ms"
+        rows.append(row)
+
+    keys = ("citacoes", "ausentes", *pack_names, "palavras", "tempo")
+    cols = ["manuscrito"] + [c for c in keys if any(c in r for r in rows)]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    print()
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols))
+    print(f"\n{len(rows)} manuscrito(s) em {time.perf_counter() - t_all:.2f}s")
+    return 1 if failed else 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="latex-tools", description="Checagens do manuscrito LaTeX em um unico processo.")
+    ap.add_argument("tex", nargs="*", type=Path, help="manuscritos (padrao: */submission/Manuscript.tex)")
+    ap.add_argument("--all", action="store_true", help="todos os manuscritos (.tex com abstract) em submission/ e submission_old/")
+    ap.add_argument("--bib", type=Path, help="bibliografia (padrao: referencias.bib ao lado de cada .tex)")
+    ap.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    ap.add_argument("--packs", nargs="+", default=["asde"], choices=available_packs(), help="pacotes de regras da auditoria (padrao: asde)")
+    ap.add_argument("--report-dir", type=Path, help="grava <tex>_CITATION_VALIDATION_REPORT.md nesta pasta")
+    ap.add_argument("--verbose", "-v", action="store_true", help="lista erros e avisos de cada pacote")
+    ap.add_argument("--watch", action="store_true", help="observa o (primeiro) manuscrito e reavalia so o que a edicao afetou")
+    ap.add_argument("--interval", type=float, default=0.5, help="intervalo de polling do --watch (s)")
+    args = ap.parse_args()
+
+    paths = list(args.tex)
+    if args.all:
+        paths += [p for p in discover_all() if p not in paths]
+    if not paths:
+        paths = [default_manuscript()]
+    if args.watch:
+        from latex_watch import watch
+
+        watch(paths[0], tuple(args.packs), args.bib, args.interval, "validate" in args.checks)
+        return
+    sys.exit(run(paths, tuple(args.checks), args.bib, args.report_dir, args.verbose, tuple(args.packs)))
+
+
+if __name__ == "__main__":
+    main()
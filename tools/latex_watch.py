@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo watch das checagens do manuscrito: o Manuscript, o indice da
+bibliografia, o cache de contagem de palavras e o resultado de cada regra
+ficam residentes entre gravacoes.
+
+A cada gravacao:
+  - o texto novo e comparado ao anterior (latex_doc.diff_span) e so a regiao
+    alterada e re-tokenizada (Manuscript.update);
+  - o indice estrutural e refeito sobre o fluxo de tokens emendado e as
+    "impressoes digitais" (journal_rules.FEATURES) dizem o que mudou;
+  - so as regras cujas dependencias mudaram sao reavaliadas; regras de frase
+    sobre o texto inteiro so quando a frase pode tocar a janela editada;
+  - as citacoes so sao revalidadas se as chaves citadas ou o .bib mudaram.
+
+Uso:
+  python tools/latex_watch.py [Manuscript.tex] [--packs asde catena] [--interval 0.5]
+  python tools/latex_tools.py --watch            # mesmo modo, via latex-tools
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from citation_validator import extract_citations, parse_bibtex, validate_citations
+from journal_rules import (
+    Facts,
+    Outcome,
+    RulePack,
+    available_packs,
+    changed_features,
+    fingerprints,
+    load_pack,
+    rule_affected,
+    summarize,
+)
+from latex_doc import Manuscript, default_bib, default_manuscript
+
+PROBLEM_STATUSES = ("erro", "aviso")
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@dataclass
+class Refresh:
+    """What one refresh did (for printing)."""
+
+    lines: tuple[int, int] | None = None  # edited line range in the new text
+    relexed: int = 0
+    tokens: int = 0
+    changed: set[str] = field(default_factory=set)
+    reevaluated: int = 0
+    rules: int = 0
+    citations_checked: bool = False
+    added: list[tuple[str, Outcome]] = field(default_factory=list)
+    resolved: list[tuple[str, Outcome]] = field(default_factory=list)
+    missing_added: list[str] = field(default_factory=list)
+    missing_resolved: list[str] = field(default_factory=list)
+    ms: float = 0.0
+
+
+class ManuscriptSession:
+    def __init__(
+        self,
+        path: Path,
+        packs: list[RulePack],
+        bib: Path | None = None,
+        check_citations: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.packs = packs
+        self.bib_path = (bib or default_bib(self.path)).resolve() if check_citations else None
+        self.doc = Manuscript(self.path)
+        self.mtime = _mtime(self.path)
+        self.word_cache: dict = {}
+        # Phrase rules look at the edit window widened by the longest phrase.
+        self.margin = max((len(s) for p in packs for r in p.rules for s in r.params.get("any", [])), default=0)
+        self.bib_mtime: int | None = None
+        self.bib_entries: dict = {}
+        self.missing: list[str] = []
+        self.outcomes: dict[tuple[str, str], list[Outcome]] = {}
+        facts = Facts(self.doc, self.word_cache)
+        for pack in packs:
+            for rule in pack.rules:
+                self.outcomes[pack.name, rule.id] = rule.evaluate(facts)
+        self.features = fingerprints(self.doc.index)
+        self._check_citations(force=True)
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.outcomes)
+
+    def problems(self) -> set[tuple[str, Outcome]]:
+        return {(pack, o) for (pack, _), outs in self.outcomes.items() for o in outs if o.status in PROBLEM_STATUSES}
+
+    def results(self) -> dict[str, list[Outcome]]:
+        """Outcomes per pack, in rule order (same shape as journal_rules.run_packs)."""
+        return {p.name: [o for r in p.rules for o in self.outcomes[p.name, r.id]] for p in self.packs}
+
+    def _check_citations(self, force: bool = False) -> bool:
+        if self.bib_path is None:
+            return False
+        stamp = _mtime(self.bib_path)
+        bib_changed = stamp != self.bib_mtime
+        if bib_changed:
+            self.bib_mtime = stamp
+            self.bib_entries = parse_bibtex(self.bib_path) if stamp is not None else {}
+        if not (force or bib_changed):
+            return False
+        report = validate_citations(extract_citations(self.doc), self.bib_entries)
+        self.missing = [r["key"] for r in report if r["status"] == "✗ MISSING"]
+        return True
+
+    def refresh(self) -> Refresh | None:
+        """Re-check after a save; None when neither the .tex nor the .bib changed."""
+        stamp = _mtime(self.path)
+        bib_stamp = _mtime(self.bib_path) if self.bib_path else None
+        if stamp == self.mtime and bib_stamp == self.bib_mtime:
+            return None
+        t0 = time.perf_counter()
+        rep = Refresh(rules=self.rule_count)
+        before = self.problems()
+        missing_before = set(self.missing)
+
+        if stamp != self.mtime and stamp is not None:
+            self.mtime = stamp
+            old_text = self.doc.text
+            new_text = self.path.read_text(encoding="utf-8", errors="ignore")
+            edit, rep.relexed = self.doc.update(new_text)
+            if edit is not None:
+                rep.tokens = len(self.doc.tokens)
+                rep.lines = (self.doc.line_of(edit.start), self.doc.line_of(max(edit.new_end - 1, edit.start)))
+                features = fingerprints(self.doc.index)
+                rep.changed = changed_features(self.features, features)
+                self.features = features
+                lo = max(edit.start - self.margin, 0)
+                old_window = old_text[lo:edit.old_end + self.margin]
+                new_window = new_text[lo:edit.new_end + self.margin]
+                facts = Facts(self.doc, self.word_cache)
+                for pack in self.packs:
+                    for rule in pack.rules:
+                        if rule_affected(rule, rep.changed, old_window, new_window):
+                            self.outcomes[pack.name, rule.id] = rule.evaluate(facts)
+                            rep.reevaluated += 1
+                if "citations" in rep.changed:
+                    rep.citations_checked = self._check_citations(force=True)
+        if not rep.citations_checked:
+            rep.citations_checked = self._check_citations()
+
+        after = self.problems()
+        rep.added = sorted(after - before, key=lambda x: (x[0], x[1].rule))
+        rep.resolved = sorted(before - after, key=lambda x: (x[0], x[1].rule))
+        rep.missing_added = sorted(set(self.missing) - missing_before)
+        rep.missing_resolved = sorted(missing_before - set(self.missing))
+        rep.ms = (time.perf_counter() - t0) * 1000
+        return rep
+
+
+def print_status(session: ManuscriptSession) -> None:
+    cells = []
+    for name, outcomes in session.results().items():
+        c = summarize(outcomes)
+        cells.append(f"{name} {c['erro']}E/{c['aviso']}A")
+    if session.bib_path is not None:
+        cells.append(f"citacoes ausentes {len(session.missing)}")
+    cells.append(f"palavras {Facts(session.doc, session.word_cache).body_words}")
+    print("  " + " | ".join(cells), flush=True)
+
+
+def print_refresh(session: ManuscriptSession, rep: Refresh) -> None:
+    stamp = time.strftime("%H:%M:%S")
+    if rep.lines is None:
+        print(f"\n[{stamp}] {session.bib_path.name if session.bib_path else ''} alterado")
+    else:
+        a, b = rep.lines
+        where = f"linha {a}" if a == b else f"linhas {a}-{b}"
+        print(
+            f"\n[{stamp}] {session.doc.name} {where}: {rep.relexed}/{rep.tokens} tokens relidos, "
+            f"{rep.reevaluated}/{rep.rules} regras reavaliadas"
+            f"{', citacoes revalidadas' if rep.citations_checked else ''} em {rep.ms:.1f} ms"
+        )
+    for pack, o in rep.added:
+        print(f"  + [{pack}] [{o.status.upper()}] {o.message}")
+    for pack, o in rep.resolved:
+        print(f"  - [{pack}] [{o.status.upper()}] {o.message}")
+    for key in rep.missing_added:
+        print(f"  + citacao ausente em {session.bib_path.name}: {key}")
+    for key in rep.missing_resolved:
+        print(f"  - citacao ausente em {session.bib_path.name}: {key}")
+    print_status(session)
+
+
+def watch(
+    path: Path,
+    pack_names: tuple[str, ...] = ("asde",),
+    bib: Path | None = None,
+    interval: float = 0.5,
+    check_citations: bool = True,
+) -> None:
+    t0 = time.perf_counter()
+    session = ManuscriptSession(path, [load_pack(p) for p in pack_names], bib, check_citations)
+    print(f"Observando {path} (Ctrl+C para sair); carga inicial em {(time.perf_counter() - t0) * 1000:.0f} ms")
+    for pack, o in sorted(session.problems(), key=lambda x: (x[0], x[1].rule)):
+        print(f"  [{pack}] [{o.status.upper()}] {o.message}")
+    for key in session.missing:
+        print(f"  citacao ausente em {session.bib_path.name}: {key}")
+    print_status(session)
+    try:
+        while True:
+            time.sleep(interval)
+            rep = session.refresh()
+            if rep is not None:
+                print_refresh(session, rep)
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Reexecuta as checagens do manuscrito a cada gravacao, de forma incremental.")
+    ap.add_argument("tex", nargs="?", type=Path, help="manuscrito (padrao: */submission/Manuscript.tex)")
+    ap.add_argument("--bib", type=Path, help="bibliografia (padrao: referencias.bib ao lado do .tex)")
+    ap.add_argument("--packs", nargs="+", default=["asde"], choices=available_packs(), help="pacotes de regras (padrao: asde)")
+    ap.add_argument("--no-citations", action="store_true", help="nao valida citacoes contra o .bib")
+    ap.add_argument("--interval", type=float, default=0.5, help="intervalo de polling (s)")
+    args = ap.parse_args()
+    watch(args.tex or default_manuscript(), tuple(args.packs), args.bib, args.interval, not args.no_citations)
+
+
+if __name__ == "__main__":
+    main()
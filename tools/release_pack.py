@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Empacotador do release (Zenodo/OSF) a partir de zenodo_release/MANIFEST.csv.
+
+Substitui o Compress-Archive do osf_pack_and_upload.ps1 (pastas inteiras,
+todo PNG e todo .bib bruto a cada vez) por um pacote definido pelo manifesto:
+
+- cada linha do MANIFEST.csv diz o caminho no pacote (path) e de onde vem o
+  arquivo (source, relativo a pasta SAT);
+- os SHA-256 sao calculados em paralelo (threads) e reaproveitados enquanto
+  mtime+tamanho nao mudam (mesmo HashStore do run_pipeline);
+- o pacote leva o MANIFEST.csv acrescido de size/sha256 e um SHA256SUMS;
+- o nome do arquivo e o hash desse manifesto: se nada mudou, o pacote
+  existente e reaproveitado sem reescrever nada;
+- zip reprodutivel (ordem fixa, datas fixas) com compressao por arquivo:
+  imagens/PDF/zip ficam armazenados, texto e deflate; tar.gz tambem e aceito;
+- o envio vai para um diretorio local (stand-in para testes) ou para o OSF
+  via osfclient (osf://PROJETO/caminho/remoto.zip, token em OSF_TOKEN).
+
+Modo snapshot (--snapshot): em vez de mais um zip completo por release, os
+arquivos vao para um repositorio local enderecado por conteudo
+(_release/store/objects/<sha256>, texto comprimido com zlib) e cada release
+grava so um manifesto pequeno (_release/store/snapshots/<data>_<hash>.json).
+Um release novo acrescenta apenas os blobs que mudaram; qualquer snapshot
+antigo volta como pacote identico ao original (--restore) ou como arquivos
+soltos (--restore ... --to DIR).
+
+Uso:
+  python tools/release_pack.py                         # _release/zenodo_release_<hash>.zip
+  python tools/release_pack.py --format tar
+  python tools/release_pack.py --upload /tmp/zenodo_stand_in
+  python tools/release_pack.py --upload osf://J7STC/osfstorage/artifacts/payload.zip
+  python tools/release_pack.py --snapshot              # so os blobs novos + manifesto
+  python tools/release_pack.py --snapshots             # lista os snapshots
+  python tools/release_pack.py --restore latest [--to DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from run_pipeline import REPO_ROOT, HashStore, find_sat_root
+
+MANIFEST_NAME = "MANIFEST.csv"
+SUMS_NAME = "SHA256SUMS"
+# Package metadata shipped at the root of every release, besides the manifest.
+RELEASE_META = ("README.md", ".zenodo.json")
+# Already-compressed formats are stored; deflating them only costs time.
+STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".pdf", ".zip", ".gz", ".xz", ".rds", ".docx", ".xlsx"}
+# Fixed entry timestamp so the same files always give the same archive bytes.
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+CHUNK = 1 << 20
+
+
+@dataclass
+class ManifestEntry:
+    path: str  # path inside the release
+    type: str
+    description: str
+    source: str  # relative to the SAT folder
+
+
+@dataclass
+class ReleaseFile:
+    entry: ManifestEntry
+    src: Path
+    size: int = 0
+    sha256: str = ""
+    # Content reader when the bytes do not live at ``src`` (snapshot blobs).
+    opener: Callable[[], BinaryIO] | None = None
+
+    @property
+    def stored(self) -> bool:
+        return Path(self.entry.path).suffix.lower() in STORED_SUFFIXES
+
+    def open(self) -> BinaryIO:
+        return self.opener() if self.opener else self.src.open("rb")
+
+
+@dataclass
+class Release:
+    files: list[ReleaseFile]
+    manifest: str  # checksum-augmented MANIFEST.csv
+    sums: str  # SHA256SUMS
+    digest: str  # sha256 of the augmented manifest
+
+    @property
+    def size(self) -> int:
+        return sum(f.size for f in self.files)
+
+
+def read_manifest(release_dir: Path) -> list[ManifestEntry]:
+    with (release_dir / MANIFEST_NAME).open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    missing = [r["path"] for r in rows if not r.get("source")]
+    if missing:
+        raise ValueError(f"{MANIFEST_NAME}: linhas sem coluna 'source': {', '.join(missing)}")
+    return [ManifestEntry(r["path"], r["type"], r["description"], r["source"]) for r in rows]
+
+
+def collect(sat: Path, release_dir: Path) -> list[ReleaseFile]:
+    files = [ReleaseFile(e, sat / e.source) for e in read_manifest(release_dir)]
+    for name in RELEASE_META:
+        if (release_dir / name).exists():
+            files.append(ReleaseFile(ManifestEntry(name, "meta", "Release metadata", ""), release_dir / name))
+    absent = [f.entry.source for f in files if not f.src.is_file()]
+    if absent:
+        raise FileNotFoundError("Arquivos do manifesto nao encontrados: " + ", ".join(absent))
+    paths = [f.entry.path for f in files]
+    dupes = sorted({p for p in paths if paths.count(p) > 1})
+    if dupes:
+        raise ValueError("Caminhos repetidos no manifesto: " + ", ".join(dupes))
+    return sorted(files, key=lambda f: f.entry.path)
+
+
+def hash_files(files: list[ReleaseFile], store: HashStore, jobs: int = 8) -> None:
+    """Fill size/sha256 in place; hashlib releases the GIL, so threads scale."""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        digests = list(pool.map(store.digest, (f.src for f in files)))
+    for f, sha in zip(files, digests):
+        f.size = f.src.stat().st_size
+        f.sha256 = sha
+
+
+def build_release(files: list[ReleaseFile]) -> Release:
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(["path", "type", "description", "size", "sha256"])
+    for f in files:
+        w.writerow([f.entry.path, f.entry.type, f.entry.description, f.size, f.sha256])
+    manifest = buf.getvalue()
+    sums = "".join(f"{f.sha256}  {f.entry.path}\n" for f in files)
+    return Release(files, manifest, sums, hashlib.sha256(manifest.encode("utf-8")).hexdigest())
+
+
+def _zip_info(name: str, compress: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+    info.compress_type = compress
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def write_zip(release: Release, out: Path) -> None:
+    with zipfile.ZipFile(out, "w") as zf:
+        zf.writestr(_zip_info(MANIFEST_NAME, zipfile.ZIP_DEFLATED), release.manifest)
+        zf.writestr(_zip_info(SUMS_NAME, zipfile.ZIP_DEFLATED), release.sums)
+        for f in release.files:
+            info = _zip_info(f.entry.path, zipfile.ZIP_STORED if f.stored else zipfile.ZIP_DEFLATED)
+            info.file_size = f.size
+            with f.open() as src, zf.open(info, "w", force_zip64=f.size > 1 << 31) as dst:
+                shutil.copyfileobj(src, dst, CHUNK)
+
+
+def _tar_info(name: str, size: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = 0o644
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def write_tar(release: Release, out: Path) -> None:
+    # tar has no per-member compression: the whole stream is gzipped.
+    with out.open("wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tf:
+            for name, text in ((MANIFEST_NAME, release.manifest), (SUMS_NAME, release.sums)):
+                data = text.encode("utf-8")
+                tf.addfile(_tar_info(name, len(data)), io.BytesIO(data))
+            for f in release.files:
+                with f.open() as src:
+                    tf.addfile(_tar_info(f.entry.path, f.size), src)
+
+
+WRITERS = {"zip": (".zip", write_zip), "tar": (".tar.gz", write_tar)}
+
+
+def pack(release: Release, out_dir: Path, fmt: str = "zip", name: str = "zenodo_release") -> tuple[Path, bool]:
+    """Write the archive (atomically); returns (path, written). Reused when it exists."""
+    suffix, writer = WRITERS[fmt]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"{name}_{release.digest[:12]}{suffix}"
+    if out.exists():
+        return out, False
+    tmp = out.with_name(out.name + ".tmp")
+    writer(release, tmp)
+    tmp.replace(out)
+    (out_dir / f"{out.name}.sha256").write_text(f"{file_sha256(out)}  {out.name}\n", encoding="utf-8")
+    return out, True
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed snapshots
+# ---------------------------------------------------------------------------
+
+SNAPSHOT_VERSION = 1
+
+
+class _Inflate(io.RawIOBase):
+    """Read-only stream over a zlib-compressed blob."""
+
+    def __init__(self, path: Path) -> None:
+        self._f = path.open("rb")
+        self._z = zlib.decompressobj()
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buf:
+            chunk = self._f.read(CHUNK)
+            if not chunk:
+                self._buf = self._z.flush()
+                break
+            self._buf = self._z.decompress(chunk)
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+class SnapshotStore:
+    """objects/<aa>/<sha256>[.z] blobs plus one small JSON manifest per release."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.snapshots = self.root / "snapshots"
+
+    def blob_path(self, sha: str, compressed: bool) -> Path:
+        return self.objects / sha[:2] / (sha[2:] + (".z" if compressed else ""))
+
+    def find_blob(self, sha: str) -> Path | None:
+        for compressed in (True, False):
+            p = self.blob_path(sha, compressed)
+            if p.exists():
+                return p
+        return None
+
+    def put(self, f: ReleaseFile) -> int:
+        """Store ``f`` unless its content is already there; returns bytes written."""
+        if self.find_blob(f.sha256):
+            return 0
+        dst = self.blob_path(f.sha256, not f.stored)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+        h = hashlib.sha256()
+        z = None if f.stored else zlib.compressobj(6)
+        with f.open() as src, tmp.open("wb") as out:
+            for block in iter(lambda: src.read(CHUNK), b""):
+                h.update(block)
+                out.write(z.compress(block) if z else block)
+            if z:
+                out.write(z.flush())
+        if h.hexdigest() != f.sha256:
+            tmp.unlink()
+            raise IOError(f"{f.src} mudou durante o snapshot; rode de novo")
+        tmp.replace(dst)
+        return dst.stat().st_size
+
+    def list(self) -> list[Path]:
+        return sorted(self.snapshots.glob("*.json"))
+
+    def resolve(self, name: str) -> Path:
+        """Snapshot by file name, stem, digest prefix or ``latest``."""
+        snaps = self.list()
+        if not snaps:
+            raise FileNotFoundError(f"Nenhum snapshot em {self.snapshots}")
+        if name == "latest":
+            return snaps[-1]
+        hits = [p for p in snaps if name in (p.name, p.stem) or p.stem.split("_")[-1].startswith(name)]
+        if len(hits) != 1:
+            raise ValueError(f"Snapshot '{name}' {'ambiguo' if hits else 'nao encontrado'}")
+        return hits[0]
+
+    def commit(self, release: Release, jobs: int = 8) -> tuple[Path, int, int, bool]:
+        """(snapshot path, new blobs, bytes added, created). Same digest as the last one: reused."""
+        snaps = self.list()
+        if snaps and snaps[-1].stem.endswith(release.digest[:12]):
+            return snaps[-1], 0, 0, False
+        unique = {f.sha256: f for f in release.files}
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            written = [n for n in pool.map(self.put, unique.values()) if n]
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "digest": release.digest,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "files": [
+                {"path": f.entry.path, "type": f.entry.type, "description": f.entry.description,
+                 "source": f.entry.source, "size": f.size, "sha256": f.sha256}
+                for f in release.files
+            ],
+        }
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots / f"{time.strftime('%Y%m%d_%H%M%S')}_{release.digest[:12]}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=1, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        return path, len(written), sum(written), True
+
+    def load(self, snapshot: Path) -> Release:
+        """Rebuild the Release of a snapshot, reading every file from its blob."""
+        data = json.loads(snapshot.read_text(encoding="utf-8"))
+        files = []
+        for rec in data["files"]:
+            blob = self.find_blob(rec["sha256"])
+            if blob is None:
+                raise FileNotFoundError(f"Blob ausente para {rec['path']} ({rec['sha256'][:12]})")
+            opener = (lambda b=blob: io.BufferedReader(_Inflate(b), CHUNK)) if blob.suffix == ".z" else (lambda b=blob: b.open("rb"))
+            entry = ManifestEntry(rec["path"], rec["type"], rec["description"], rec.get("source", ""))
+            files.append(ReleaseFile(entry, blob, rec["size"], rec["sha256"], opener))
+        release = build_release(files)
+        if release.digest != data["digest"]:
+            raise ValueError(f"{snapshot.name}: manifesto nao confere com o digest gravado")
+        return release
+
+    def restore(self, release: Release, dest: Path, jobs: int = 8) -> int:
+        """Write the files of ``release`` under ``dest`` (verified by sha256)."""
+
+        def one(f: ReleaseFile) -> None:
+            out = dest / f.entry.path
+            out.parent.mkdir(parents=True, exist_ok=True)
+            h = hashlib.sha256()
+            with f.open() as src, out.open("wb") as dst:
+                for block in iter(lambda: src.read(CHUNK), b""):
+                    h.update(block)
+                    dst.write(block)
+            if h.hexdigest() != f.sha256:
+                raise IOError(f"Blob corrompido: {f.entry.path}")
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(one, release.files))
+        (dest / MANIFEST_NAME).write_text(release.manifest, encoding="utf-8")
+        (dest / SUMS_NAME).write_text(release.sums, encoding="utf-8")
+        return len(release.files)
+
+    def disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.objects.rglob("*") if p.is_file())
+
+
+# ---------------------------------------------------------------------------
+# Upload targets
+# ---------------------------------------------------------------------------
+
+
+class LocalTarget:
+    """Directory standing in for the repository (tests, dry runs, shared drives)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def upload(self, archive: Path) -> str:
+        self.root.mkdir(parents=True, exist_ok=True)
+        dst = self.root / archive.name
+        tmp = dst.with_name(dst.name + ".part")
+        shutil.copyfile(archive, tmp)
+        if file_sha256(tmp) != file_sha256(archive):
+            tmp.unlink()
+            raise IOError(f"Copia corrompida: {dst}")
+        tmp.replace(dst)
+        return str(dst)
+
+
+class OsfTarget:
+    """osfclient upload (same command as osf_pack_and_upload.ps1)."""
+
+    def __init__(self, project: str, remote: str) -> None:
+        self.project = project
+        self.remote = remote
+
+    def upload(self, archive: Path) -> str:
+        if not os.environ.get("OSF_TOKEN"):
+            raise RuntimeError("Defina a variavel de ambiente OSF_TOKEN antes de executar.")
+        osf = shutil.which("osf") or shutil.which("osf.exe")
+        if osf is None:
+            raise FileNotFoundError("Nao encontrei o executavel osf. Instale o pacote osfclient.")
+        subprocess.run([osf, "-p", self.project, "upload", "-U", str(archive), self.remote], check=True)
+        return f"osf://{self.project}/{self.remote}"
+
+
+def upload_target(spec: str) -> LocalTarget | OsfTarget:
+    if spec.startswith("osf://"):
+        project, _, remote = spec[len("osf://"):].partition("/")
+        if not project or not remote:
+            raise ValueError("Use osf://PROJETO/caminho/remoto.zip")
+        return OsfTarget(project, remote)
+    return LocalTarget(Path(spec))
+
+
+def _cache_hit(store: HashStore, path: Path) -> bool:
+    rec = store.files.get(str(path))
+    st = path.stat()
+    return bool(rec) and rec["mtime_ns"] == st.st_mtime_ns and rec["size"] == st.st_size
+
+
+def _load_hashes(path: Path) -> HashStore:
+    try:
+        return HashStore(files=json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return HashStore()
+
+
+def _save_hashes(store: HashStore, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(store.files, indent=1, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Monta o pacote do release a partir do MANIFEST.csv (hashes em paralelo, zip reprodutivel).")
+    ap.add_argument("--root", type=Path, default=None, help="pasta 8-REVISÃO_ESCOPO_SAT (padrao: auto)")
+    ap.add_argument("--out", type=Path, default=REPO_ROOT / "_release", help="pasta de saida (padrao: _release)")
+    ap.add_argument("--format", choices=sorted(WRITERS), default="zip")
+    ap.add_argument("--jobs", "-j", type=int, default=8, help="threads de hash/copia")
+    ap.add_argument("--upload", metavar="DESTINO", help="diretorio local ou osf://PROJETO/caminho.zip")
+    ap.add_argument("--snapshot", action="store_true", help="grava um snapshot enderecado por conteudo em vez do pacote")
+    ap.add_argument("--snapshots", action="store_true", help="lista os snapshots gravados")
+    ap.add_argument("--restore", metavar="SNAPSHOT", help="reconstroi um snapshot (nome, prefixo do hash ou latest)")
+    ap.add_argument("--to", type=Path, help="com --restore: extrai os arquivos nesta pasta em vez de gerar o pacote")
+    args = ap.parse_args()
+
+    store = SnapshotStore(args.out / "store")
+    t0 = time.perf_counter()
+
+    if args.snapshots:
+        for snap in store.list():
+            data = json.loads(snap.read_text(encoding="utf-8"))
+            size = sum(f["size"] for f in data["files"])
+            print(f"{snap.stem}  {data['created']}  {len(data['files'])} arquivos  {size / 1e6:.1f} MB")
+        print(f"Objetos: {store.disk_usage() / 1e6:.1f} MB em {store.objects}")
+        return
+
+    if args.restore:
+        snap = store.resolve(args.restore)
+        release = store.load(snap)
+        if args.to:
+            n = store.restore(release, args.to, args.jobs)
+            print(f"{snap.stem}: {n} arquivos restaurados em {args.to} ({time.perf_counter() - t0:.2f}s)")
+            return
+        archive, written = pack(release, args.out, args.format)
+        print(f"{snap.stem}: {'Gerado' if written else 'Inalterado'}: {archive} ({time.perf_counter() - t0:.2f}s)")
+        if args.upload:
+            print(f"Enviado: {upload_target(args.upload).upload(archive)}")
+        return
+
+    sat = args.root.resolve() if args.root else find_sat_root(REPO_ROOT)
+    release_dir = sat / "zenodo_release"
+    cache_path = sat / "_build_logs" / "release_hashes.json"
+
+    files = collect(sat, release_dir)
+    hashes = _load_hashes(cache_path)
+    cached = sum(_cache_hit(hashes, f.src) for f in files)
+    hash_files(files, hashes, args.jobs)
+    _save_hashes(hashes, cache_path)
+    release = build_release(files)
+    t_hash = time.perf_counter() - t0
+    stored = sum(f.stored for f in release.files)
+    print(
+        f"{len(release.files)} arquivos ({release.size / 1e6:.1f} MB; {stored} armazenados sem compressao), "
+        f"hashes em {t_hash:.2f}s ({cached} reaproveitados do cache)"
+    )
+
+    if args.snapshot:
+        snap, n_new, added, created = store.commit(release, args.jobs)
+        if created:
+            print(f"Snapshot {snap.stem}: {n_new} blob(s) novo(s), +{added / 1e6:.2f} MB "
+                  f"(objetos: {store.disk_usage() / 1e6:.1f} MB) em {time.perf_counter() - t0:.2f}s")
+        else:
+            print(f"Inalterado: snapshot {snap.stem}")
+        return
+
+    archive, written = pack(release, args.out, args.format)
+    print(f"{'Gerado' if written else 'Inalterado'}: {archive} ({archive.stat().st_size / 1e6:.1f} MB) "
+          f"em {time.perf_counter() - t0:.2f}s")
+
+    if args.upload:
+        dest = upload_target(args.upload).upload(archive)
+        print(f"Enviado: {dest}")
+
+
+if __name__ == "__main__":
+    main()
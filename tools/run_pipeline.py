@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Pipeline SAT: bib -> datasets -> estatisticas -> figuras -> checagens LaTeX
+-> figuras da submissao -> PDF.
+
+Substitui o run_pipeline.ps1 (sequencial, so Windows) por um DAG em Python:
+
+- cada etapa declara entradas e saidas; a etapa so roda quando esta "stale"
+  (saida ausente ou hash das entradas/comando diferente do ultimo sucesso);
+- hashes sao reaproveitados quando mtime+tamanho do arquivo nao mudaram;
+- etapas independentes rodam em paralelo (threads disparando subprocessos);
+- ao final, imprime o tempo de cada etapa.
+
+Estado e logs ficam em <SAT>/_build_logs (pipeline_state.json, <etapa>.txt).
+
+Uso:
+  python tools/run_pipeline.py                  # tudo que estiver desatualizado
+  python tools/run_pipeline.py figures          # so a etapa (e dependencias)
+  python tools/run_pipeline.py --force --jobs 4
+  python tools/run_pipeline.py --dry-run        # mostra o que rodaria
+  python tools/run_pipeline.py --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+
+
+def find_sat_root(repo_root: Path) -> Path:
+    hit = next(iter(sorted(repo_root.glob("*/submission/Manuscript.tex"))), None)
+    if hit is None:
+        raise FileNotFoundError(f"Nao encontrei */submission/Manuscript.tex abaixo de: {repo_root}")
+    return hit.parent.parent
+
+
+@dataclass
+class Stage:
+    name: str
+    deps: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    # Environment variables that change what the stage produces (part of its key).
+    env: tuple[str, ...] = ()
+    # Either a command (run with cwd) or a Python callable returning a message.
+    cmd: tuple[str, ...] = ()
+    cwd: Path | None = None
+    func: Callable[[], str] | None = None
+    # Skips (without failing) when this returns a reason string.
+    skip_if: Callable[[], str | None] | None = None
+    description: str = ""
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # ran | fresh | skipped | failed | blocked
+    seconds: float = 0.0
+    message: str = ""
+
+
+@dataclass
+class HashStore:
+    """sha256 per file, reused while (mtime_ns, size) is unchanged."""
+
+    files: dict[str, dict] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def digest(self, path: Path) -> str:
+        if not path.exists():
+            return "missing"
+        st = path.stat()
+        key = str(path)
+        with self.lock:
+            rec = self.files.get(key)
+            if rec and rec["mtime_ns"] == st.st_mtime_ns and rec["size"] == st.st_size:
+                return rec["sha256"]
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        sha = h.hexdigest()
+        with self.lock:
+            self.files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha}
+        return sha
+
+
+def _py(script: Path, *args: str) -> tuple[str, ...]:
+    return (sys.executable, str(script), *args)
+
+
+def build_stages(sat: Path) -> dict[str, Stage]:
+    dados = sat / "2-DADOS"
+    scripts = dados / "scripts"
+    meta = dados / "1-ESTATISTICA" / "1-RSTUDIO" / "9-META_ANALISE"
+    fig_en = sat / "2-FIGURAS" / "2-EN"
+    sub = sat / "submission"
+
+    bib_filtrada = dados / "referencias_filtradas" / "referencias_scopus_wos_filtradas.bib"
+    mca_csv = scripts / "mca_dados_categorizados_sat.csv"
+    fair_dim = scripts / "scores_por_dimensao_sat.csv"
+    fair_ind = scripts / "indicadores_fair_detalhados_sat.csv"
+    meta_study = meta / "dados_meta_analise_sat.csv"
+    meta_algo = meta / "meta_analise_por_algoritmo_sat.csv"
+    # Shared .bib loader (sat_bib -> tools/bib_index) imported by every script that reads a .bib.
+    bib_lib = (scripts / "sat_bib.py", TOOLS_DIR / "bib_index.py")
+    # Abstract/keywords filled from a metadata snapshot (sat_enrich.py); the table may be absent.
+    enrichment = (scripts / "sat_enrich.py", dados / "referencias_filtradas" / "enriquecimento_metadados.csv")
+
+    sys.path.insert(0, str(scripts))
+    try:
+        from render_all import FIGURES  # figure registry (inputs/outputs per script)
+    finally:
+        sys.path.remove(str(scripts))
+
+    fig_outputs = tuple(fig_en / o for f in FIGURES for o in f.outputs)
+    # Each figure's script plus the data files and helper modules it declares in render_all.
+    fig_inputs = tuple(
+        dict.fromkeys(
+            [scripts / "render_all.py", scripts / "sat_figcache.py"]
+            + [scripts / f"{f.module}.py" for f in FIGURES]
+            + [Path(os.path.normpath(scripts / i)) for f in FIGURES for i in f.inputs]
+        )
+    )
+    fig_env = tuple(dict.fromkeys(v for f in FIGURES for v in f.env))
+
+    stages = [
+        Stage(
+            "bib",
+            inputs=(
+                scripts / "scopus_export.bib",
+                scripts / "wos_export.bib",
+                scripts / "OLD" / "analisar_scopus_wos_combinado.py",
+                scripts / "sat_prisma.py",
+                *bib_lib,
+            ),
+            # The screening pass also writes the PRISMA counts from its per-record ledger.
+            outputs=(
+                bib_filtrada,
+                dados / "relatorios" / "relatorio_analise_scopus_wos.txt",
+                dados / "relatorios" / "prisma_registros.csv",
+                scripts / "PRISMA.csv",
+                scripts / "PRISMA.svg",
+            ),
+            # The script resolves its inputs/outputs relative to the scripts folder.
+            cmd=_py(scripts / "OLD" / "analisar_scopus_wos_combinado.py"),
+            cwd=scripts,
+            description="Scopus + WoS -> bib filtrada + PRISMA",
+        ),
+        Stage(
+            "mca_dataset",
+            deps=("bib",),
+            inputs=(bib_filtrada, scripts / "build_sat_mca_dataset.py", *bib_lib, *enrichment),
+            outputs=(mca_csv,),
+            cmd=_py(scripts / "build_sat_mca_dataset.py"),
+            description="tabela categorica (MCA)",
+        ),
+        Stage(
+            "temporal_dataset",
+            deps=("mca_dataset",),
+            inputs=(mca_csv, scripts / "build_sat_temporal_dataset.py", scripts / "sat_temporal.py"),
+            # The year x category counts are kept in scripts/_cache/temporal_state.json between runs.
+            outputs=tuple(
+                scripts / name
+                for name in (
+                    "temporal_tendencias.csv",
+                    "temporal_publicacoes.csv",
+                    "temporal_algoritmos.csv",
+                    "temporal_evidencias.csv",
+                    "temporal_contextos.csv",
+                    "temporal_aplicacoes.csv",
+                    "temporal_regioes.csv",
+                    "temporal_janelas.csv",
+                    "temporal_relatorio.txt",
+                )
+            ),
+            cmd=_py(scripts / "build_sat_temporal_dataset.py"),
+            description="tendencias temporais por categoria",
+        ),
+        Stage(
+            "fair_dataset",
+            deps=("bib",),
+            # fair_rubrica.json holds the criteria points and the compliance threshold.
+            inputs=(
+                bib_filtrada,
+                scripts / "build_sat_fair_dataset.py",
+                scripts / "sat_fair.py",
+                scripts / "fair_rubrica.json",
+                *bib_lib,
+                *enrichment,
+            ),
+            outputs=(fair_dim, fair_ind, scripts / "fair_estudos_sat.csv"),
+            cmd=_py(scripts / "build_sat_fair_dataset.py"),
+            description="indicadores FAIR",
+        ),
+        Stage(
+            "meta_dataset",
+            deps=("bib",),
+            inputs=(bib_filtrada, scripts / "build_sat_meta_analysis_dataset.py", *bib_lib, *enrichment),
+            outputs=(meta_study, meta_algo),
+            cmd=_py(scripts / "build_sat_meta_analysis_dataset.py"),
+            description="meta-analise por algoritmo",
+        ),
+        Stage(
+            "statistics",
+            deps=("mca_dataset", "fair_dataset", "meta_dataset"),
+            inputs=(bib_filtrada, mca_csv, fair_dim, fair_ind, meta_study, meta_algo, scripts / "report_sat_summary.py", *bib_lib),
+            cmd=_py(scripts / "report_sat_summary.py"),
+            description="numeros do manuscrito (log em _build_logs/statistics.txt)",
+        ),
+        Stage(
+            "figures",
+            deps=("mca_dataset", "fair_dataset", "meta_dataset"),
+            inputs=fig_inputs,
+            outputs=fig_outputs,
+            env=fig_env,
+            # render_all keeps its own per-figure cache, so a partial change re-renders only what changed.
+            cmd=_py(scripts / "render_all.py"),
+            description="figuras em 2-FIGURAS/2-EN",
+        ),
+        Stage(
+            "latex_checks",
+            deps=("figures",),
+            inputs=(sub / "Manuscript.tex", sub / "referencias.bib"),
+            func=lambda: check_latex_figures(sub / "Manuscript.tex", sub, fig_en),
+            description="figuras referenciadas no Manuscript.tex",
+        ),
+        Stage(
+            "submission_figures",
+            deps=("latex_checks",),
+            inputs=tuple(fig_en / src for src in SUBMISSION_FIGURES.values()),
+            outputs=tuple(sub / dst for dst in SUBMISSION_FIGURES),
+            func=lambda: copy_submission_figures(fig_en, sub),
+            description="FigN.png da submissao",
+        ),
+        Stage(
+            "pdf",
+            deps=("submission_figures",),
+            inputs=(sub / "Manuscript.tex", sub / "referencias.bib", *(sub / dst for dst in SUBMISSION_FIGURES)),
+            outputs=(sub / "_build" / "Manuscript.pdf",),
+            func=lambda: compile_latex(sub, "Manuscript.tex"),
+            skip_if=lambda: None if shutil.which("pdflatex") and shutil.which("bibtex") else "pdflatex/bibtex ausentes no PATH",
+            description="pdflatex + bibtex + pdflatex x2",
+        ),
+    ]
+    return {s.name: s for s in stages}
+
+
+# Submission file -> figure in 2-FIGURAS/2-EN (see \includegraphics in Manuscript.tex).
+SUBMISSION_FIGURES: dict[str, str] = {
+    "Fig1.png": "prisma_flowdiagram.png",
+    "Fig2a.png": "temporal_publicacoes.png",
+    "Fig2b.png": "temporal_algoritmos.png",
+    "Fig3.png": "network_completa.png",
+    "Fig4.png": "louvain_modules_detailed.png",
+    "Fig5.png": "mca_biplot_temporal_completo.png",
+    "Fig6.png": "cluster_heatmap_profiles_edit.png",
+    "Fig7a.png": "fair_radar_only.png",
+    "Fig7b.png": "fair_indicadores.png",
+    "Fig8a.png": "meta_analise_algoritmos.png",
+    "Fig8b.png": "meta_regressao_ano.png",
+}
+
+
+def _strip_comments(tex: str) -> str:
+    return re.sub(r"(?<!\\)%.*", "", tex)
+
+
+def check_latex_figures(tex_path: Path, latex_dir: Path, fig_dir: Path) -> str:
+    """Port of check_figures.ps1: every \\includegraphics must resolve."""
+    tex = _strip_comments(tex_path.read_text(encoding="utf-8", errors="ignore"))
+    refs = re.findall(r"\\includegraphics(?:\[[^\]]*\])?\{([^}]+)\}", tex)
+    missing = []
+    for rel in refs:
+        rel = rel.strip()
+        if not rel or (latex_dir / rel).exists():
+            continue
+        # Submission copies are produced by the next stage.
+        src = SUBMISSION_FIGURES.get(rel)
+        if src and (fig_dir / src).exists():
+            continue
+        missing.append(rel)
+    if missing:
+        raise RuntimeError("figuras referenciadas e ausentes: " + ", ".join(sorted(set(missing))))
+    return f"{len(refs)} figuras referenciadas, todas presentes"
+
+
+def copy_submission_figures(fig_dir: Path, sub_dir: Path) -> str:
+    copied = 0
+    for dst, src in SUBMISSION_FIGURES.items():
+        s, d = fig_dir / src, sub_dir / dst
+        if not s.exists():
+            raise FileNotFoundError(f"Figura nao encontrada para a submissao: {s}")
+        if d.exists() and d.read_bytes() == s.read_bytes():
+            continue
+        shutil.copy2(s, d)
+        copied += 1
+    return f"{copied} de {len(SUBMISSION_FIGURES)} figuras atualizadas"
+
+
+def compile_latex(latex_dir: Path, tex_name: str) -> str:
+    # -output-directory keeps aux files (and the PDF lock) out of the submission folder.
+    # Paths stay relative to latex_dir: bibtex refuses absolute output paths
+    # under the default openout_any=p.
+    build = latex_dir / "_build"
+    build.mkdir(exist_ok=True)
+    job = Path(tex_name).stem
+    latex = ["pdflatex", "-interaction=batchmode", "-halt-on-error", "-file-line-error", "-output-directory=_build", tex_name]
+    steps = [latex, ["bibtex", f"_build/{job}"], latex, latex]
+    for cmd in steps:
+        proc = subprocess.run(cmd, cwd=latex_dir, capture_output=True, text=True, errors="replace")
+        if proc.returncode != 0:
+            log = build / f"{job}.log"
+            tail = log.read_text(errors="replace").splitlines()[-40:] if log.exists() else proc.stdout.splitlines()[-40:]
+            raise RuntimeError(f"{cmd[0]} falhou (exit code={proc.returncode})\n" + "\n".join(tail))
+    return f"PDF: {build / (job + '.pdf')}"
+
+
+class Pipeline:
+    def __init__(self, sat_root: Path, jobs: int = 4, force: bool = False, dry_run: bool = False) -> None:
+        self.sat = sat_root
+        self.stages = build_stages(sat_root)
+        self.jobs = jobs
+        self.force = force
+        self.dry_run = dry_run
+        self.log_dir = sat_root / "_build_logs"
+        self.state_path = self.log_dir / "pipeline_state.json"
+        self.state: dict = {"stages": {}, "files": {}}
+        if self.state_path.exists():
+            try:
+                self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except ValueError:
+                pass
+        self.hashes = HashStore(files=self.state.get("files", {}))
+        self.lock = threading.Lock()
+
+    def closure(self, targets: Iterable[str]) -> list[str]:
+        order: list[str] = []
+        seen: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name not in self.stages:
+                raise SystemExit(f"Etapa desconhecida: {name} (use --list)")
+            if name in seen:
+                return
+            seen.add(name)
+            for d in self.stages[name].deps:
+                visit(d)
+            order.append(name)
+
+        for t in targets:
+            visit(t)
+        return order
+
+    def stage_key(self, st: Stage) -> str:
+        h = hashlib.sha256()
+        h.update(repr(st.cmd[1:] if st.cmd else st.name).encode())
+        for p in st.inputs:
+            h.update(f"{p}={self.hashes.digest(p)};".encode())
+        for var in st.env:
+            h.update(f"${var}={os.environ.get(var, '')};".encode())
+        return h.hexdigest()
+
+    def is_stale(self, st: Stage, key: str) -> bool:
+        if self.force:
+            return True
+        if self.state["stages"].get(st.name, {}).get("key") != key:
+            return True
+        return any(not p.exists() for p in st.outputs)
+
+    def run_stage(self, st: Stage) -> StageResult:
+        if st.skip_if is not None:
+            reason = st.skip_if()
+            if reason:
+                return StageResult(st.name, "skipped", message=reason)
+        key = self.stage_key(st)
+        if not self.is_stale(st, key):
+            return StageResult(st.name, "fresh")
+        if self.dry_run:
+            return StageResult(st.name, "ran", message="(dry-run)")
+
+        t0 = time.perf_counter()
+        log_path = self.log_dir / f"{st.name}.txt"
+        try:
+            if st.func is not None:
+                msg = st.func()
+                log_path.write_text(msg + "\n", encoding="utf-8")
+            else:
+                with log_path.open("w", encoding="utf-8", errors="replace") as log:
+                    proc = subprocess.run(
+                        st.cmd, cwd=st.cwd or Path(st.cmd[1]).parent,
+                        stdout=log, stderr=subprocess.STDOUT, text=True,
+                    )
+                if proc.returncode != 0:
+                    tail = log_path.read_text(encoding="utf-8", errors="replace").splitlines()[-40:]
+                    raise RuntimeError(f"exit code={proc.returncode}\n" + "\n".join(tail))
+                msg = ""
+        except Exception as exc:  # report and keep independent branches going
+            return StageResult(st.name, "failed", time.perf_counter() - t0, str(exc))
+
+        # Outputs changed on disk; the key is recomputed from (unchanged) inputs.
+        with self.lock:
+            self.state["stages"][st.name] = {"key": self.stage_key(st), "finished": time.time()}
+        return StageResult(st.name, "ran", time.perf_counter() - t0, msg)
+
+    def run(self, targets: Iterable[str]) -> list[StageResult]:
+        names = self.closure(targets)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        results: dict[str, StageResult] = {}
+        pending = list(names)
+        running: dict[Future, str] = {}
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = [d for d in self.stages[name].deps if d in names]
+                    if any(results.get(d) and results[d].status in ("failed", "blocked") for d in deps):
+                        results[name] = StageResult(name, "blocked", message="dependencia falhou")
+                        pending.remove(name)
+                    elif all(d in results for d in deps):
+                        print(f"==> {name}: {self.stages[name].description}", flush=True)
+                        running[pool.submit(self.run_stage, self.stages[name])] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    res = fut.result()
+                    results[running.pop(fut)] = res
+                    if res.status == "failed":
+                        print(f"[FALHOU] {res.name}: {res.message}", flush=True)
+        wall = time.perf_counter() - t0
+
+        if not self.dry_run:
+            self.state["files"] = self.hashes.files
+            tmp = self.state_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.state, indent=1, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.state_path)
+
+        ordered = [results[n] for n in names]
+        print("\nTEMPOS POR ETAPA")
+        for r in ordered:
+            extra = f"  {r.message.splitlines()[0]}" if r.message and r.status != "failed" else ""
+            print(f"  {r.name:<20} {r.status:<8} {r.seconds:7.2f}s{extra}")
+        print(f"  {'total (parede)':<20} {'':<8} {wall:7.2f}s")
+        return ordered
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Pipeline SAT com dependencias (executa so o que esta desatualizado).")
+    ap.add_argument("targets", nargs="*", help="etapas alvo (padrao: todas)")
+    ap.add_argument("--root", type=Path, default=None, help="pasta 8-REVISÃO_ESCOPO_SAT (padrao: auto)")
+    ap.add_argument("--jobs", "-j", type=int, default=4, help="etapas simultaneas")
+    ap.add_argument("--force", action="store_true", help="ignora o estado e roda tudo")
+    ap.add_argument("--dry-run", action="store_true", help="so mostra o que rodaria")
+    ap.add_argument("--list", action="store_true", help="lista as etapas")
+    args = ap.parse_args()
+
+    sat = args.root.resolve() if args.root else find_sat_root(REPO_ROOT)
+    pipe = Pipeline(sat, jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+
+    if args.list:
+        for st in pipe.stages.values():
+            deps = ", ".join(st.deps) or "-"
+            print(f"{st.name:<20} <- {deps:<45} {st.description}")
+        return
+
+    results = pipe.run(args.targets or list(pipe.stages))
+    if any(r.status in ("failed", "blocked") for r in results):
+        sys.exit(1)
+    print("\nOK: pipeline concluido.")
+
+
+if __name__ == "__main__":
+    main()